@@ -0,0 +1,217 @@
+"""
+Throughput and latency of one worker under concurrent load, served
+in-process by the WSGI handler (--threads threads, 1 for a sync worker
+of gunicorn) and by the ASGI handler with sync and async views.
+
+Clients ask for task pages, the task list and the tasks API in turn.
+Every query waits --latency ms more, as for a database over the network
+(the in-memory SQLite answers at once, and keeps the CPU busy instead).
+
+    python -m benchmarks.bench_asgi --concurrency 100 --latency 2
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import setup_django, test_database, print_table
+
+
+def percentile(timings, share):
+    return timings[min(len(timings) - 1, int(len(timings) * share))]
+
+
+async def run_load(call, paths, total, concurrency):
+    """
+    `total` requests, at most `concurrency` in flight.
+    Returns the elapsed seconds and the sorted latencies in ms.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one(path):
+        async with semaphore:
+            start = time.perf_counter()
+            status = await call(path)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert status == 200, (path, status)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        one(paths[i % len(paths)]) for i in range(total)
+    ))
+    return time.perf_counter() - start, sorted(timings)
+
+
+def asgi_caller(application, cookie):
+    async def call(path):
+        path, _, query = path.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'cookie', cookie)],
+            'client': ('127.0.0.1', 50000),
+            'server': ('localhost', 80),
+        }
+        status = None
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await application(scope, receive, send)
+        return status
+    return call
+
+
+def wsgi_caller(application, cookie, threads):
+    pool = ThreadPoolExecutor(max_workers=threads)
+
+    def request(path):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': cookie.decode(),
+            'wsgi.input': io.BytesIO(),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': io.StringIO(),
+        }
+        result = {}
+
+        def start_response(status, headers, exc_info=None):
+            result['status'] = int(status.split()[0])
+
+        response = application(environ, start_response)
+        try:
+            b''.join(response)
+        finally:
+            response.close()
+        return result['status']
+
+    async def call(path):
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, request, path,
+        )
+    return call
+
+
+def add_latency(latency):
+    """
+    Make every query of every connection, opened now or later,
+    `latency` ms longer.
+    """
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency / 1000)
+        return execute(sql, params, many, context)
+
+    def add(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(add, weak=False)
+    connection.execute_wrappers.append(delay)
+
+
+def use_async_views(flag):
+    """
+    Switch the URLs to the async views or back (see ASYNC_VIEWS).
+    """
+    from django.conf import settings
+    from django.urls import clear_url_caches
+
+    settings.ASYNC_VIEWS = flag
+    for module in ('task_manager.tasks.urls', 'task_manager.api.urls',
+                   'task_manager.urls'):
+        importlib.reload(importlib.import_module(module))
+    clear_url_caches()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=2)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.handlers.asgi import ASGIHandler
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import Client
+    from django.urls import reverse
+    from benchmarks.data import make_tasks
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    with test_database() as connection:
+        make_tasks(args.tasks, users=args.users)
+        client = Client()
+        client.force_login(User.objects.first())
+        cookie = f"sessionid={client.cookies['sessionid'].value}".encode()
+        task_ids = list(Task.objects.values_list('pk', flat=True)[:50])
+        paths = [
+            *(reverse('task_show', args=[pk]) for pk in task_ids[:8]),
+            reverse('tasks') + '?show_labels=on',
+            reverse('api_tasks') + '?limit=100',
+        ]
+        print(f'{connection.vendor}, {args.tasks} tasks, '
+              f'{args.requests} requests, {args.concurrency} concurrent, '
+              f'{args.latency} ms a query, milliseconds\n')
+        add_latency(args.latency)
+
+        servers = {
+            f'wsgi, {args.threads} thread(s)': (False, lambda: wsgi_caller(
+                WSGIHandler(), cookie, args.threads,
+            )),
+            'asgi, sync views': (False, lambda: asgi_caller(
+                ASGIHandler(), cookie,
+            )),
+            'asgi, async views': (True, lambda: asgi_caller(
+                ASGIHandler(), cookie,
+            )),
+        }
+        rows = []
+        for server, (async_views, make_caller) in servers.items():
+            use_async_views(async_views)
+            call = make_caller()
+            asyncio.run(run_load(call, paths, len(paths) * 2, 4))  # Warm up.
+            elapsed, timings = asyncio.run(
+                run_load(call, paths, args.requests, args.concurrency)
+            )
+            rows.append({
+                'server': server,
+                'req/s': f'{args.requests / elapsed:.0f}',
+                'p50': f'{percentile(timings, 0.5):.1f}',
+                'p99': f'{percentile(timings, 0.99):.1f}',
+            })
+        use_async_views(False)
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Cold start: time from launching a fresh interpreter to the first served
+request (the home page, through the WSGI application), and the import
+time reported by `python -X importtime`.
+
+    python -m benchmarks.bench_boot --repeat 5 --json boot.json
+
+Variants:
+    dev          DEBUG with Rollbar, loads the development apps
+    production   no DEBUG, no Rollbar token
+and each with the bytecode compiled beforehand (as in the Docker image)
+or compiled on boot (PYTHONDONTWRITEBYTECODE, the image before).
+Only the project is compiled on boot: pip and Python install the
+bytecode of the libraries.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.utils import print_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FIRST_REQUEST = '''
+import io, os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+from task_manager.wsgi import application
+status = []
+body = application({
+    'REQUEST_METHOD': 'GET', 'SCRIPT_NAME': '', 'PATH_INFO': '/',
+    'QUERY_STRING': '', 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+    'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'localhost',
+    'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+    'wsgi.errors': io.StringIO(),
+}, lambda code, headers, exc_info=None: status.append(code))
+b''.join(body)
+assert status[0].startswith('200'), status
+'''
+
+SETTINGS = {
+    'dev': {'DEBUG': 'True', 'ROLLBAR_ACCESS_TOKEN': 'benchmarks'},
+    'production': {'DEBUG': 'False', 'ROLLBAR_ACCESS_TOKEN': ''},
+}
+
+
+def copy_project(directory):
+    """
+    The project without its bytecode.
+    """
+    for name in ('task_manager', 'locale'):
+        shutil.copytree(
+            ROOT / name, Path(directory) / name,
+            ignore=shutil.ignore_patterns('__pycache__'),
+        )
+
+
+def boot(directory, env):
+    """
+    Milliseconds to the first response, and the import time in ms.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', FIRST_REQUEST],
+        cwd=directory, env=env, capture_output=True, text=True,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        raise RuntimeError(result.stderr[-2000:])
+    # import time: self [us] | cumulative | imported package
+    imports = sum(
+        int(line.split('|')[0].split(':')[1])
+        for line in result.stderr.splitlines()
+        if line.startswith('import time:') and 'self [us]' not in line
+    )
+    return elapsed, imports / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    rows = []
+    for name, settings in SETTINGS.items():
+        for compiled in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                copy_project(directory)
+                env = {**os.environ, **settings, 'SECRET_KEY': 'benchmarks'}
+                if compiled:
+                    subprocess.run(
+                        [sys.executable, '-m', 'compileall', '-q', '.'],
+                        cwd=directory, check=True,
+                    )
+                else:
+                    env['PYTHONDONTWRITEBYTECODE'] = '1'
+                timings = [boot(directory, env) for _ in range(args.repeat)]
+            rows.append({
+                'settings': name,
+                'bytecode': 'precompiled' if compiled else 'on boot',
+                'first request ms': round(
+                    statistics.median(t[0] for t in timings), 1),
+                'imports ms': round(
+                    statistics.median(t[1] for t in timings), 1),
+            })
+
+    print(f'median of {args.repeat} boots\n')
+    print_table(rows, list(rows[0]))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(rows, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
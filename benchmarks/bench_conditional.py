@@ -0,0 +1,66 @@
+"""
+Conditional GET of the task pages: a full render against a 304
+answered from the version stamps.
+
+    python -m benchmarks.bench_conditional --tasks 100000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+# Name, URL kwargs, query string.
+PAGES = {
+    'list': ('tasks', None, {}),
+    'list, labels': ('tasks', None, {'show_labels': 'on'}),
+    'detail': ('task_show', {'pk': 1}, {}),
+    'api list': ('api_tasks', None, {}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import Client
+    from django.urls import reverse
+    from benchmarks.data import make_tasks
+    from task_manager.users.models import User
+
+    with test_database() as connection:
+        make_tasks(args.tasks, users=args.users)
+        client = Client()
+        client.force_login(User.objects.first())
+        print(f'{connection.vendor}, {args.tasks} tasks, milliseconds\n')
+
+        rows = []
+        for title, (name, kwargs, data) in PAGES.items():
+            url = reverse(name, kwargs=kwargs)
+            etag = client.get(url, data)['ETag']
+            plans = {
+                '200': lambda: client.get(url, data),
+                '304': lambda: client.get(
+                    url, data, HTTP_IF_NONE_MATCH=etag
+                ),
+            }
+            assert plans['304']().status_code == 304
+            for plan, func in plans.items():
+                timing = measure(func, args.repeat)
+                rows.append({
+                    'page': title,
+                    'answer': plan,
+                    'median': f"{timing['median']:.1f}",
+                    'p95': f"{timing['p95']:.1f}",
+                })
+
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Task export: time to the first chunk, total time and peak Python
+memory of the streamed CSV, for growing numbers of tasks.
+
+    python -m benchmarks.bench_export --tasks 100000 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.utils import setup_django, test_database, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, nargs='+',
+                        default=[10000, 100000])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from benchmarks.data import make_tasks
+    from task_manager.tasks import export
+    from task_manager.tasks.models import Task
+
+    rows = []
+    with test_database() as connection:
+        make_tasks(max(args.tasks))
+        for count in sorted(args.tasks):
+            queryset = Task.objects.order_by('date_created', 'id')[:count]
+            for file_format, (_, stream) in export.FORMATS.items():
+                rows.append({
+                    'tasks': count,
+                    'format': file_format,
+                    **run(stream, export.project(queryset)),
+                })
+
+    print(f'{connection.vendor}, milliseconds, megabytes\n')
+    print_table(rows, list(rows[0]))
+
+
+def run(stream, queryset):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in stream(queryset.iterator(chunk_size=2000)):
+        if first is None:
+            first = time.perf_counter()
+        size += len(chunk)
+    end = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'first chunk': f'{(first - start) * 1000:.1f}',
+        'total': f'{(end - start) * 1000:.0f}',
+        'output': f'{size / 2 ** 20:.1f}',
+        'peak memory': f'{peak / 2 ** 20:.1f}',
+    }
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Facet counts of the task filter form: the grouped count per status,
+and a cache hit.
+
+    python -m benchmarks.bench_facets --tasks 1000000 --users 5000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+SELECTIONS = {
+    'no filter': '',
+    'one status': 'status=1',
+    'one executor': 'executor=1',
+    'one label': 'labels=1',
+    'two labels': 'labels=1&labels=2&labels_match=all',
+    'search': 'q={word}',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.cache import cache
+    from django.http import QueryDict
+    from benchmarks.data import WORDS, make_tasks
+    from task_manager.tasks.facets import count_facets, \
+        facet_querysets, get_facet_counts
+    from task_manager.tasks.filters import TaskFilter
+    from task_manager.tasks.models import Task
+
+    with test_database() as connection:
+        make_tasks(args.tasks, users=args.users)
+        print(f'{connection.vendor}, {Task.objects.count()} tasks, '
+              f'{args.users} users, milliseconds\n')
+
+        rows = []
+        for title, data in SELECTIONS.items():
+            data = QueryDict(data.format(word=WORDS[0]))
+            task_filter = TaskFilter(data, queryset=Task.objects.all())
+            assert task_filter.form.is_valid(), task_filter.form.errors
+            cache.clear()
+            get_facet_counts(task_filter)
+            plans = {
+                'count': lambda: count_facets(
+                    task_filter.qs, facet_querysets(task_filter)
+                ),
+                'cache hit': lambda: get_facet_counts(task_filter),
+            }
+            for plan, func in plans.items():
+                timing = measure(func, args.repeat, warmup=1)
+                rows.append({
+                    'selection': title,
+                    'plan': plan,
+                    'median': f"{timing['median']:.1f}",
+                    'p95': f"{timing['p95']:.1f}",
+                })
+
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
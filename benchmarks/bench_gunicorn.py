@@ -0,0 +1,200 @@
+"""
+Throughput and latency of gunicorn.conf.py profiles under concurrent
+load, each served by a real gunicorn on a throwaway SQLite database
+(or the database of --database-url).
+
+Clients ask for task pages, the task list and the tasks API in turn,
+over keep-alive connections when the server allows it. The clients run
+on the same machine: compare the profiles with each other, not with
+a production host.
+
+    python -m benchmarks.bench_gunicorn --concurrency 64 --requests 3000
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.utils import print_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# label: GUNICORN_* variables
+VARIANTS = {
+    'sync': {'PROFILE': 'sync'},
+    'gthread-2': {'PROFILE': 'gthread', 'THREADS': '2'},
+    'gthread-4': {'PROFILE': 'gthread', 'THREADS': '4'},
+    'gthread-8': {'PROFILE': 'gthread', 'THREADS': '8'},
+    'async': {'PROFILE': 'async'},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+
+def fetch(connection, path, cookie):
+    """
+    GET `path`: the latency in ms, and whether the server closes the
+    connection.
+    """
+    start = time.perf_counter()
+    connection.request('GET', path, headers={'Cookie': cookie})
+    response = connection.getresponse()
+    response.read()
+    elapsed = (time.perf_counter() - start) * 1000
+    assert response.status == 200, response.status
+    return elapsed, response.will_close
+
+
+def client(port, cookie, paths, requests, timings, connects):
+    """
+    Take requests from the shared iterator until there are none left,
+    over one connection while the server keeps it open.
+    """
+    connection = None
+    for i in iter(lambda: next(requests, None), None):
+        if connection is None:
+            connection = http.client.HTTPConnection('127.0.0.1', port)
+            connects.append(connection)
+        elapsed, closed = fetch(connection, paths[i % len(paths)], cookie)
+        timings.append(elapsed)
+        if closed:
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+
+def run_load(port, cookie, paths, total, concurrency):
+    """
+    `total` requests from `concurrency` client threads.
+    Returns the elapsed seconds, the sorted latencies in ms and the
+    number of connections opened.
+    """
+    requests = iter(range(total))
+    timings = []
+    connects = []
+    threads = [
+        threading.Thread(target=client, args=(
+            port, cookie, paths, requests, timings, connects,
+        ))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(timings), len(connects)
+
+
+def prepare(args):
+    """
+    Fill the database, and return a session cookie and the paths.
+    """
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmarks')
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test import Client
+    from django.urls import reverse
+    from benchmarks.data import make_tasks
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    call_command('migrate', verbosity=0)
+    if not Task.objects.exists():
+        make_tasks(args.tasks, users=args.users)
+    client = Client()
+    client.force_login(User.objects.first())
+    task_ids = list(Task.objects.values_list('pk', flat=True)[:8])
+    paths = [
+        *(reverse('task_show', args=[pk]) for pk in task_ids),
+        reverse('tasks') + '?show_labels=on',
+        reverse('api_tasks') + '?limit=100',
+    ]
+    return f"sessionid={client.cookies['sessionid'].value}", paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--database-url')
+    parser.add_argument(
+        '--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS),
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.database_url:
+            args.database_url = f'sqlite:///{directory}/bench.sqlite3'
+        cookie, paths = prepare(args)
+        print(f'{os.cpu_count()} CPUs, {args.tasks} tasks, '
+              f'{args.requests} requests, {args.concurrency} clients, '
+              f'milliseconds\n')
+
+        rows = []
+        for label in args.variants:
+            port = free_port()
+            env = {
+                **os.environ,
+                'GUNICORN_BIND': f'127.0.0.1:{port}',
+                'GUNICORN_MAX_REQUESTS': '0',
+                **{f'GUNICORN_{name}': value
+                   for name, value in VARIANTS[label].items()},
+            }
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                 '--log-level', 'warning'],
+                cwd=ROOT, env=env,
+            )
+            try:
+                wait_for(port)
+                run_load(port, cookie, paths, len(paths) * 4, 4)  # Warm up.
+                elapsed, timings, connects = run_load(
+                    port, cookie, paths, args.requests, args.concurrency,
+                )
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait()
+            rows.append({
+                'profile': label,
+                'req/s': f'{args.requests / elapsed:.0f}',
+                'p50': f'{statistics.median(timings):.1f}',
+                'p99': f'{timings[int(len(timings) * 0.99)]:.1f}',
+                'connections': connects,
+            })
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Bulk task import throughput (rows/s): the batched importer with
+several batch sizes, with a conflict in every batch (saved again row
+by row), and one TaskForm save per row.
+
+    python -m benchmarks.bench_import --rows 50000
+"""
+import argparse
+import csv
+import io
+import random
+import time
+
+from benchmarks.utils import setup_django, test_database, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--form-rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from benchmarks.data import WORDS, make_tasks
+    from task_manager.tasks import importer
+    from task_manager.tasks.forms import TaskForm
+    from task_manager.users.models import User
+
+    with test_database() as connection:
+        make_tasks(0)
+        author = User.objects.first()
+
+        def make_csv(prefix, count):
+            rnd = random.Random(1)
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(importer.COLUMNS)
+            for i in range(count):
+                writer.writerow((
+                    f'{prefix} {i}',
+                    ' '.join(rnd.choices(WORDS, k=20)),
+                    f'status {rnd.randrange(5)}',
+                    f'user{rnd.randrange(100)}',
+                    ', '.join(
+                        f'label {n}' for n in rnd.sample(range(20), 3)
+                    ),
+                ))
+            return output.getvalue().encode()
+
+        rows = []
+        for batch_size in (100, 1000, 5000):
+            content = make_csv(f'batch {batch_size}', args.rows)
+            start = time.perf_counter()
+            result = importer.import_tasks(
+                importer.read_rows(io.BytesIO(content), 'csv'),
+                author,
+                batch_size=batch_size,
+            )
+            elapsed = time.perf_counter() - start
+            assert not result.errors, result.errors[:5]
+            rows.append({
+                'plan': f'importer, batch {batch_size}',
+                'rows': result.created,
+                'seconds': f'{elapsed:.2f}',
+                'rows/s': f'{result.created / elapsed:.0f}',
+            })
+
+        # A task named like a row of every batch is saved after the
+        # batch was checked: every batch is saved again row by row.
+        class Late(importer.References):
+            def __init__(self, rows):
+                super().__init__(rows)
+                self.existing = set()
+
+        batch_size = 1000
+        content = make_csv('conflict', args.rows)
+        taken = list(importer.read_rows(io.BytesIO(content), 'csv'))
+        importer.import_tasks(taken[::batch_size], author)
+        start = time.perf_counter()
+        result = importer.import_tasks(
+            importer.read_rows(io.BytesIO(content), 'csv'),
+            author,
+            batch_size=batch_size,
+            references=Late,
+        )
+        elapsed = time.perf_counter() - start
+        assert len(result.errors) == len(taken[::batch_size])
+        rows.append({
+            'plan': f'importer, batch {batch_size}, a conflict in each',
+            'rows': result.created,
+            'seconds': f'{elapsed:.2f}',
+            'rows/s': f'{result.created / elapsed:.0f}',
+        })
+
+        content = make_csv('form', args.form_rows)
+        start = time.perf_counter()
+        for row in importer.read_rows(io.BytesIO(content), 'csv'):
+            form = TaskForm(data=form_data(row))
+            assert form.is_valid(), form.errors
+            form.instance.author = author
+            form.save()
+        elapsed = time.perf_counter() - start
+        rows.append({
+            'plan': 'TaskForm per row',
+            'rows': args.form_rows,
+            'seconds': f'{elapsed:.2f}',
+            'rows/s': f'{args.form_rows / elapsed:.0f}',
+        })
+
+        print(f'{connection.vendor}\n')
+        print_table(rows, list(rows[0]))
+
+
+def form_data(row):
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.users.models import User
+
+    return {
+        'name': row['name'],
+        'description': row['description'],
+        'status': Status.objects.get(name=row['status']).pk,
+        'executor': User.objects.get(username=row['executor']).pk,
+        'labels': list(Label.objects.filter(
+            name__in=row['labels'].split(', ')
+        ).values_list('pk', flat=True)),
+    }
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+"Any of" / "all of" label filters on tasks with many labels:
+the TaskFilter plans against the other ones, with the (label, task) index.
+
+    python -m benchmarks.bench_label_filters --tasks 100000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+# The paginate_by of the task list.
+PAGE_SIZE = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--labels', type=int, default=50)
+    parser.add_argument('--labels-per-task', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from benchmarks.data import make_tasks
+    from task_manager.tasks.filters import TaskFilter
+    from task_manager.tasks.models import Task, TaskLabelRelation
+
+    with test_database() as connection:
+        make_tasks(
+            args.tasks,
+            labels=args.labels,
+            labels_per_task=args.labels_per_task,
+        )
+        print(f'{connection.vendor}, {Task.objects.count()} tasks, '
+              f'{TaskLabelRelation.objects.count()} task labels, '
+              f'median milliseconds of count(*) and of the first page\n')
+
+        task_filter = TaskFilter(queryset=Task.objects.all())
+        plans = {
+            'any: join + DISTINCT': lambda qs, ids:
+                qs.filter(labels__in=ids).distinct(),
+            'any: EXISTS (TaskFilter)': task_filter.get_with_any_label,
+            'all: join per label (TaskFilter)':
+                task_filter.get_with_all_labels,
+            'all: GROUP BY/HAVING': grouped,
+        }
+
+        rows = []
+        for size in (2, 4, 8):
+            label_ids = list(range(1, size + 1))
+            for title, plan in plans.items():
+                queryset = plan(Task.objects.all(), label_ids)
+                count = measure(queryset.count, args.repeat, warmup=1)
+                page = queryset.order_by(*task_filter.orderings['-date'])
+                first_page = measure(
+                    lambda: list(page[:PAGE_SIZE]), args.repeat, warmup=1,
+                )
+                rows.append({
+                    'labels': size,
+                    'plan': title,
+                    'tasks': queryset.count(),
+                    'count': f"{count['median']:.1f}",
+                    'first page': f"{first_page['median']:.1f}",
+                })
+
+        print_table(rows, list(rows[0]))
+
+
+def grouped(queryset, label_ids):
+    from django.db.models import Count
+    from task_manager.tasks.models import TaskLabelRelation
+
+    tasks = TaskLabelRelation.objects \
+        .filter(label__in=label_ids) \
+        .values('task') \
+        .annotate(matched=Count('label')) \
+        .filter(matched=len(label_ids)) \
+        .values('task')
+    return queryset.filter(pk__in=tasks)
+
+
+if __name__ == '__main__':
+    main()
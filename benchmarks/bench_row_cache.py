@@ -0,0 +1,76 @@
+"""
+Task list page with the row cache cold, warm and turned off.
+
+    python -m benchmarks.bench_row_cache --tasks 100000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.cache import cache
+    from django.db import connection as db
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from benchmarks.data import make_tasks
+    from task_manager import metrics
+    from task_manager.users.models import User
+
+    with test_database() as connection:
+        make_tasks(args.tasks, users=args.users)
+        client = Client()
+        client.force_login(User.objects.first())
+        url = reverse('tasks')
+        print(f'{connection.vendor}, {args.tasks} tasks, '
+              f'50 rows a page, milliseconds\n')
+
+        def cold(data):
+            # LocMemCache keys are ':<version>:<key>'.
+            cache.delete_many([
+                key.split(':', 2)[2] for key in list(cache._cache)
+                if key.split(':', 2)[2].startswith('task_row')
+            ])
+            client.get(url, data)
+
+        plans = {
+            'off': (0, lambda data: client.get(url, data)),
+            'cold': (86400, cold),
+            'warm': (86400, lambda data: client.get(url, data)),
+        }
+        rows = []
+        for columns, data in (('', {}), ('labels', {'show_labels': 'on'})):
+            for plan, (timeout, func) in plans.items():
+                with override_settings(TASK_ROW_CACHE_TIMEOUT=timeout):
+                    with CaptureQueriesContext(db) as queries:
+                        func(data)
+                    count = len(queries)
+                    timing = measure(lambda: func(data), args.repeat)
+                rows.append({
+                    'columns': columns or 'default',
+                    'row cache': plan,
+                    'queries': count,
+                    'median': f"{timing['median']:.1f}",
+                    'p95': f"{timing['p95']:.1f}",
+                })
+        print_table(rows, list(rows[0]))
+        totals = metrics.collect(metrics.TOTALS)
+        hits, misses = (
+            totals.get(metrics.key(f'task_row_cache_{name}_total'), 0)
+            for name in ('hits', 'misses')
+        )
+        print(f'\nhit ratio {hits / (hits + misses):.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Task search latency: full-text index (TaskFilter `q`) against icontains.
+Searches matching more than SEARCH_RANK_LIMIT tasks are not ranked:
+`ranked` is what ranking all of their matches would cost.
+
+    python -m benchmarks.bench_search --tasks 1000000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Q
+    from benchmarks.data import make_tasks, WORDS
+    from task_manager.tasks.filters import TaskFilter
+    from task_manager.tasks.models import Task
+    from task_manager.tasks.search import search
+
+    queries = {
+        'common word': WORDS[0],
+        'rare word': WORDS[-1],
+        'prefix': WORDS[10][:4],
+        'two words': f'{WORDS[1]} {WORDS[50]}',
+    }
+
+    with test_database() as connection:
+        make_tasks(args.tasks)
+        print(f'{connection.vendor}, {Task.objects.count()} tasks, '
+              f'first page of 50, milliseconds\n')
+
+        rows = []
+        for title, query in queries.items():
+            def full_text():
+                qs = TaskFilter({'q': query}, Task.objects.all()).qs
+                return list(qs[:50])
+
+            def ranked():
+                qs = search(Task.objects.all(), query).order_by('-rank', 'id')
+                return list(qs[:50])
+
+            def icontains():
+                condition = Q()
+                for word in query.split():
+                    condition &= Q(name__icontains=word) | \
+                        Q(description__icontains=word)
+                return list(
+                    Task.objects.filter(condition).order_by('id')[:50]
+                )
+
+            index = measure(full_text, args.repeat)
+            rank = measure(ranked, args.repeat)
+            scan = measure(icontains, args.repeat)
+            rows.append({
+                'query': title,
+                'matches': search(Task.objects.all(), query).count(),
+                'index median': f"{index['median']:.1f}",
+                'index p95': f"{index['p95']:.1f}",
+                'ranked median': f"{rank['median']:.1f}",
+                'icontains median': f"{scan['median']:.1f}",
+                'icontains p95': f"{scan['p95']:.1f}",
+            })
+
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
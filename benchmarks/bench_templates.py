@@ -0,0 +1,79 @@
+"""
+Rendering time of the hot templates under the Django and Jinja2 engines:
+a table of task rows on its own, then the task and user list pages
+(row cache off).
+
+    python -m benchmarks.bench_templates --rows 1000
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.template.loader import get_template
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from benchmarks.data import make_tasks
+    from task_manager.helpers import django_templates, jinja2_templates
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    engines = {
+        'django': django_templates(),
+        'jinja2': jinja2_templates(),
+    }
+
+    with test_database() as connection:
+        make_tasks(args.rows, users=args.users)
+        tasks = list(
+            Task.objects
+            .select_related('status', 'author', 'executor')
+            .prefetch_related('labels')[:args.rows]
+        )
+        client = Client()
+        client.force_login(User.objects.first())
+        print(f'{connection.vendor}, {len(tasks)} task rows, '
+              f'{args.users} users, milliseconds\n')
+
+        def table(show_labels):
+            template = get_template('tasks/task_row.html')
+            for task in tasks:
+                template.render({
+                    'task': task,
+                    'show_labels': show_labels,
+                    'read_model': False,
+                })
+
+        cases = {
+            f'{len(tasks)} rows': lambda: table(False),
+            f'{len(tasks)} rows, labels': lambda: table(True),
+            'task list page': lambda: client.get(reverse('tasks')),
+            'user list page': lambda: client.get(reverse('users')),
+        }
+        rows = []
+        for case, func in cases.items():
+            row = {'case': case}
+            for engine, templates in engines.items():
+                with override_settings(
+                    TEMPLATES=templates, TASK_ROW_CACHE_TIMEOUT=0,
+                ):
+                    timing = measure(func, args.repeat)
+                row[engine] = f"{timing['median']:.1f}"
+            speedup = float(row['django']) / float(row['jinja2'])
+            row['speedup'] = f'{speedup:.2f}x'
+            rows.append(row)
+        print_table(rows, list(rows[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import random
+
+WORDS = [
+    ''.join(random.Random(i).choices('abcdefghijklmnopqrstuvwxyz', k=6))
+    for i in range(5000)
+]
+# Zipf-like word frequencies: a few very common words, a long tail.
+WEIGHTS = [1 / (rank + 1) for rank in range(len(WORDS))]
+
+
+def make_tasks(count, labels=20, users=100, labels_per_task=3,
+               batch_size=5000, seed=1):
+    """
+    Fill the database with `count` tasks with random names and
+    descriptions, a few users, statuses and labels.
+    """
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task, TaskLabelRelation
+    from task_manager.users.models import User
+
+    rnd = random.Random(seed)
+    users = User.objects.bulk_create(
+        User(username=f'user{i}', first_name='User', last_name=str(i))
+        for i in range(users)
+    )
+    statuses = Status.objects.bulk_create(
+        Status(name=f'status {i}') for i in range(5)
+    )
+    labels = Label.objects.bulk_create(
+        Label(name=f'label {i}') for i in range(labels)
+    )
+
+    for start in range(0, count, batch_size):
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=f'{rnd.choice(WORDS)} {i}',
+                description=' '.join(
+                    rnd.choices(WORDS, WEIGHTS, k=rnd.randint(3, 40))
+                ),
+                author=rnd.choice(users),
+                executor=rnd.choice(users),
+                status=rnd.choice(statuses),
+            )
+            for i in range(start, min(start + batch_size, count))
+        )
+        TaskLabelRelation.objects.bulk_create(
+            TaskLabelRelation(task=task, label=label)
+            for task in tasks
+            for label in rnd.sample(labels, rnd.randint(0, labels_per_task))
+        )
+    analyze()
+
+
+def analyze():
+    """
+    Table statistics for the planner, as autovacuum gathers them after
+    such a load on PostgreSQL.
+    """
+    from django.db import connection
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
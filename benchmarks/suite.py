@@ -0,0 +1,344 @@
+"""
+The benchmark suite: the main pages, the task filter and the task list
+template, on generated datasets, compared with a stored baseline.
+
+    python -m benchmarks.suite --sizes 1k 100k --json results.json \
+        --baseline benchmarks/baseline.json --tolerance 0.2
+
+Every database of --database-url (SQLite in memory by default, as the
+test runner makes it) is benchmarked in a process of its own. Results
+are keyed by database, size and case: the median, p95 and minimum in
+milliseconds, and the queries run. Compared with --baseline, a case
+that runs more queries is a regression, and so is a case whose
+minimum (--metric) grew by more than --tolerance and by more than
+--noise ms and is even slower than the baseline p95: a slowdown
+within the spread of the baseline runs is noise. Timings are only
+compared with a baseline of the same machine and CPU count. On a
+regression the exit status is 1. --save-baseline adds the results to
+the baseline file instead of failing.
+
+Cases:
+    tasks            task list, first page
+    tasks filtered   task list by status, label and search
+    task             task page
+    create task      task form POST
+    users            user list
+    filter qs        TaskFilter and its queryset, built not run
+    tasks.html       the task list template with its rows, not cached,
+                     from the view's context
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.utils import setup_django, test_database, measure, \
+    print_table
+
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+FILTER = 'status=1&labels=1&q={word}'
+
+
+def size(value):
+    value = value.lower()
+    return SIZES[value] if value in SIZES else int(value)
+
+
+def label(tasks):
+    return next(
+        (name for name, count in SIZES.items() if count == tasks),
+        str(tasks),
+    )
+
+
+def in_request(func):
+    """
+    Run func as in a request: the versions are read once.
+    """
+    from task_manager import versions
+
+    def wrapper():
+        versions.start_request()
+        try:
+            return func()
+        finally:
+            versions.finish_request()
+    return wrapper
+
+
+def cases(client, tasks):
+    """
+    name: function to measure, for a database of `tasks` tasks.
+    """
+    from django.http import QueryDict
+    from django.template.loader import get_template
+    from django.test import override_settings
+    from django.urls import reverse
+    from benchmarks.data import WORDS
+    from task_manager.tasks import row_cache
+    from task_manager.tasks.filters import TaskFilter
+    from task_manager.tasks.models import Task
+
+    task = Task.objects.order_by('pk')[tasks // 2]
+    filtered = reverse('tasks') + '?' + FILTER.format(word=WORDS[0])
+    created = itertools.count()
+    form = {'description': 'Benchmark', 'status': task.status_id,
+            'executor': task.executor_id}
+
+    def get(path):
+        response = client.get(path)
+        assert response.status_code == 200, response.status_code
+        return response
+
+    def create():
+        response = client.post(reverse('task_create'), {
+            **form, 'name': f'benchmark {next(created)}',
+        })
+        assert response.status_code == 302, response.status_code
+
+    # Every round writes to the same table as the first.
+    def remove_created():
+        Task.objects.filter(name__startswith='benchmark ').delete()
+
+    create.after = remove_created
+
+    data = QueryDict(FILTER.format(word=WORDS[0]))
+
+    @in_request
+    def filter_qs():
+        return TaskFilter(data, queryset=Task.objects.all()).qs
+
+    page = get(reverse('tasks'))
+    template = get_template('tasks/tasks.html')
+    # The view has rendered the rows already: render them again, from
+    # the full tasks and without the row cache.
+    context = page.context_data
+    rows = context['view'].get_rows([task.pk for task in context['tasks']])
+
+    @in_request
+    @override_settings(TASK_ROW_CACHE_TIMEOUT=0)
+    def render():
+        task_rows = row_cache.render_rows(
+            rows, None, read_model=context['read_model'],
+        )
+        return template.render(
+            {**context, 'task_rows': task_rows}, page.wsgi_request,
+        )
+
+    return {
+        'tasks': lambda: get(reverse('tasks')),
+        'tasks filtered': lambda: get(filtered),
+        'task': lambda: get(reverse('task_show', args=[task.pk])),
+        'create task': create,
+        'users': lambda: get(reverse('users')),
+        'filter qs': filter_qs,
+        'tasks.html': render,
+    }
+
+
+def run(args):
+    """
+    Benchmark the database of this process, with args.sizes[0] tasks.
+    """
+    setup_django()
+
+    from django.db import connection as default_connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from benchmarks.data import make_tasks
+    from task_manager.users.models import User
+
+    tasks = args.sizes[0]
+    results = {}
+    with test_database() as connection:
+        make_tasks(tasks, users=min(args.users, tasks))
+        client = Client()
+        client.force_login(User.objects.first())
+        print(f'{connection.vendor}, {tasks} tasks', file=sys.stderr)
+        # A case may clean up after every call, outside of the timing.
+        for case, func in cases(client, tasks).items():
+            timing = measure(
+                func, args.repeat, warmup=5,
+                after=getattr(func, 'after', None),
+            )
+            with CaptureQueriesContext(default_connection) as queries:
+                func()
+            results[f'{connection.vendor}/{label(tasks)}/{case}'] = {
+                **{key: round(value, 3) for key, value in timing.items()},
+                'queries': len(queries),
+            }
+    return results
+
+
+def run_databases(args):
+    """
+    Results of every database and size, each benchmarked by a child
+    process on a new database.
+    """
+    results = {}
+    for url, tasks in itertools.product(
+        args.database_url or [None], args.sizes,
+    ):
+        env = dict(os.environ)
+        if url:
+            env['DATABASE_URL'] = url
+        else:
+            env.pop('DATABASE_URL', None)
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.suite', '--run',
+                 '--sizes', str(tasks), '--users', str(args.users),
+                 '--repeat', str(args.repeat), '--json', output.name],
+                env=env, check=True,
+            )
+            results.update(json.load(output)['results'])
+    return results
+
+
+def compare(results, baseline, tolerance, noise, metric='min',
+            timings=True):
+    """
+    Table rows of the results, and whether any regressed from the
+    baseline. Without `timings`, only the queries are compared.
+    """
+    rows = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            rows.append({'case': key, 'baseline': '-',
+                         metric: f"{result[metric]:.2f}",
+                         'change': '', 'queries': result['queries'],
+                         'status': 'new'})
+            continue
+        change = result[metric] / before[metric] - 1
+        slower = timings and is_slower(result, before, tolerance, noise,
+                                       metric)
+        more_queries = result['queries'] > before['queries']
+        rows.append({
+            'case': key,
+            'baseline': f"{before[metric]:.2f}",
+            metric: f"{result[metric]:.2f}",
+            'change': f'{change:+.0%}',
+            'queries': f"{before['queries']} -> {result['queries']}"
+            if more_queries else result['queries'],
+            'status': 'REGRESSION' if slower or more_queries else 'ok',
+        })
+    return rows, any(row['status'] == 'REGRESSION' for row in rows)
+
+
+def is_slower(result, before, tolerance, noise, metric):
+    """
+    Slower by more than the tolerance, the noise floor and the spread
+    of the baseline runs.
+    """
+    slowdown = result[metric] - before[metric]
+    return all((
+        slowdown > before[metric] * tolerance,
+        slowdown > noise,
+        result[metric] > before['p95'],
+    ))
+
+
+def load_baseline(path):
+    """
+    The meta and results of the baseline file, empty without one.
+    """
+    if path and Path(path).exists():
+        document = json.loads(Path(path).read_text())
+        return document['meta'], document['results']
+    return {}, {}
+
+
+def machine():
+    return {'machine': platform.machine(), 'cpus': os.cpu_count()}
+
+
+def same_machine(meta):
+    return all(meta.get(key) == value for key, value in machine().items())
+
+
+def save(path, results):
+    document = {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            **machine(),
+        },
+        'results': results,
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + '\n')
+
+
+def report(results, meta, baseline, args):
+    """
+    Print the comparison with the baseline, and return whether any
+    case regressed.
+    """
+    timings = not baseline or same_machine(meta)
+    rows, regressed = compare(
+        results, baseline, args.tolerance, args.noise, args.metric,
+        timings=timings,
+    )
+    if not rows:
+        print('\nNo results.')
+        return regressed
+    print(f'\nmilliseconds, {args.metric} of {args.repeat}, '
+          f'tolerance {args.tolerance:.0%}\n')
+    if not timings:
+        print(f"The baseline comes from another machine "
+              f"({meta.get('machine')}, {meta.get('cpus')} CPUs): "
+              f"only the queries are compared.\n")
+    print_table(rows, list(rows[0]))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument('--sizes', type=size, nargs='+', default=[1000],
+                        help='tasks in the database: 1k, 100k, 1m, ...')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database-url', action='append',
+                        help='a database to benchmark (repeatable)')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--baseline', help='compare with this file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='add the results to the baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='slowdown allowed, 0.3 for 30%%')
+    parser.add_argument('--metric', choices=['median', 'min', 'p95'],
+                        default='min', help='the timing compared')
+    parser.add_argument('--noise', type=float, default=1.0,
+                        help='milliseconds a slowdown must exceed')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline needs --baseline')
+
+    if args.run:
+        save(args.json, run(args))
+        return
+
+    results = run_databases(args)
+    if args.json:
+        save(args.json, results)
+    meta, baseline = load_baseline(args.baseline)
+    regressed = report(results, meta, baseline, args)
+    if args.save_baseline:
+        save(args.baseline, {**baseline, **results})
+        print(f'\nSaved to {args.baseline}')
+    elif regressed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmarks')
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Run the benchmark against a throwaway database created like
+    the test runner does (in-memory for SQLite, test_<name> otherwise).
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, \
+        teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=20, warmup=2, after=None):
+    """
+    Call func repeatedly and return timings in milliseconds.
+    after(), if given, runs after every call, outside of the timing.
+    """
+    for _ in range(warmup):
+        func()
+        if after:
+            after()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        if after:
+            after()
+    timings.sort()
+    return {
+        'median': statistics.median(timings),
+        'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'min': timings[0],
+    }
+
+
+def print_table(rows, columns):
+    widths = [
+        max(len(str(column)), *(len(f'{row[column]}') for row in rows))
+        for column in columns
+    ]
+    print('  '.join(
+        str(column).ljust(width) for column, width in zip(columns, widths)
+    ))
+    for row in rows:
+        print('  '.join(
+            f'{row[column]}'.ljust(width)
+            for column, width in zip(columns, widths)
+        ))
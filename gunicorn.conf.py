@@ -0,0 +1,130 @@
+"""
+Gunicorn settings, read by `gunicorn` from the working directory.
+
+GUNICORN_PROFILE picks the worker model:
+
+    sync     processes serving one request at a time, no keep-alive
+    gthread  processes with a pool of threads each (the default)
+    async    uvicorn workers serving task_manager.asgi (needs the asgi extra)
+
+Workers and threads follow the CPU count. Every value can be set with
+its GUNICORN_* variable. benchmarks/bench_gunicorn.py measures the
+profiles; README.md has the numbers behind the defaults.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+from importlib.util import find_spec
+
+
+def env(name, default, cast=int):
+    value = os.getenv(f'GUNICORN_{name}')
+    return default if value is None else cast(value)
+
+
+def flag(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+cpus = multiprocessing.cpu_count()
+
+# profile: (worker class, application, workers, threads)
+PROFILES = {
+    'sync': (
+        'sync', 'task_manager.wsgi:application', 2 * cpus + 1, 1,
+    ),
+    # A thread waits on the database while the other runs Python; more
+    # threads only fight over the GIL (see the benchmark).
+    'gthread': (
+        'gthread', 'task_manager.wsgi:application', cpus + 1, 2,
+    ),
+    # Concurrency comes from the event loop and the views' thread pool.
+    'async': (
+        'uvicorn.workers.UvicornWorker', 'task_manager.asgi:application',
+        cpus + 1, 1,
+    ),
+}
+
+profile = env('PROFILE', 'gthread', str)
+if profile not in PROFILES:
+    raise RuntimeError(
+        f'GUNICORN_PROFILE must be one of {", ".join(PROFILES)}, '
+        f'not {profile!r}'
+    )
+worker_class, wsgi_app, default_workers, default_threads = PROFILES[profile]
+# uvicorn comes with the asgi extra only: stop with the reason
+# rather than with gunicorn's worker class import error.
+if worker_class.startswith('uvicorn.') and not find_spec('uvicorn'):
+    raise RuntimeError(
+        f'GUNICORN_PROFILE={profile} needs uvicorn, which is not '
+        f'installed: poetry install -E asgi'
+    )
+
+bind = env('BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}", str)
+workers = env('WORKERS', default_workers)
+threads = env('THREADS', default_threads)
+
+# Idle connections are kept open (gthread and async) this many seconds.
+keepalive = env('KEEPALIVE', 5)
+timeout = env('TIMEOUT', 30)
+graceful_timeout = env('GRACEFUL_TIMEOUT', 30)
+
+# Recycle every worker after about this many requests (0: never):
+# slow leaks stay bounded, and the jitter keeps them from all
+# restarting at once.
+max_requests = env('MAX_REQUESTS', 1000)
+max_requests_jitter = env('MAX_REQUESTS_JITTER', 100)
+
+# Load the application once in the master and fork the workers from
+# it: faster boots, and the code pages are shared between workers.
+preload_app = env('PRELOAD_APP', True, flag)
+
+# Heartbeat files on a memory filesystem (Docker's /tmp is on disk).
+memory_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+if memory_dir:
+    worker_tmp_dir = memory_dir
+
+# The workers share their request metrics through files there
+# (see task_manager.metrics).
+# A directory of our own is removed on exit.
+own_metrics_dir = not os.getenv('METRICS_DIR')
+if own_metrics_dir:
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(
+        prefix='task-manager-metrics-', dir=memory_dir,
+    )
+
+
+def on_starting(server):
+    from task_manager import metrics
+    metrics.clear(os.environ['METRICS_DIR'])
+
+
+def post_fork(server, worker):
+    # A connection the master opened is not to be shared by workers.
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Load the statuses, labels and users before the first request.
+    from django.db import DatabaseError, connections
+    from task_manager import reference
+
+    try:
+        reference.preload()
+    except DatabaseError as error:
+        worker.log.warning('Reference data not preloaded: %s', error)
+    finally:
+        connections.close_all()
+
+
+def child_exit(server, worker):
+    from task_manager import metrics
+    metrics.mark_process_dead(worker.pid, os.environ['METRICS_DIR'])
+
+
+def on_exit(server):
+    if own_metrics_dir:
+        shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
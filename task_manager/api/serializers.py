@@ -0,0 +1,141 @@
+"""
+Serializers of the JSON API.
+
+Rows are read with values() and turned into dicts directly: no model
+instances, no forms. Each serializer maps its public field names to
+columns, and clients may ask for a subset of them (`?fields=id,name`).
+"""
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+
+from task_manager import versions
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskLabelRelation
+from task_manager.users.models import User
+
+
+class Serializer:
+    model = None
+    # Public name -> column, or None for fields filled by serialize().
+    fields = {}
+    ordering = ('id',)
+    # Versions of the data behind the answers (conditional GET).
+    version_names = ()
+
+    def __init__(self, fields=None):
+        if not fields:
+            self.selected = list(self.fields)
+            return
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(unknown)}.')
+        self.selected = list(dict.fromkeys(fields))
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def columns(self):
+        return [self.fields[name] for name in self.selected
+                if self.fields[name]]
+
+    def prepare(self, queryset, ordering=()):
+        """
+        A values() queryset with the selected columns, and the ones
+        needed to paginate by `ordering`.
+        """
+        columns = self.columns()
+        for field in ordering:
+            column = self.column_of(field.lstrip('-'))
+            if column not in columns:
+                columns.append(column)
+        return queryset.prefetch_related(None).values(*columns)
+
+    def column_of(self, field):
+        try:
+            return self.model._meta.get_field(field).attname
+        except FieldDoesNotExist:
+            return field
+
+    def serialize(self, rows):
+        return [
+            {name: row[self.fields[name]] if self.fields[name] else None
+             for name in self.selected}
+            for row in rows
+        ]
+
+
+class TaskSerializer(Serializer):
+    model = Task
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+        'status': 'status_id',
+        'author': 'author_id',
+        'executor': 'executor_id',
+        'labels': None,
+        'date_created': 'date_created',
+        'updated_at': 'updated_at',
+    }
+    # Filters check the referenced statuses, users and labels.
+    version_names = versions.ALL
+
+    def columns(self):
+        columns = super().columns()
+        if 'labels' in self.selected and 'id' not in columns:
+            columns.append('id')
+        return columns
+
+    def serialize(self, rows):
+        data = super().serialize(rows)
+        if 'labels' in self.selected:
+            labels = self.get_labels([row['id'] for row in rows])
+            for row, item in zip(rows, data):
+                item['labels'] = labels[row['id']]
+        return data
+
+    def get_labels(self, task_ids):
+        """
+        Label ids of all the tasks, in one query.
+        """
+        labels = defaultdict(list)
+        relations = TaskLabelRelation.objects \
+            .filter(task_id__in=task_ids) \
+            .order_by('label_id') \
+            .values_list('task_id', 'label_id')
+        for task_id, label_id in relations:
+            labels[task_id].append(label_id)
+        return labels
+
+
+class StatusSerializer(Serializer):
+    model = Status
+    version_names = (versions.STATUSES,)
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'date_created': 'date_created',
+    }
+
+
+class LabelSerializer(Serializer):
+    model = Label
+    version_names = (versions.LABELS,)
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'date_created': 'date_created',
+    }
+
+
+class UserSerializer(Serializer):
+    model = User
+    version_names = (versions.USERS,)
+    fields = {
+        'id': 'id',
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }
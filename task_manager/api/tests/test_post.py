@@ -0,0 +1,90 @@
+import json
+
+from django.urls import reverse_lazy
+
+from task_manager.helpers import QueryBudget
+from task_manager.tasks.models import Task
+from .testcase import ApiTestCase
+
+
+class TestTasksBatchApi(ApiTestCase):
+    def batch(self, body, data=''):
+        return self.client.post(
+            f'{reverse_lazy("api_tasks_batch")}{data}',
+            json.dumps(body),
+            content_type='application/json',
+        )
+
+    def test_batch_get(self) -> None:
+        response = self.batch({'get': [3, 100, 1]}, '?fields=id,name')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'tasks': [{'id': 3, 'name': 'Repeat'}, {'id': 1, 'name': 'Eat'}],
+            'not_found': [100],
+            'created': [],
+            'errors': [],
+        })
+
+    def test_batch_create(self) -> None:
+        response = self.batch({'create': [
+            {'name': 'Cook', 'status': 1, 'executor': 2, 'labels': [1, 3]},
+            {'name': 'Eat', 'status': 1, 'executor': 2},
+            {'name': 'Walk', 'status': 9, 'executor': 2},
+            {'name': 'Run', 'status': 1, 'executor': 'two'},
+            {'name': 'Swim', 'status': 2, 'executor': 3},
+        ]}, '?fields=name,author,labels')
+
+        data = response.json()
+        self.assertEqual(data['created'], [
+            {'name': 'Cook', 'author': 1, 'labels': [1, 3]},
+            {'name': 'Swim', 'author': 1, 'labels': []},
+        ])
+        self.assertEqual([error['index'] for error in data['errors']],
+                         [1, 2, 3])
+        self.assertEqual(Task.objects.count(), self.count + 2)
+
+    def test_batch_constant_queries(self) -> None:
+        def body(prefix, size):
+            return {
+                'get': list(range(1, size)),
+                'create': [
+                    {'name': f'{prefix} {i}', 'status': 1, 'executor': 2,
+                     'labels': [1, 2]}
+                    for i in range(size)
+                ],
+            }
+
+        with QueryBudget(22) as small:
+            self.batch(body('Small', 2))
+        with QueryBudget(22) as large:
+            response = self.batch(body('Large', 50))
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(response.json()['created']), 50)
+
+    def test_batch_invalid_body(self) -> None:
+        response = self.client.post(
+            reverse_lazy('api_tasks_batch'),
+            'nonsense',
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.batch({'get': ['1']})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.batch({'create': {}})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_too_many(self) -> None:
+        response = self.batch({'get': list(range(1001))})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.batch({'get': [1]})
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,226 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import AsyncRequestFactory
+from django.urls import reverse_lazy
+
+from task_manager.api.serializers import StatusSerializer
+from task_manager.api.views import AsyncApiDetailView, AsyncTasksApiView
+from task_manager.helpers import QueryBudget, call_async_view
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from .testcase import ApiTestCase
+
+
+class TestTasksApi(ApiTestCase):
+    def get(self, data=None, name='api_tasks', **kwargs):
+        response = self.client.get(reverse_lazy(name, kwargs=kwargs), data)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response
+
+    def test_tasks_list(self) -> None:
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([task['id'] for task in data['results']], [1, 2, 3])
+        self.assertEqual(data['results'][2], {
+            'id': 3,
+            'name': 'Repeat',
+            'description': 'Again',
+            'status': 2,
+            'author': 3,
+            'executor': 1,
+            'labels': [1, 2],
+            'date_created': '2023-01-27T12:45:30.456Z',
+            'updated_at': DjangoJSONEncoder().default(
+                Task.objects.get(pk=3).updated_at
+            ),
+        })
+        self.assertIsNone(data['next'])
+        self.assertIsNone(data['previous'])
+
+    def test_tasks_sparse_fields(self) -> None:
+        response = self.get({'fields': 'name,labels'})
+
+        self.assertEqual(response.json()['results'][1], {
+            'name': 'Sleep', 'labels': [1],
+        })
+
+    def test_tasks_unknown_fields(self) -> None:
+        response = self.get({'fields': 'name,password'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+
+    def test_tasks_filter(self) -> None:
+        response = self.get({'executor': 1, 'sort': 'name', 'fields': 'id'})
+
+        self.assertEqual(response.json()['results'], [{'id': 3}, {'id': 2}])
+
+    def test_tasks_search(self) -> None:
+        response = self.get({'q': 'sle', 'fields': 'name'})
+
+        self.assertEqual(response.json()['results'], [{'name': 'Sleep'}])
+
+    def test_tasks_invalid_filter(self) -> None:
+        response = self.get({'status': 'abc'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json()['error'])
+
+    def test_tasks_pagination(self) -> None:
+        first = self.get({'limit': 2, 'fields': 'id', 'sort': '-date'}).json()
+
+        self.assertEqual(first['results'], [{'id': 3}, {'id': 2}])
+        self.assertIsNone(first['previous'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual(second['results'], [{'id': 1}])
+        self.assertIsNone(second['next'])
+
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_tasks_invalid_cursor(self) -> None:
+        response = self.get({'cursor': 'nonsense'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_detail(self) -> None:
+        response = self.get({'fields': 'id,labels'}, name='api_task', pk=3)
+
+        self.assertEqual(response.json(), {'id': 3, 'labels': [1, 2]})
+
+    def test_task_not_found(self) -> None:
+        response = self.get(name='api_task', pk=100)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tasks_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_tasks_constant_queries(self) -> None:
+        with QueryBudget(5) as small:
+            self.get()
+
+        Task.objects.bulk_create(
+            Task(name=f'Bulk {i}', author=self.user1, executor=self.user1,
+                 status_id=1)
+            for i in range(60)
+        )
+
+        with QueryBudget(5) as large:
+            response = self.get()
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(json.loads(response.content)['results']), 50)
+
+    def test_tasks_not_modified(self) -> None:
+        etag = self.get()['ETag']
+
+        response = self.client.get(
+            reverse_lazy('api_tasks'), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_payload_smaller_than_html(self) -> None:
+        Task.objects.bulk_create(
+            Task(name=f'Bulk {i}', author=self.user1, executor=self.user1,
+                 status_id=1)
+            for i in range(60)
+        )
+
+        html = self.client.get(reverse_lazy('tasks'))
+        api = self.get({'fields': 'id,name,status,executor'})
+
+        self.assertLess(len(api.content) * 10, len(html.content))
+
+
+class TestReferenceApi(ApiTestCase):
+    def test_statuses(self) -> None:
+        response = self.client.get(
+            reverse_lazy('api_statuses'), {'fields': 'id,name'}
+        )
+
+        self.assertEqual(response.json()['results'], [
+            {'id': 1, 'name': 'Started'},
+            {'id': 2, 'name': 'Paused'},
+            {'id': 3, 'name': 'Finished'},
+        ])
+
+    def test_statuses_modified(self) -> None:
+        url = reverse_lazy('api_statuses')
+        etag = self.client.get(url)['ETag']
+        Status.objects.create(name='New')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_statuses_not_modified_by_tasks(self) -> None:
+        url = reverse_lazy('api_statuses')
+        etag = self.client.get(url)['ETag']
+        Task.objects.get(pk=1).save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_labels(self) -> None:
+        response = self.client.get(reverse_lazy('api_label', kwargs={'pk': 2}))
+
+        self.assertEqual(response.json()['name'], 'Work')
+
+    def test_users_hide_credentials(self) -> None:
+        response = self.client.get(reverse_lazy('api_users'))
+
+        user = response.json()['results'][0]
+        self.assertEqual(user, {
+            'id': 1,
+            'username': 'Lennie',
+            'first_name': 'John',
+            'last_name': 'Lennon',
+        })
+
+    def test_users_password_not_selectable(self) -> None:
+        response = self.client.get(
+            reverse_lazy('api_users'), {'fields': 'password'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestAsyncApi(ApiTestCase):
+    def call(self, view_class, data=None, user=None, **kwargs):
+        request = AsyncRequestFactory().get('/', data)
+        request.user = user or self.user1
+        return call_async_view(view_class, request, **kwargs)
+
+    def test_tasks_list(self) -> None:
+        response = self.call(AsyncTasksApiView, {'fields': 'name'})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['results']), self.count)
+
+    def test_detail(self) -> None:
+        response = self.call(
+            AsyncApiDetailView,
+            initkwargs={'serializer_class': StatusSerializer},
+            pk=1,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['id'], 1)
+
+    def test_not_logged_in(self) -> None:
+        response = self.call(AsyncTasksApiView, user=AnonymousUser())
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,24 @@
+from django.test import TestCase, Client
+
+from task_manager.helpers import bump_versions_at_once, \
+    detect_n_plus_one, test_english, remove_rollbar
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+@test_english
+@remove_rollbar
+@bump_versions_at_once
+@detect_n_plus_one
+class ApiTestCase(TestCase):
+    fixtures = ['user.json', 'status.json', 'task.json', 'label.json']
+
+    def setUp(self) -> None:
+        self.client = Client()
+
+        self.task3 = Task.objects.get(pk=3)
+        self.count = Task.objects.count()
+
+        self.user1 = User.objects.get(pk=1)
+
+        self.client.force_login(self.user1)
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.urls import path
+
+from .serializers import StatusSerializer, LabelSerializer, UserSerializer, \
+    TaskSerializer
+from . import views
+from .views import TasksBatchApiView
+
+
+if settings.ASYNC_VIEWS:
+    ApiListView, ApiDetailView, TasksApiView = \
+        views.AsyncApiListView, views.AsyncApiDetailView, \
+        views.AsyncTasksApiView
+else:
+    ApiListView, ApiDetailView, TasksApiView = \
+        views.ApiListView, views.ApiDetailView, views.TasksApiView
+
+
+urlpatterns = [
+    path('tasks/', TasksApiView.as_view(), name='api_tasks'),
+    path('tasks/batch/', TasksBatchApiView.as_view(),
+         name='api_tasks_batch'),
+    path('tasks/<int:pk>/',
+         ApiDetailView.as_view(serializer_class=TaskSerializer),
+         name='api_task'),
+
+    path('statuses/',
+         ApiListView.as_view(serializer_class=StatusSerializer),
+         name='api_statuses'),
+    path('statuses/<int:pk>/',
+         ApiDetailView.as_view(serializer_class=StatusSerializer),
+         name='api_status'),
+
+    path('labels/',
+         ApiListView.as_view(serializer_class=LabelSerializer),
+         name='api_labels'),
+    path('labels/<int:pk>/',
+         ApiDetailView.as_view(serializer_class=LabelSerializer),
+         name='api_label'),
+
+    path('users/',
+         ApiListView.as_view(serializer_class=UserSerializer),
+         name='api_users'),
+    path('users/<int:pk>/',
+         ApiDetailView.as_view(serializer_class=UserSerializer),
+         name='api_user'),
+]
@@ -0,0 +1,228 @@
+import json
+
+from django.http import JsonResponse
+from django.views.generic import View
+
+from task_manager.mixins import AsyncViewMixin, ConditionalGetMixin
+from task_manager.pagination import CursorPaginator, InvalidCursor
+from task_manager.tasks import importer
+from task_manager.tasks.filters import TaskFilter
+from task_manager.users.models import User
+from .serializers import TaskSerializer
+
+
+class ApiError(Exception):
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ApiMixin:
+    """
+    JSON answers for the API: errors are returned as
+    {"error": ...} with a status code instead of redirects and pages.
+
+    Authentication required (the session of the site).
+    """
+    serializer_class = None
+
+    def get_version_names(self):
+        return self.serializer_class.version_names
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.error('Authentication required.', 401)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return self.error(error.message, error.status)
+
+    def error(self, message, status):
+        return JsonResponse({'error': message}, status=status)
+
+    def get_serializer(self):
+        fields = self.request.GET.get('fields')
+        try:
+            return self.serializer_class(
+                fields.split(',') if fields else None
+            )
+        except ValueError as error:
+            raise ApiError(str(error))
+
+
+class ApiListView(ApiMixin, ConditionalGetMixin, View):
+    """
+    A page of objects, and the URLs of the next and previous pages.
+
+    Cursor pagination: ?cursor= and ?limit= (up to max_limit).
+    Answers 304 when nothing changed since the client's copy.
+    """
+    default_limit = 50
+    max_limit = 500
+
+    def get_queryset(self, serializer):
+        return serializer.get_queryset()
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            raise ApiError('Limit must be a number.')
+        return max(1, min(limit, self.max_limit))
+
+    def get_page_url(self, cursor):
+        params = self.request.GET.copy()
+        params['cursor'] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{params.urlencode()}'
+        )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        queryset = self.get_queryset(serializer)
+        ordering = queryset.query.order_by or serializer.ordering
+        paginator = CursorPaginator(
+            serializer.prepare(queryset, ordering),
+            self.get_limit(),
+            ordering,
+        )
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError('Invalid cursor.')
+
+        return JsonResponse({
+            'results': serializer.serialize(page.object_list),
+            'next': self.get_page_url(page.next_cursor)
+            if page.has_next() else None,
+            'previous': self.get_page_url(page.previous_cursor)
+            if page.has_previous() else None,
+        })
+
+
+class ApiDetailView(ApiMixin, ConditionalGetMixin, View):
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        rows = serializer.prepare(
+            serializer.get_queryset().filter(pk=kwargs['pk'])
+        )
+        data = serializer.serialize(list(rows))
+        if not data:
+            raise ApiError('Not found.', 404)
+        return JsonResponse(data[0])
+
+
+class TasksApiView(ApiListView):
+    """
+    Tasks, filtered with the parameters of TaskFilter.
+    """
+    serializer_class = TaskSerializer
+
+    def get_queryset(self, serializer):
+        filterset = TaskFilter(
+            self.request.GET or None,
+            queryset=serializer.get_queryset(),
+            request=self.request,
+        )
+        if filterset.is_bound and not filterset.is_valid():
+            raise ApiError({
+                field: [error['message'] for error in errors]
+                for field, errors in
+                filterset.errors.get_json_data().items()
+            })
+        return filterset.qs
+
+
+# Served by the ASGI server (ASYNC_VIEWS), see AsyncViewMixin.
+
+class AsyncApiListView(AsyncViewMixin, ApiListView):
+    pass
+
+
+class AsyncApiDetailView(AsyncViewMixin, ApiDetailView):
+    pass
+
+
+class AsyncTasksApiView(AsyncViewMixin, TasksApiView):
+    pass
+
+
+class IdReferences(importer.References):
+    keys = {'status': 'pk', 'executor': 'pk', 'labels': 'pk'}
+
+
+class TasksBatchApiView(ApiMixin, View):
+    """
+    Read and create many tasks in one request.
+
+    The body is {"get": [ids], "create": [tasks]}. New tasks give
+    status, executor and labels by id; the current user is the author.
+    Tasks that cannot be created are listed in "errors" by their index
+    in "create", the others are created.
+    """
+    serializer_class = TaskSerializer
+    max_items = 1000
+
+    def get_body(self):
+        try:
+            body = json.loads(self.request.body)
+        except ValueError:
+            raise ApiError('The body must be JSON.')
+        if not isinstance(body, dict):
+            raise ApiError('The body must be an object.')
+        get, create = body.get('get', []), body.get('create', [])
+        self.check_list(create, 'create')
+        self.check_list(get, 'get')
+        if not all(isinstance(pk, int) for pk in get):
+            raise ApiError('"get" must be a list of ids.')
+        return get, create
+
+    def check_list(self, items, name):
+        if not isinstance(items, list):
+            raise ApiError(f'"{name}" must be a list.')
+        if len(items) > self.max_items:
+            raise ApiError(f'At most {self.max_items} tasks at once.')
+
+    def fetch(self, serializer, task_ids):
+        """
+        Serialized tasks in the order of the ids, and the missing ids.
+        """
+        if not task_ids:
+            return [], []
+        rows = {
+            row['id']: row for row in serializer.prepare(
+                serializer.get_queryset().filter(pk__in=task_ids), ['id']
+            )
+        }
+        task_ids = list(dict.fromkeys(task_ids))
+        found = [rows[pk] for pk in task_ids if pk in rows]
+        missing = [pk for pk in task_ids if pk not in rows]
+        return serializer.serialize(found), missing
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        get, create = self.get_body()
+
+        result = importer.ImportResult()
+        if create:
+            result = importer.import_tasks(
+                create,
+                User.objects.get(pk=request.user.pk),
+                batch_size=self.max_items,
+                references=IdReferences,
+            )
+        tasks, not_found = self.fetch(serializer, get)
+        created, _missing = self.fetch(serializer, result.task_ids)
+
+        return JsonResponse({
+            'tasks': tasks,
+            'not_found': not_found,
+            'created': created,
+            'errors': [
+                {'index': number - 1, 'error': message}
+                for number, message in result.errors
+            ],
+        })
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class TaskManagerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'task_manager'
+
+    def ready(self):
+        from . import query_inspector, signals, timing  # noqa: F401
+        timing.install()
+        query_inspector.install()
@@ -1,6 +1,17 @@
 import json
 import os
+from importlib import import_module
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import connection
 from django.test import modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from task_manager import versions
 
 
 test_english = override_settings(
@@ -16,6 +27,96 @@ remove_rollbar = modify_settings(
 )
 
 
+def detect_n_plus_one(test_class):
+    """
+    Fail the tests of `test_class` on N+1 queries in the requests of
+    the test client, see task_manager.query_inspector.
+    """
+    test_class = override_settings(N_PLUS_ONE_RAISE=True)(test_class)
+    return modify_settings(MIDDLEWARE={
+        'append': 'task_manager.middleware.QueryInspectorMiddleware',
+    })(test_class)
+
+
+def bump_versions_at_once(test_class):
+    """
+    Bump the versions (task_manager.versions) as soon as the tests of
+    `test_class` change something, fixtures included: outside of tests
+    they wait for a commit, which never comes in a TestCase.
+    """
+    set_up_class = test_class.setUpClass.__func__
+
+    def setUpClass(cls):
+        patcher = mock.patch.object(
+            versions, 'bump_on_commit', lambda names: versions.bump(*names),
+        )
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        set_up_class(cls)
+
+    test_class.setUpClass = classmethod(setUpClass)
+    return test_class
+
+
+requires_jinja2 = skipUnless(
+    find_spec('jinja2'), 'jinja2 is not installed: poetry install -E jinja2',
+)
+
+
+def django_templates():
+    """
+    TEMPLATES without the Jinja2 backend, whatever JINJA2_TEMPLATES says.
+    """
+    return [
+        backend for backend in settings.TEMPLATES
+        if backend['BACKEND'] != settings.JINJA2_BACKEND['BACKEND']
+    ]
+
+
+def jinja2_templates():
+    """
+    TEMPLATES with the Jinja2 backend first.
+    """
+    return [settings.JINJA2_BACKEND, *django_templates()]
+
+
+def call_async_view(view_class, request, initkwargs=None, **kwargs):
+    """
+    Run an AsyncViewMixin view on a request of AsyncRequestFactory
+    (with its user set), in the test's thread: other threads do not
+    see the test's data.
+    """
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request._messages = FallbackStorage(request)
+    view = view_class.as_view(thread_sensitive=True, **(initkwargs or {}))
+    return async_to_sync(view)(request, **kwargs)
+
+
 def load_data(path):
     with open(os.path.abspath(f'task_manager/fixtures/{path}'), 'r') as file:
         return json.loads(file.read())
+
+
+class QueryBudget(CaptureQueriesContext):
+    """
+    Fail if the block runs more than `budget` queries.
+
+        with QueryBudget(5):
+            self.client.get(url)
+    """
+
+    def __init__(self, budget, using=connection):
+        super().__init__(using)
+        self.budget = budget
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self) > self.budget:
+            queries = '\n'.join(
+                f'{i}. {query["sql"]}'
+                for i, query in enumerate(self.captured_queries, start=1)
+            )
+            raise AssertionError(
+                f'{len(self)} queries executed, '
+                f'the budget is {self.budget}:\n{queries}'
+            )
@@ -0,0 +1,49 @@
+"""
+Jinja2 environment of the templates in task_manager/jinja2, used when
+JINJA2_TEMPLATES is on.
+
+They are ports of the Django templates rendered the most (task list,
+user list and the base layout) and give the same HTML: the globals and
+filters below stand in for the tags those templates load.
+"""
+from bootstrap4.templatetags import bootstrap4
+from django.templatetags.static import static
+from django.template import defaultfilters
+from django.urls import reverse
+from django.utils import translation
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, pass_context
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args, kwargs=kwargs)
+
+
+def date(value, arg=None):
+    # Django localizes datetimes before its date filter sees them.
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+@pass_context
+def bootstrap_messages(context):
+    return bootstrap4.bootstrap_messages(dict(context.get_all()))
+
+
+def environment(**options):
+    extensions = options.setdefault('extensions', [])
+    if 'jinja2.ext.i18n' not in extensions:
+        extensions.append('jinja2.ext.i18n')
+    env = Environment(**options)
+    env.install_gettext_translations(translation, newstyle=True)
+    env.globals.update({
+        'url': url,
+        'static': static,
+        'get_current_language': translation.get_language,
+        'bootstrap_css': bootstrap4.bootstrap_css,
+        'bootstrap_javascript': bootstrap4.bootstrap_javascript,
+        'bootstrap_form': bootstrap4.bootstrap_form,
+        'bootstrap_button': bootstrap4.bootstrap_button,
+        'bootstrap_messages': bootstrap_messages,
+    })
+    env.filters['date'] = date
+    return env
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:41
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='label',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='label_name_lower_idx'),
+        ),
+    ]
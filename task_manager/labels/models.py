@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 
@@ -20,3 +21,7 @@ class Label(models.Model):
     class Meta:
         verbose_name = _('Label')
         verbose_name_plural = _('Labels')
+        # Prefix search for the autocomplete widget.
+        indexes = [
+            models.Index(Lower('name'), name='label_name_lower_idx'),
+        ]
@@ -95,3 +95,28 @@ class TestDeleteLabelView(LabelTestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('login'))
+
+
+class TestAutocompleteLabels(LabelTestCase):
+    def test_autocomplete_labels(self) -> None:
+        response = self.client.get(
+            reverse_lazy('labels_autocomplete'), {'q': 'st'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'results': [{'id': self.label3.pk, 'text': self.label3.name}]
+        })
+
+    def test_autocomplete_labels_ordered(self) -> None:
+        response = self.client.get(reverse_lazy('labels_autocomplete'))
+
+        names = [item['text'] for item in response.json()['results']]
+        self.assertEqual(names, sorted(names))
+
+    def test_autocomplete_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.client.get(reverse_lazy('labels_autocomplete'))
+
+        self.assertEqual(response.status_code, 302)
@@ -1,12 +1,14 @@
 from django.urls import path
 
 from .views import LabelsListView, LabelCreateView,\
-    LabelUpdateView, LabelDeleteView
+    LabelUpdateView, LabelDeleteView, LabelsAutocompleteView
 
 
 urlpatterns = [
     path('', LabelsListView.as_view(), name='labels'),
     path('create/', LabelCreateView.as_view(), name='label_create'),
+    path('autocomplete/', LabelsAutocompleteView.as_view(),
+         name='labels_autocomplete'),
     path('<int:pk>/update/', LabelUpdateView.as_view(), name='label_update'),
     path('<int:pk>/delete/', LabelDeleteView.as_view(), name='label_delete'),
 ]
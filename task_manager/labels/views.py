@@ -3,14 +3,16 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.utils.translation import gettext_lazy as _
 from django.contrib.messages.views import SuccessMessageMixin
 
+from task_manager import reference
 from task_manager.mixins import AuthRequiredMixin, DeleteProtectionMixin
+from task_manager.views import AutocompleteView
 from .models import Label
 from .forms import LabelForm
 
 
 class LabelsListView(AuthRequiredMixin, ListView):
     """
-    Show all labels.
+    Show all labels, from the reference cache.
 
     Authorisation required.
     """
@@ -21,6 +23,9 @@ class LabelsListView(AuthRequiredMixin, ListView):
         'title': _('Labels')
     }
 
+    def get_queryset(self):
+        return reference.labels.all()
+
 
 class LabelCreateView(AuthRequiredMixin, SuccessMessageMixin, CreateView):
     """
@@ -75,3 +80,14 @@ class LabelDeleteView(AuthRequiredMixin, DeleteProtectionMixin,
         'title': _('Delete label'),
         'button_text': _('Yes, delete'),
     }
+
+
+class LabelsAutocompleteView(AutocompleteView):
+    """
+    Find labels by the beginning of their name.
+
+    Authorisation required.
+    """
+    model = Label
+    search_fields = ('name',)
+    ordering = ('name',)
@@ -0,0 +1,348 @@
+"""
+Request metrics in the Prometheus text format, served at /metrics/.
+
+Per URL name: request counts by method and status, a latency
+histogram, database queries and their time, and 5xx responses; the
+requests in progress; and the hits and misses of the task row cache.
+
+Each process counts in its own store. With METRICS_DIR set (gunicorn,
+see gunicorn.conf.py) the stores are memory-mapped files in that
+directory, <kind>_<pid>.db, and /metrics/ adds up the files of all the
+workers: any worker answers for all of them. When a worker exits,
+mark_process_dead() adds its counts to totals_exited.db, so counters
+never go back and the directory does not grow with every recycled
+worker, and removes its requests in progress. Without METRICS_DIR the
+stores are dictionaries of the process.
+"""
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+# Upper bounds of the latency buckets, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+PREFIX = 'taskmanager_'
+
+# name: (type, help)
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Requests by URL name, method and status.',
+    ),
+    'http_request_duration_seconds': (
+        'histogram', 'Request latency by URL name.',
+    ),
+    'http_errors_total': (
+        'counter', 'Responses with a 5xx status by URL name.',
+    ),
+    'db_queries_total': (
+        'counter', 'Database queries by URL name.',
+    ),
+    'db_query_duration_seconds_total': (
+        'counter', 'Time spent in database queries by URL name.',
+    ),
+    'http_requests_in_progress': (
+        'gauge', 'Requests being served.',
+    ),
+    'task_row_cache_hits_total': (
+        'counter', 'Task table rows read from the cache.',
+    ),
+    'task_row_cache_misses_total': (
+        'counter', 'Task table rows rendered for the cache.',
+    ),
+}
+
+# Counters and histograms, kept after the process exits.
+TOTALS = 'totals'
+# Gauges of the live processes.
+LIVE = 'live'
+# Totals of the exited processes, added up in one file.
+EXITED = 'exited'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MemoryStore:
+    """
+    Values of one process, by key.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+
+    def inc(self, key, amount=1):
+        with self.lock:
+            self.values[key] += amount
+
+    def items(self):
+        with self.lock:
+            return list(self.values.items())
+
+
+class FileStore:
+    """
+    Values of one process in a memory-mapped file, which other
+    processes read with read_file().
+
+    The file starts with the number of bytes in use (8 bytes), then one
+    entry per key: the key length (4 bytes), the key, padding to
+    8 bytes, and the value (a double). An entry is written whole before
+    the bytes in use are updated, so readers never see half an entry.
+    """
+    initial_size = 64 * 1024
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        # Goes on with the file of an exited process of the same pid.
+        self.offsets = {
+            key: offset for key, _, offset in read_entries(path)
+        } if os.path.exists(path) else {}
+        self.file = open(path, 'a+b')
+        size = max(os.path.getsize(path), self.initial_size)
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.used = max(struct.unpack_from('q', self.map, 0)[0], 8)
+        struct.pack_into('q', self.map, 0, self.used)
+
+    def inc(self, key, amount=1):
+        with self.lock:
+            offset = self.offsets.get(key)
+            if offset is None:
+                offset = self.add(key)
+            value, = struct.unpack_from('d', self.map, offset)
+            struct.pack_into('d', self.map, offset, value + amount)
+
+    def add(self, key):
+        encoded = key.encode()
+        padding = -(4 + len(encoded)) % 8
+        size = 4 + len(encoded) + padding + 8
+        if self.used + size > len(self.map):
+            self.grow(self.used + size)
+        struct.pack_into(
+            f'i{len(encoded)}s{padding}xd', self.map, self.used,
+            len(encoded), encoded, 0.0,
+        )
+        offset = self.used + size - 8
+        self.offsets[key] = offset
+        self.used += size
+        struct.pack_into('q', self.map, 0, self.used)
+        return offset
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def grow(self, needed):
+        size = len(self.map)
+        while size < needed:
+            size *= 2
+        self.map.close()
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+
+
+def read_entries(path):
+    """
+    The keys of a FileStore file, with their values and offsets.
+    """
+    data = Path(path).read_bytes()
+    used, = struct.unpack_from('q', data, 0) if data else (8,)
+    offset = 8
+    while offset < used:
+        length, = struct.unpack_from('i', data, offset)
+        key = data[offset + 4:offset + 4 + length].decode()
+        offset += 4 + length + (-(4 + length) % 8)
+        value, = struct.unpack_from('d', data, offset)
+        yield key, value, offset
+        offset += 8
+
+
+def read_file(path):
+    """
+    The (key, value) pairs of a FileStore file.
+    """
+    for key, value, _ in read_entries(path):
+        yield key, value
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(kind):
+    """
+    The store of this process: a new one after a fork.
+    """
+    pid = os.getpid()
+    with _stores_lock:
+        if _stores.get(kind, (None,))[0] != pid:
+            directory = settings.METRICS_DIR
+            _stores[kind] = (pid, FileStore(
+                Path(directory) / f'{kind}_{pid}.db'
+            ) if directory else MemoryStore())
+        return _stores[kind][1]
+
+
+def collect(kind):
+    """
+    Values of all the processes, added up by key.
+    """
+    directory = settings.METRICS_DIR
+    if not directory:
+        return dict(get_store(kind).items())
+    totals = defaultdict(float)
+    with locked(directory):
+        for path in Path(directory).glob(f'{kind}_*.db'):
+            try:
+                for key, value in read_file(path):
+                    totals[key] += value
+            except FileNotFoundError:  # Removed by mark_process_dead().
+                continue
+    return totals
+
+
+@contextmanager
+def locked(directory, exclusive=False):
+    """
+    Readers share the lock of the directory; merging the totals of an
+    exited worker takes it alone, so that they are never counted twice
+    or missed.
+    """
+    with open(Path(directory, 'lock'), 'a+b') as file:
+        fcntl.flock(file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def mark_process_dead(pid, directory):
+    """
+    Forget the requests in progress of an exited worker, and move its
+    totals to the file of the exited workers.
+    """
+    Path(directory, f'{LIVE}_{pid}.db').unlink(missing_ok=True)
+    path = Path(directory, f'{TOTALS}_{pid}.db')
+    if not path.exists():
+        return
+    with locked(directory, exclusive=True):
+        exited = FileStore(Path(directory, f'{TOTALS}_{EXITED}.db'))
+        try:
+            for key, value in read_file(path):
+                exited.inc(key, value)
+        finally:
+            exited.close()
+        path.unlink()
+
+
+def clear(directory):
+    """
+    Start from zero: remove the files of a previous server.
+    """
+    for path in Path(directory).glob('*.db'):
+        path.unlink()
+
+
+@lru_cache(maxsize=4096)
+def key(name, **labels):
+    return json.dumps([name, labels], sort_keys=True)
+
+
+def request_started():
+    get_store(LIVE).inc(key('http_requests_in_progress'))
+
+
+def request_stopped():
+    get_store(LIVE).inc(key('http_requests_in_progress'), -1)
+
+
+def observe_request(view, method, status, duration, queries, db_duration):
+    store = get_store(TOTALS)
+    store.inc(key('http_requests_total',
+                  view=view, method=method, status=str(status)))
+    bucket = next(
+        (str(bound) for bound in BUCKETS if duration <= bound), '+Inf',
+    )
+    store.inc(key('http_request_duration_seconds_bucket',
+                  view=view, le=bucket))
+    store.inc(key('http_request_duration_seconds_sum', view=view), duration)
+    store.inc(key('http_request_duration_seconds_count', view=view))
+    if status >= 500:
+        store.inc(key('http_errors_total', view=view))
+    store.inc(key('db_queries_total', view=view), queries)
+    store.inc(key('db_query_duration_seconds_total', view=view), db_duration)
+
+
+def observe_row_cache(hits, misses):
+    store = get_store(TOTALS)
+    store.inc(key('task_row_cache_hits_total'), hits)
+    store.inc(key('task_row_cache_misses_total'), misses)
+
+
+def export():
+    """
+    All the metrics, in the Prometheus text format.
+    """
+    samples = defaultdict(list)
+    values = {**collect(TOTALS), **collect(LIVE)}
+    for sample_key, value in sorted(values.items()):
+        name, labels = json.loads(sample_key)
+        samples[name].append((labels, value))
+    for labels, value in cumulate(samples.pop(
+        'http_request_duration_seconds_bucket', [],
+    )):
+        samples['http_request_duration_seconds_bucket'].append(
+            (labels, value)
+        )
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [
+            f'# HELP {PREFIX}{name} {help_text}',
+            f'# TYPE {PREFIX}{name} {kind}',
+        ]
+        names = [name]
+        if kind == 'histogram':
+            names = [f'{name}_bucket', f'{name}_sum', f'{name}_count']
+        for sample_name in names:
+            lines += [
+                f'{PREFIX}{sample_name}{format_labels(labels)} {value!r}'
+                for labels, value in samples.get(sample_name, [])
+            ]
+    return '\n'.join(lines) + '\n'
+
+
+def cumulate(buckets):
+    """
+    Bucket counts as Prometheus wants them: every bucket counts the
+    requests up to its bound, and all of them have a value.
+    """
+    counts = defaultdict(dict)
+    for labels, value in buckets:
+        le = labels.pop('le')
+        counts[json.dumps(labels, sort_keys=True)][le] = value
+    for labels, by_bound in counts.items():
+        total = 0
+        for bound in [*map(str, BUCKETS), '+Inf']:
+            total += by_bound.get(bound, 0)
+            yield {**json.loads(labels), 'le': bound}, total
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{name}="{escape(value)}"' for name, value in labels.items()
+    )
+    return f'{{{pairs}}}'
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"') \
+        .replace('\n', '\\n')
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from task_manager import metrics, query_inspector, timing
+
+logger = logging.getLogger(__name__)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, async capable.
+    After a sync-only middleware the ASGI handler runs the rest of the
+    chain in a sync thread of the request, and the async views through
+    async_to_sync from there.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if asyncio.iscoroutinefunction(get_response):
+            # Tells the handler to await this middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Looks the file up on disk.
+            static_file = await sync_to_async(self.find_file)(
+                request.path_info,
+            )
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Time every request (see task_manager.timing) and send the breakdown
+    as a Server-Timing header (to staff users, or to everyone with
+    SERVER_TIMING_PUBLIC), and in a log line of task_manager.middleware
+    at INFO level.
+    Goes first: `total` covers the whole chain, and `middleware` is
+    what ViewTimingMiddleware's `view` (view and rendering) leaves out.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        request.server_timing, token = timing.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self.finish(request, response, self.shows_timing(request))
+
+    async def __acall__(self, request):
+        request.server_timing, token = timing.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.stop(token)
+        # Reading the user may query the database.
+        shown = await sync_to_async(self.shows_timing)(request)
+        return self.finish(request, response, shown)
+
+    def process_template_response(self, request, response):
+        # The handler renders the response right after this hook.
+        if not response.is_rendered:
+            start = time.perf_counter()
+
+            def rendered(response):
+                request.server_timing.add(
+                    'render', (time.perf_counter() - start) * 1000,
+                )
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, shown):
+        request.server_timing.finish()
+        if shown:
+            response['Server-Timing'] = request.server_timing.header()
+        if logger.isEnabledFor(logging.INFO):
+            values = request.server_timing.as_dict()
+            logger.info(
+                '%s %s %s %s', request.method, request.path,
+                response.status_code,
+                ' '.join(f'{name}={value}' for name, value in values.items()),
+                extra={'server_timing': values},
+            )
+        return response
+
+    @staticmethod
+    def shows_timing(request):
+        if settings.SERVER_TIMING_PUBLIC:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_staff)
+
+
+class ViewTimingMiddleware:
+    """
+    Time the rest of the chain as the `view` span.
+    Goes last, after the middleware to be told apart from the view.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with timing.span('view'):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with timing.span('view'):
+            return await self.get_response(request)
+
+
+class MetricsMiddleware:
+    """
+    Count every request in task_manager.metrics, by URL name.
+    Goes right after ServerTimingMiddleware, whose queries it counts
+    (it times the requests itself when ServerTimingMiddleware is off).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        request_timing, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(token)
+        self.finish(request, response, request_timing)
+        return response
+
+    async def __acall__(self, request):
+        request_timing, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(token)
+        self.finish(request, response, request_timing)
+        return response
+
+    def start(self):
+        metrics.request_started()
+        request_timing = timing.current()
+        if request_timing is None:
+            return timing.start()
+        return request_timing, None
+
+    def stop(self, token):
+        metrics.request_stopped()
+        if token is not None:
+            timing.stop(token)
+
+    def finish(self, request, response, request_timing):
+        match = getattr(request, 'resolver_match', None)
+        metrics.observe_request(
+            view=match.view_name if match else 'unmatched',
+            method=request.method,
+            status=response.status_code,
+            duration=time.perf_counter() - request_timing.started,
+            queries=request_timing.queries,
+            db_duration=request_timing.spans.get('db', 0) / 1000,
+        )
+
+
+class QueryInspectorMiddleware:
+    """
+    Report the N+1 queries of every request, see
+    task_manager.query_inspector.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        queries, token = query_inspector.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            query_inspector.stop(token)
+        query_inspector.check(request, queries)
+        return response
+
+    async def __acall__(self, request):
+        queries, token = query_inspector.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_inspector.stop(token)
+        query_inspector.check(request, queries)
+        return response
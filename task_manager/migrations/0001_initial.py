@@ -0,0 +1,30 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:59
+
+from django.db import migrations, models
+
+NAMES = ('tasks', 'statuses', 'labels', 'users')
+
+
+def create_versions(apps, schema_editor):
+    Version = apps.get_model('task_manager', 'Version')
+    Version.objects.bulk_create(Version(name=name) for name in NAMES)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Version',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,25 @@
+import asyncio
+import hashlib
+import math
+import time
+
+from asgiref.sync import sync_to_async
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import close_old_connections
 from django.db.models import ProtectedError
+from django.http import Http404
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
-from django.utils.translation import gettext as _
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import classproperty
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language, gettext as _
+
+from task_manager import timing, versions
+from task_manager.pagination import CursorPaginator, InvalidCursor
 
 
 class AuthRequiredMixin(LoginRequiredMixin):
@@ -53,6 +69,115 @@ class DeleteProtectionMixin:
             return redirect(self.protected_url)
 
 
+class KeysetPaginationMixin:
+    """
+    Cursor pagination.
+    Pages are addressed by an opaque cursor instead of a page number,
+    so a deep page costs the same as the first one.
+    The queryset ordering must be total (end with a unique field).
+    """
+    paginator_class = CursorPaginator
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = queryset.query.order_by or self.get_ordering()
+        paginator = self.paginator_class(queryset, page_size, ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_page_url(self, cursor):
+        """
+        Keep the current query string (filters, sorting) and
+        replace only the cursor.
+        """
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return f'?{params.urlencode()}'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None:
+            if page.has_next():
+                context['next_page_url'] = \
+                    self.get_page_url(page.next_cursor)
+            if page.has_previous():
+                context['previous_page_url'] = \
+                    self.get_page_url(page.previous_cursor)
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET.
+    The ETag and Last-Modified of a page come from the versions of the
+    data it shows (task_manager.versions), read in one small query.
+    A client sending them back gets 304 Not Modified before the view
+    runs any query of its own or renders anything.
+    """
+    version_names = versions.ALL
+
+    def get_version_names(self):
+        return self.version_names
+
+    def get_etag(self, stamps):
+        """
+        Same data seen by the same user in the same language.
+        The CSRF token is part of the page (forms), so it is too.
+        """
+        request = self.request
+        get_token(request)  # The first page sets the CSRF cookie.
+        key = '|'.join(str(part) for part in (
+            sorted(stamps.items()),
+            request.get_full_path(),
+            request.user.pk,
+            get_language(),
+            request.META.get('CSRF_COOKIE'),
+        ))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    @staticmethod
+    def get_last_modified(stamps):
+        """
+        The time of the latest change, rounded up to whole seconds as
+        If-Modified-Since sends them back. None until that second is
+        over: a change later in it would get the same Last-Modified,
+        only the ETag tells them apart.
+        """
+        if not stamps:
+            return None
+        modified = max(stamp[1] for stamp in stamps.values())
+        last_modified = math.ceil(modified.timestamp())
+        return last_modified if last_modified <= time.time() else None
+
+    def dispatch(self, request, *args, **kwargs):
+        # Pending messages are shown once, on a page that must be rendered.
+        if request.method not in ('GET', 'HEAD') or \
+                len(messages.get_messages(request)):
+            return super().dispatch(request, *args, **kwargs)
+
+        stamps = versions.current()
+        stamps = {name: stamps[name] for name in self.get_version_names()
+                  if name in stamps}
+        etag = self.get_etag(stamps)
+        last_modified = self.get_last_modified(stamps)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+        ) or super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            if last_modified is not None:
+                response.headers.setdefault(
+                    'Last-Modified', http_date(last_modified),
+                )
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class AuthorDeletionMixin(UserPassesTestMixin):
     """
     Authorisation check.
@@ -61,8 +186,18 @@ class AuthorDeletionMixin(UserPassesTestMixin):
     author_message = None
     author_url = None
 
+    def get_object(self, queryset=None):
+        """
+        Fetch the object once for both the check and the view.
+        """
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request, self.author_message)
@@ -75,3 +210,48 @@ class AuthorDeletionMixin(UserPassesTestMixin):
     #         messages.error(self.request, self.author_message)
     #         return redirect(self.author_url)
     #     return super().dispatch(request, *args, **kwargs)
+
+
+class AsyncViewMixin:
+    """
+    Async dispatch, for the ASGI server (see ASYNC_VIEWS).
+    Under ASGI a sync view runs in a new thread for every request, and
+    opens a new database connection there. These views run whole
+    (checks, queries, rendering) in a thread of a pool instead, whose
+    threads keep their connections (CONN_MAX_AGE) across requests.
+    Goes first: the mixins after it run in that thread, unchanged.
+    """
+    # In a thread of the pool, not in the one thread that runs all the
+    # thread-sensitive code. The tests set it (call_async_view): the
+    # test transaction is only seen by the connection of that thread.
+    thread_sensitive = False
+
+    @classproperty
+    def view_is_async(cls):
+        return True
+
+    async def dispatch(self, request, *args, **kwargs):
+        response = await sync_to_async(
+            self.dispatch_in_thread, thread_sensitive=self.thread_sensitive,
+        )(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            # options() and http_method_not_allowed() of async views.
+            response = await response
+        return response
+
+    def dispatch_in_thread(self, request, *args, **kwargs):
+        # A pool thread has its own connection and version stamps:
+        # check them as the request signals do in the handler's thread.
+        if not self.thread_sensitive:
+            close_old_connections()
+        versions.start_request()
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if isinstance(response, SimpleTemplateResponse):
+                with timing.span('render'):
+                    response.render()
+            return response
+        finally:
+            versions.finish_request()
+            if not self.thread_sensitive:
+                close_old_connections()
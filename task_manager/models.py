@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Version(models.Model):
+    """
+    A counter per group of tables, bumped on every change to them
+    by task_manager.versions.
+
+    Reading these few rows tells whether anything changed since
+    a page was rendered, without touching the tables themselves.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name} v{self.value}'
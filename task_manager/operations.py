@@ -0,0 +1,97 @@
+"""
+Migration operations that do not block writes on PostgreSQL.
+
+A plain CREATE INDEX locks the table against writes until the index is
+built, minutes on a table of millions of rows. On PostgreSQL these
+operations build the index CONCURRENTLY instead, which cannot run in a
+transaction: the migrations using them set `atomic = False`. Other
+databases get the plain operation.
+
+django.contrib.postgres has AddIndexConcurrently, but it needs
+psycopg2 to be imported and fails on the other databases.
+"""
+from django.db import migrations
+
+
+def is_postgresql(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if is_postgresql(schema_editor):
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if is_postgresql(schema_editor):
+                schema_editor.remove_index(
+                    model, self.index, concurrently=True,
+                )
+            else:
+                schema_editor.remove_index(model, self.index)
+
+
+class AddUniqueConstraintConcurrently(migrations.AddConstraint):
+    """
+    A UniqueConstraint on fields. On PostgreSQL its unique index is
+    built concurrently, then made the constraint, which only takes a
+    short lock.
+
+    A concurrent build that fails (on a duplicate inserted meanwhile)
+    leaves an invalid index behind: it is dropped before building, so
+    that the migration can be run again once the duplicates are gone.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias,
+                                        model):
+            return
+        if not is_postgresql(schema_editor):
+            schema_editor.add_constraint(model, self.constraint)
+            return
+        table, name = self.quoted_names(schema_editor, model)
+        columns = ', '.join(
+            schema_editor.quote_name(model._meta.get_field(field).column)
+            for field in self.constraint.fields
+        )
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY {name} ON {table} ({columns})'
+        )
+        schema_editor.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX '
+            f'{name}'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias,
+                                        model):
+            return
+        if not is_postgresql(schema_editor):
+            schema_editor.remove_constraint(model, self.constraint)
+            return
+        # Dropping the constraint drops its index, under a short lock:
+        # no scan of the table. An invalid index of a failed build has
+        # no constraint and is dropped concurrently.
+        table, name = self.quoted_names(schema_editor, model)
+        schema_editor.execute(
+            f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}'
+        )
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    def quoted_names(self, schema_editor, model):
+        quote = schema_editor.quote_name
+        return quote(model._meta.db_table), quote(self.constraint.name)
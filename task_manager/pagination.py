@@ -0,0 +1,161 @@
+import base64
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Keep full microsecond precision: DjangoJSONEncoder rounds
+    datetimes to milliseconds, which breaks the keyset predicate.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset.
+    Mimics the parts of django.core.paginator.Page used by templates.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset (cursor) pagination.
+
+    Rows are fetched with a "(a, b, id) > (x, y, z)" predicate
+    instead of OFFSET, so every page costs one index range scan
+    no matter how deep it is. The ordering must be total,
+    i.e. end with a unique column.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    @property
+    def fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def page(self, cursor=None):
+        values, backwards = self.decode(cursor) if cursor else (None, False)
+
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(self._reverse(field) for field in ordering)
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(ordering, values))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            next_cursor = self._cursor(rows[-1]) if rows else None
+            previous_cursor = self._cursor(rows[0], True) if has_more else None
+        else:
+            next_cursor = self._cursor(rows[-1]) if has_more else None
+            previous_cursor = self._cursor(rows[0], True) \
+                if rows and cursor else None
+
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+    def decode(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if len(data['v']) != len(self.fields):
+                raise ValueError(cursor)
+            values = [
+                self._to_python(field, value)
+                for field, value in zip(self.fields, data['v'])
+            ]
+            return values, bool(data.get('b'))
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise InvalidCursor(cursor)
+
+    def encode(self, values, backwards=False):
+        data = {'v': values}
+        if backwards:
+            data['b'] = 1
+        raw = json.dumps(data, cls=CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def _cursor(self, obj, backwards=False):
+        values = [self._value(obj, field) for field in self.fields]
+        return self.encode(values, backwards)
+
+    def _value(self, obj, field):
+        """
+        The value of an ordering field, from a model instance or from
+        a values() dict holding the column (attname) of the field.
+        """
+        try:
+            field = self.queryset.model._meta.get_field(field).attname
+        except FieldDoesNotExist:
+            pass
+        if isinstance(obj, dict):
+            return obj[field]
+        return getattr(obj, field)
+
+    def _to_python(self, field, value):
+        try:
+            model_field = self.queryset.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            return value
+        return model_field.to_python(value)
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek(ordering, values):
+        """
+        Build "(a, b, c) > (x, y, z)" as
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+        with the comparison flipped for descending columns.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
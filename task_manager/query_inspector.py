@@ -0,0 +1,208 @@
+"""
+N+1 queries and slow queries, for development and tests.
+
+QueryInspectorMiddleware (on with QUERY_INSPECTOR, by default in DEBUG)
+records the queries of every request with where they come from: the
+template line being rendered, or else the line of the project's code.
+At the end of the request, queries of the same shape (the SQL without
+its values) repeated N_PLUS_ONE_THRESHOLD times or more from the same
+place are reported: a query per row of a loop, typically a related
+object read as an attribute (`task.status`) that select_related() or
+prefetch_related() would have loaded with the rows.
+
+Reports are logged by task_manager.query_inspector at WARNING level,
+or raised as NPlusOneError with N_PLUS_ONE_RAISE (the test cases turn
+it on, see task_manager.helpers.detect_n_plus_one). Queries slower than
+SLOW_QUERY_MS are logged as they run.
+"""
+import logging
+import re
+import sys
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from task_manager import timing
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('query_inspector', default=None)
+
+PROJECT = Path(__file__).resolve().parent
+# The execute wrappers: never where a query comes from.
+WRAPPERS = {__file__, timing.__file__}
+
+VALUES = re.compile(
+    r"""'(?:[^']|'')*'"""  # Strings.
+    r'|\b\d+(?:\.\d+)?\b'  # Numbers.
+    r'|\(\s*%s(?:\s*,\s*%s)*\s*\)'  # IN (%s, %s, ...).
+)
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+class Query:
+
+    def __init__(self, sql, duration, location, attribute):
+        self.sql = sql
+        self.duration = duration
+        self.location = location
+        # The related field read as an attribute, if any: Task.status.
+        self.attribute = attribute
+
+    @property
+    def shape(self):
+        return fingerprint(self.sql)
+
+
+def fingerprint(sql):
+    """
+    The SQL without its values: queries of the same shape only differ
+    by their parameters, and by the length of their IN lists.
+    """
+    return VALUES.sub('?', ' '.join(sql.split()))
+
+
+def template_location(frame):
+    """
+    template:line if the frame renders a template (Django or Jinja2).
+    """
+    code = frame.f_code
+    is_node = code.co_filename.endswith('template/base.py')
+    if is_node and code.co_name == 'render_annotated':
+        node = frame.f_locals['self']
+        return f'{node.origin.template_name}:{node.token.lineno}'
+    debug_info = frame.f_globals.get('debug_info')
+    if 'environment' in frame.f_globals and isinstance(debug_info, str):
+        # Jinja2: pairs of template line = generated code line.
+        line = 0
+        for pair in debug_info.split('&'):
+            template_line, code_line = map(int, pair.split('='))
+            if code_line <= frame.f_lineno:
+                line = template_line
+        name = frame.f_globals.get('name') or code.co_filename
+        return f'{name}:{line}'
+    return None
+
+
+def code_location(frame):
+    """
+    path:line if the frame runs the project's code.
+    """
+    filename = frame.f_code.co_filename
+    if filename not in WRAPPERS and filename.startswith(str(PROJECT)):
+        path = Path(filename).relative_to(PROJECT.parent)
+        return f'{path}:{frame.f_lineno}'
+    return None
+
+
+def related_attribute(frame):
+    """
+    Model.field if the frame loads a related object on attribute access.
+    """
+    code = frame.f_code
+    is_descriptor = code.co_filename.endswith('related_descriptors.py')
+    if is_descriptor and code.co_name == '__get__':
+        field = getattr(frame.f_locals.get('self'), 'field', None)
+        if field is not None:
+            return f'{field.model.__name__}.{field.name}'
+    return None
+
+
+def find_origin(frame):
+    """
+    Where the query comes from: the innermost template line, or else
+    the innermost line of the project; and the related attribute read.
+    """
+    location = code = attribute = None
+    while frame is not None and location is None:
+        attribute = attribute or related_attribute(frame)
+        location = template_location(frame)
+        code = code or code_location(frame)
+        frame = frame.f_back
+    return location or code or '?', attribute
+
+
+def record_query(execute, sql, params, many, context):
+    queries = _current.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - start) * 1000
+        location, attribute = find_origin(sys._getframe(1))
+        queries.append(Query(sql, duration, location, attribute))
+        if duration >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                'Slow query (%.1f ms) from %s: %s', duration, location, sql,
+            )
+
+
+def add_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """
+    Inspect the queries of every connection, opened now or later.
+    """
+    connection_created.connect(add_wrapper)
+    for connection in connections.all():
+        add_wrapper(connection)
+
+
+def start():
+    """
+    Record the queries from now on: the list, and the token to pass to
+    stop().
+    """
+    queries = []
+    return queries, _current.set(queries)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def find_n_plus_one(queries, threshold):
+    """
+    Descriptions of the queries of the same shape run `threshold` times
+    or more from the same place.
+    """
+    groups = defaultdict(list)
+    for query in queries:
+        groups[query.shape, query.location].append(query)
+    reports = []
+    for (shape, location), group in groups.items():
+        if len(group) < threshold:
+            continue
+        attributes = sorted({
+            query.attribute for query in group if query.attribute
+        })
+        reading = f' (reading {", ".join(attributes)})' if attributes else ''
+        reports.append(
+            f'{len(group)} queries from {location}{reading}: {shape}'
+        )
+    return reports
+
+
+def check(request, queries):
+    reports = find_n_plus_one(queries, settings.N_PLUS_ONE_THRESHOLD)
+    if not reports:
+        return
+    message = '\n'.join([
+        f'N+1 queries in {request.method} {request.path}:', *reports,
+    ])
+    if settings.N_PLUS_ONE_RAISE:
+        raise NPlusOneError(message)
+    logger.warning(message)
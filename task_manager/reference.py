@@ -0,0 +1,165 @@
+"""
+In-process cache of the reference tables: statuses, labels and users.
+
+Each worker keeps the rows of these tables in memory and checks their
+version stamps (task_manager.versions) once per request. When another
+worker changed a table, the stale copy is dropped and reloaded lazily
+by the first request that needs it.
+
+The form fields below serve their choices and validate the submitted
+values from this cache instead of querying the table.
+"""
+import threading
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django_filters import ModelMultipleChoiceFilter
+
+from task_manager import versions
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+
+class ReferenceData:
+    """
+    The rows of `model` as tuples of `fields`, by primary key.
+    Instances are built from them on access.
+    """
+
+    def __init__(self, model, version, fields):
+        self.model = model
+        self.version = version
+        self.fields = fields
+        self.lock = threading.Lock()
+        # (version, rows), replaced as a whole.
+        self.state = None
+
+    def current_version(self):
+        # With its time: a value bumped in a transaction rolled back
+        # may be reached again by other changes.
+        return versions.current().get(self.version)
+
+    def is_stale(self, version):
+        return self.state is None or self.state[0] != version
+
+    def get_rows(self):
+        version = self.current_version()
+        if self.is_stale(version):
+            with self.lock:
+                if self.is_stale(version):
+                    self.state = (version, self.load())
+        return self.state[1]
+
+    def load(self):
+        return {
+            row[0]: row for row in self.model.objects
+            .order_by('pk')
+            .values_list(*self.fields)
+        }
+
+    def build(self, row):
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.fields, row)
+
+    def all(self):
+        return [self.build(row) for row in self.get_rows().values()]
+
+    def get(self, pk):
+        """
+        The object with this primary key, or None.
+        """
+        try:
+            row = self.get_rows().get(int(pk))
+        except (TypeError, ValueError):
+            return None
+        return self.build(row) if row else None
+
+    def __len__(self):
+        return len(self.get_rows())
+
+    def __deepcopy__(self, memo):
+        # Shared by the forms and filters copied for every request.
+        return self
+
+
+statuses = ReferenceData(
+    Status, versions.STATUSES, ('id', 'name', 'date_created', 'is_terminal'),
+)
+labels = ReferenceData(
+    Label, versions.LABELS, ('id', 'name', 'date_created'),
+)
+users = ReferenceData(
+    User, versions.USERS, ('id', 'username', 'first_name', 'last_name'),
+)
+
+
+def preload():
+    """
+    Load every table now rather than on the first request needing it.
+    """
+    for data in (statuses, labels, users):
+        data.get_rows()
+
+
+class ReferenceChoiceIterator(forms.models.ModelChoiceIterator):
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.reference.all():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.reference) + \
+            (1 if self.field.empty_label is not None else 0)
+
+
+class ReferenceFieldMixin:
+    """
+    A model choice field answered from a ReferenceData.
+    """
+    iterator = ReferenceChoiceIterator
+
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        kwargs.setdefault('queryset', reference.model.objects.all())
+        super().__init__(**kwargs)
+
+    def get_objects(self, pks):
+        return [obj for obj in map(self.reference.get, pks) if obj]
+
+    def lookup(self, value):
+        if isinstance(value, self.reference.model):
+            value = value.pk
+        obj = self.reference.get(value)
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
+
+
+class ReferenceChoiceField(ReferenceFieldMixin, forms.ModelChoiceField):
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        return self.lookup(value)
+
+
+class ReferenceMultipleChoiceField(ReferenceFieldMixin,
+                                   forms.ModelMultipleChoiceField):
+
+    def _check_values(self, value):
+        return [self.lookup(pk) for pk in dict.fromkeys(value)]
+
+
+class ReferenceMultipleChoiceFilter(ModelMultipleChoiceFilter):
+    """
+    ModelMultipleChoiceFilter with its choices from a ReferenceData,
+    given as `reference`.
+    """
+    field_class = ReferenceMultipleChoiceField
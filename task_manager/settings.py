@@ -50,25 +50,28 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'bootstrap4',
-    'django_extensions',
     'django_filters',
     'task_manager',
     'task_manager.users',
     'task_manager.statuses',
     'task_manager.tasks',
-    'task_manager.labels'
+    'task_manager.labels',
+    'task_manager.api',
 ]
 
+# Development tools (shell_plus...), not loaded by the production boot.
+if DEBUG:
+    INSTALLED_APPS.append('django_extensions')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    'task_manager.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'rollbar.contrib.django.middleware.RollbarNotifierMiddleware',
 ]
 
 ROOT_URLCONF = 'task_manager.urls'
@@ -89,8 +92,31 @@ TEMPLATES = [
     },
 ]
 
+# Render the most visited pages (task list, user list) with Jinja2.
+# Its templates in task_manager/jinja2 shadow the Django ones of the same
+# name, the other pages keep theirs. Needs the jinja2 extra.
+JINJA2_TEMPLATES = os.getenv('JINJA2_TEMPLATES', 'False') == 'True'
+
+JINJA2_BACKEND = {
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [],
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'environment': 'task_manager.jinja.environment',
+        'context_processors': TEMPLATES[0]['OPTIONS']['context_processors'],
+    },
+}
+
+if JINJA2_TEMPLATES:
+    TEMPLATES = [JINJA2_BACKEND, *TEMPLATES]
+
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+# Serve the task list, task pages and the API with async views, each
+# request in a thread of a pool (one database connection per thread).
+# On by default under ASGI (task_manager.asgi), slower under WSGI.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
@@ -172,6 +198,84 @@ ROLLBAR = {
     'root': BASE_DIR,
 }
 
+# Report errors to Rollbar only when it is configured.
+if ROLLBAR['access_token']:
+    MIDDLEWARE.append(
+        'rollbar.contrib.django.middleware.RollbarNotifierMiddleware'
+    )
+
+# Time every request: Server-Timing header and a log line per request,
+# see task_manager.timing.
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+# Send the Server-Timing header to everyone, not only to staff users:
+# it tells how long the database and every step took.
+SERVER_TIMING_PUBLIC = os.getenv('SERVER_TIMING_PUBLIC', str(DEBUG)) == 'True'
+
+# Request metrics at /metrics/ in the Prometheus text format, see
+# task_manager.metrics. METRICS_DIR shares them between the processes
+# (gunicorn.conf.py sets one). Only staff users may read them, and
+# scrapers sending `Authorization: Bearer <METRICS_TOKEN>`.
+METRICS = os.getenv('METRICS', 'True') == 'True'
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+if METRICS:
+    MIDDLEWARE.insert(0, 'task_manager.middleware.MetricsMiddleware')
+
+if SERVER_TIMING:
+    MIDDLEWARE = [
+        'task_manager.middleware.ServerTimingMiddleware',
+        *MIDDLEWARE,
+        'task_manager.middleware.ViewTimingMiddleware',
+    ]
+
+# Report the N+1 queries of every request, and log the slow queries,
+# see task_manager.query_inspector. For development and tests.
+QUERY_INSPECTOR = os.getenv('QUERY_INSPECTOR', str(DEBUG)) == 'True'
+# Queries of the same shape from the same place, in a request.
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 3))
+# Raise NPlusOneError instead of logging (the tests turn it on).
+N_PLUS_ONE_RAISE = os.getenv('N_PLUS_ONE_RAISE', 'False') == 'True'
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 100))
+
+if QUERY_INSPECTOR:
+    MIDDLEWARE.append('task_manager.middleware.QueryInspectorMiddleware')
+
+# INFO logs a timing line per request (task_manager.middleware)
+# and the row cache hit ratio at DEBUG.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'task_manager': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
+
+# Read the task list from the denormalized TaskListRow table.
+# Run `manage.py rebuild_task_list` once before switching it on.
+TASK_LIST_READ_MODEL = os.getenv('TASK_LIST_READ_MODEL', 'False') == 'True'
+
+# Seconds to keep the task filter facet counts per filter selection.
+TASK_FACETS_TIMEOUT = int(os.getenv('TASK_FACETS_TIMEOUT', 30))
+
+# Seconds to keep a rendered row of the task list, 0 to render every row.
+# Rows are keyed by version: changes never show stale rows.
+TASK_ROW_CACHE_TIMEOUT = int(os.getenv('TASK_ROW_CACHE_TIMEOUT', 86400))
+
+# Searches matching more tasks than this are sorted newest first:
+# ranking every match costs more than the page itself.
+SEARCH_RANK_LIMIT = int(os.getenv('SEARCH_RANK_LIMIT', 1000))
+
+# Days a task stays in a terminal status before `manage.py archive_tasks`
+# moves it to the archive.
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 90))
+
 CSRF_TRUSTED_ORIGINS = [
     'https://*.railway.app',
     'https://127.0.0.1',
@@ -0,0 +1,60 @@
+from django.core.signals import request_started, request_finished
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskLabelRelation
+from task_manager.users.models import User
+from . import versions
+
+
+# Bump the version of the group of every saved or deleted object.
+# Set-based updates (QuerySet.update, bulk_create) send no signals
+# and call versions.changed() themselves.
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=TaskLabelRelation)
+@receiver(post_delete, sender=TaskLabelRelation)
+def task_changed(sender, **kwargs):
+    versions.changed(versions.TASKS)
+
+
+@receiver(m2m_changed, sender=TaskLabelRelation)
+def task_labels_added(sender, action, **kwargs):
+    if action == 'post_add':
+        versions.changed(versions.TASKS)
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def status_changed(sender, **kwargs):
+    versions.changed(versions.STATUSES)
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def label_changed(sender, **kwargs):
+    versions.changed(versions.LABELS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    # Logging in saves last_login only, which no page shows.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    versions.changed(versions.USERS)
+
+
+# Read the versions once per request, see versions.current().
+
+@receiver(request_started)
+def start_request(sender, **kwargs):
+    versions.start_request()
+
+
+@receiver(request_finished)
+def finish_request(sender, **kwargs):
+    versions.finish_request()
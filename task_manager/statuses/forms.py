@@ -9,7 +9,11 @@ class StatusForm(forms.ModelForm):
     name = forms.CharField(
         max_length=150, required=True, label=_("Name")
     )
+    is_terminal = forms.BooleanField(
+        required=False, label=_("Terminal"),
+        help_text=_("Tasks in this status are finished and get archived."),
+    )
 
     class Meta:
         model = Status
-        fields = ('name',)
+        fields = ('name', 'is_terminal')
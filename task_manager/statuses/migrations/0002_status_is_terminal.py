@@ -0,0 +1,18 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='is_terminal',
+            field=models.BooleanField(default=False, help_text='Tasks in this status are finished and get archived.', verbose_name='Terminal'),
+        ),
+    ]
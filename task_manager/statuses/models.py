@@ -13,6 +13,13 @@ class Status(models.Model):
         auto_now_add=True,
         verbose_name=_('Creation date')
     )
+    # Tasks in a terminal status are finished: archived after
+    # ARCHIVE_AFTER_DAYS, see tasks.archive.
+    is_terminal = models.BooleanField(
+        default=False,
+        verbose_name=_('Terminal'),
+        help_text=_('Tasks in this status are finished and get archived.'),
+    )
 
     def __str__(self):
         return self.name
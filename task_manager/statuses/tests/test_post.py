@@ -96,6 +96,14 @@ class TestUpdateStatus(StatusTestCase):
             status_data['name']
         )
 
+    def test_update_status_terminal(self) -> None:
+        self.client.post(
+            reverse_lazy('status_update', kwargs={'pk': 2}),
+            data={**self.test_status['update'], 'is_terminal': 'on'}
+        )
+
+        self.assertTrue(Status.objects.get(id=self.status2.id).is_terminal)
+
     def test_update_status_not_logged_in(self) -> None:
         self.client.logout()
 
@@ -1,5 +1,9 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 
+from task_manager import versions
+from task_manager.statuses.models import Status
 from .testcase import StatusTestCase
 
 
@@ -41,6 +45,40 @@ class TestListStatuses(StatusTestCase):
         self.assertRedirects(response, reverse_lazy('login'))
 
 
+class TestReferenceCacheStatuses(StatusTestCase):
+    def get_names(self):
+        response = self.client.get(reverse_lazy('statuses'))
+        return [status.name for status in response.context['statuses']]
+
+    def test_statuses_from_cache(self) -> None:
+        self.client.get(reverse_lazy('statuses'))
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse_lazy('statuses'))
+
+        self.assertFalse(any(
+            'statuses_status' in query['sql']
+            for query in context.captured_queries
+        ))
+
+    def test_saves_seen_at_once(self) -> None:
+        self.get_names()
+        self.client.post(reverse_lazy('status_create'), {'name': 'Review'})
+
+        self.assertIn('Review', self.get_names())
+
+    def test_changes_seen_after_version_bump(self) -> None:
+        self.get_names()
+        # Changed by another worker: no signal reaches this one.
+        Status.objects.filter(pk=1).update(name='Renamed')
+
+        self.assertNotIn('Renamed', self.get_names())
+
+        versions.bump(versions.STATUSES)
+
+        self.assertIn('Renamed', self.get_names())
+
+
 class TestCreateStatusView(StatusTestCase):
     def test_create_status_view(self) -> None:
         response = self.client.get(reverse_lazy('status_create'))
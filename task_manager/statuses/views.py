@@ -3,6 +3,7 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.utils.translation import gettext_lazy as _
 from django.contrib.messages.views import SuccessMessageMixin
 
+from task_manager import reference
 from task_manager.mixins import AuthRequiredMixin, DeleteProtectionMixin
 from .models import Status
 from .forms import StatusForm
@@ -10,7 +11,7 @@ from .forms import StatusForm
 
 class StatusesListView(AuthRequiredMixin, ListView):
     """
-    Show all statuses.
+    Show all statuses, from the reference cache.
 
     Authorization required.
     """
@@ -21,6 +22,9 @@ class StatusesListView(AuthRequiredMixin, ListView):
         'title': _('Statuses')
     }
 
+    def get_queryset(self):
+        return reference.statuses.all()
+
 
 class StatusCreateView(AuthRequiredMixin, SuccessMessageMixin, CreateView):
     """
@@ -0,0 +1,94 @@
+"""
+Archiving of finished tasks.
+
+Tasks in a terminal status (Status.is_terminal) that got it more than
+ARCHIVE_AFTER_DAYS days ago (Task.status_changed_at) are moved, with
+their labels, to ArchivedTask and ArchivedTaskLabel: Task, its indexes
+and the read model only keep the live tasks.
+
+Tasks are moved in small batches, each in a transaction of its own, so
+that no lock is held for long. A run stopped halfway loses nothing:
+every batch is either moved or left in place, and the next run goes on
+with what is left.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager import versions
+from . import read_model
+from .models import ArchivedTask, ArchivedTaskLabel, Task, \
+    TaskLabelRelation
+
+COPIED_FIELDS = (
+    'id', 'name', 'description', 'date_created', 'updated_at',
+    'author_id', 'status_id', 'executor_id',
+)
+
+
+def finished_tasks(before):
+    """
+    Tasks in a terminal status since before `before`. Other changes,
+    of the task or of what it shows, do not delay its archiving.
+    """
+    return Task.objects.filter(
+        status__is_terminal=True, status_changed_at__lt=before,
+    )
+
+
+def archive(days=None, batch_size=500, limit=None, progress=None):
+    """
+    Move the tasks finished for more than `days` days (by default
+    ARCHIVE_AFTER_DAYS) to the archive, at most `limit` of them, and
+    return how many were moved.
+    """
+    if days is None:
+        days = settings.ARCHIVE_AFTER_DAYS
+    before = timezone.now() - timedelta(days=days)
+    archived = last_id = 0
+    while limit is None or archived < limit:
+        size = batch_size if limit is None \
+            else min(batch_size, limit - archived)
+        task_ids = list(
+            finished_tasks(before)
+            .filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:size]
+        )
+        if not task_ids:
+            break
+        archived += archive_batch(task_ids, before)
+        last_id = task_ids[-1]
+        if progress:
+            progress(archived)
+    return archived
+
+
+def archive_batch(task_ids, before):
+    """
+    Move the tasks to the archive in one transaction. Tasks whose
+    status changed since they were selected are left alone.
+    """
+    with transaction.atomic(), versions.deferred(), read_model.deferred():
+        tasks = list(
+            finished_tasks(before)
+            .filter(pk__in=task_ids)
+            .select_for_update(of=('self',))
+            .values(*COPIED_FIELDS)
+        )
+        task_ids = [task['id'] for task in tasks]
+        now = timezone.now()
+        ArchivedTask.objects.bulk_create(
+            ArchivedTask(**task, archived_at=now) for task in tasks
+        )
+        labels = TaskLabelRelation.objects \
+            .filter(task__in=task_ids) \
+            .values_list('task_id', 'label_id')
+        ArchivedTaskLabel.objects.bulk_create(
+            ArchivedTaskLabel(task_id=task_id, label_id=label_id)
+            for task_id, label_id in labels
+        )
+        Task.objects.filter(pk__in=task_ids).delete()
+    return len(task_ids)
@@ -0,0 +1,82 @@
+"""
+Bulk actions on the task list.
+
+Every action changes all the selected tasks with a constant number of
+set-based queries, whatever the number of tasks.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager import versions
+from . import read_model
+from .models import Task, TaskLabelRelation, TaskListRow
+
+
+def set_status(task_ids, status):
+    now = timezone.now()
+    with transaction.atomic():
+        Task.objects \
+            .filter(pk__in=task_ids) \
+            .exclude(status=status) \
+            .update(status_changed_at=now)
+        count = Task.objects.filter(pk__in=task_ids).update(
+            status=status, updated_at=now,
+        )
+        TaskListRow.objects.filter(pk__in=task_ids).update(
+            status_id=status.pk, status=status.name, updated_at=now,
+        )
+        versions.changed(versions.TASKS)
+    return count
+
+
+def set_executor(task_ids, executor):
+    now = timezone.now()
+    with transaction.atomic():
+        count = Task.objects.filter(pk__in=task_ids).update(
+            executor=executor, updated_at=now,
+        )
+        TaskListRow.objects.filter(pk__in=task_ids).update(
+            executor_id=executor.pk, executor=executor.get_full_name(),
+            updated_at=now,
+        )
+        versions.changed(versions.TASKS)
+    return count
+
+
+def add_label(task_ids, label):
+    with transaction.atomic():
+        # Tasks that already have the label are skipped (task_label_unique).
+        TaskLabelRelation.objects.bulk_create(
+            (TaskLabelRelation(task_id=pk, label=label) for pk in task_ids),
+            ignore_conflicts=True,
+        )
+        read_model.touch(task_ids)
+        read_model.refresh_rows(task_ids)
+        versions.changed(versions.TASKS)
+    return len(task_ids)
+
+
+def remove_label(task_ids, label):
+    with transaction.atomic(), versions.deferred(), \
+            read_model.deferred():
+        TaskLabelRelation.objects.filter(
+            task__in=task_ids, label=label,
+        ).delete()
+    return len(task_ids)
+
+
+def delete(task_ids):
+    with transaction.atomic(), versions.deferred(), \
+            read_model.deferred():
+        Task.objects.filter(pk__in=task_ids).delete()
+    return len(task_ids)
+
+
+# Actions that set something on the tasks, and the form field
+# holding the value.
+ACTIONS = {
+    'status': (set_status, 'status'),
+    'executor': (set_executor, 'executor'),
+    'add_label': (add_label, 'label'),
+    'remove_label': (remove_label, 'label'),
+}
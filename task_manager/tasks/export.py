@@ -0,0 +1,127 @@
+"""
+Streaming export of tasks as CSV or NDJSON.
+
+Rows are read as plain tuples with the names already resolved by the
+database, a chunk at a time, and written out as they come: memory use
+does not depend on the number of exported tasks.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Aggregate, CharField, OuterRef, Subquery, \
+    TextField, Value
+from django.db.models.functions import Concat
+
+from .models import TaskLabelRelation, TaskListRow
+
+
+COLUMNS = (
+    'id', 'name', 'status', 'author', 'executor', 'labels', 'date_created',
+)
+
+# Rows per chunk of the response.
+BATCH_SIZE = 500
+
+
+class GroupConcat(Aggregate):
+    """
+    The values of a group joined with a delimiter:
+    GROUP_CONCAT on SQLite, STRING_AGG on PostgreSQL.
+    """
+    function = 'GROUP_CONCAT'
+
+    def __init__(self, expression, delimiter=', ', **extra):
+        super().__init__(
+            expression, Value(delimiter), output_field=TextField(), **extra
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function='STRING_AGG', **extra_context
+        )
+
+
+def full_name(user):
+    return Concat(
+        f'{user}__first_name', Value(' '), f'{user}__last_name',
+        output_field=CharField(),
+    )
+
+
+def project(queryset):
+    """
+    Tuples of COLUMNS for a Task or TaskListRow queryset.
+    """
+    if queryset.model is TaskListRow:
+        return queryset.values_list(*COLUMNS)
+
+    labels = TaskLabelRelation.objects \
+        .filter(task=OuterRef('pk')) \
+        .order_by() \
+        .values('task') \
+        .annotate(names=GroupConcat('label__name')) \
+        .values('names')
+    return queryset.values_list(
+        'id',
+        'name',
+        'status__name',
+        full_name('author'),
+        full_name('executor'),
+        Subquery(labels, output_field=TextField()),
+        'date_created',
+    )
+
+
+def prepare(row):
+    task_id, name, status, author, executor, labels, date_created = row
+    return (
+        task_id, name, status, author.strip(), executor.strip(),
+        labels or '', date_created.isoformat(),
+    )
+
+
+def batches(rows):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+class Echo:
+    """
+    A file-like object for csv.writer that hands the line back
+    instead of storing it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    # The header goes out before the query is run.
+    yield writer.writerow(COLUMNS)
+    for batch in batches(rows):
+        yield ''.join(writer.writerow(prepare(row)) for row in batch)
+
+
+def stream_ndjson(rows):
+    for batch in batches(rows):
+        yield ''.join(
+            json.dumps(
+                dict(zip(COLUMNS, prepare(row))),
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+            ) + '\n'
+            for row in batch
+        )
+
+
+FORMATS = {
+    'csv': ('text/csv', stream_csv),
+    'ndjson': ('application/x-ndjson', stream_ndjson),
+}
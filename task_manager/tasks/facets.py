@@ -0,0 +1,95 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Model
+
+
+# Facets and the column they are counted by. Only the filters whose
+# widget lists every option: the executor and label pickers are
+# autocompletes that render the selected options only, so their
+# counts would never be shown.
+FACETS = {'status': 'status_id'}
+
+# Filters that change the order or the look of the list, not its content.
+PRESENTATION_FILTERS = ('sort', 'show_labels')
+
+
+def count_facets(queryset, by_facet=None):
+    """
+    Count the tasks of the queryset per value of each facet, or
+    of by_facet[facet] for the facets it has.
+
+    One grouped query per facet. Works for Task and TaskListRow
+    querysets.
+    """
+    counts = {}
+    for facet, column in FACETS.items():
+        tasks = (by_facet or {}).get(facet, queryset)
+        counts[facet] = dict(
+            tasks.order_by().values_list(column).annotate(count=Count('pk'))
+        )
+    return counts
+
+
+def facet_querysets(filterset):
+    """
+    The tasks each selected facet is counted on: those matching every
+    filter but its own, so that the other values of the facet keep
+    their counts and can be added to the selection.
+    """
+    form = filterset.form
+    selected = form.cleaned_data if form.is_bound else {}
+    querysets = {}
+    for facet in FACETS:
+        if selected.get(facet):
+            data = filterset.data.copy()
+            data.pop(facet)
+            querysets[facet] = type(filterset)(
+                data, queryset=filterset.queryset, request=filterset.request,
+            ).qs
+    return querysets
+
+
+def normalize(value):
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, (list, tuple, set)) or hasattr(value, 'model'):
+        return sorted(normalize(item) for item in value)
+    return value
+
+
+def cache_key(filterset):
+    """
+    The same selection gives the same key whatever the parameter order,
+    sorting or page.
+    """
+    form = filterset.form
+    data = form.cleaned_data if form.is_bound else {}
+    selection = sorted(
+        (name, normalize(value))
+        for name, value in data.items()
+        if name not in PRESENTATION_FILTERS
+        if value not in (None, '', [], False)
+    )
+    if data.get('own_tasks'):
+        selection.append(('author', filterset.request.user.pk))
+    raw = f'{filterset._meta.model._meta.label}:{selection}'
+    return 'task_facets:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def get_facet_counts(filterset):
+    """
+    Facet counts of a valid filterset, cached for TASK_FACETS_TIMEOUT
+    seconds per normalized selection.
+    """
+    timeout = settings.TASK_FACETS_TIMEOUT
+    if not timeout:
+        return count_facets(filterset.qs, facet_querysets(filterset))
+
+    key = cache_key(filterset)
+    counts = cache.get(key)
+    if counts is None:
+        counts = count_facets(filterset.qs, facet_querysets(filterset))
+        cache.set(key, counts, timeout)
+    return counts
@@ -1,16 +1,83 @@
-from django_filters import FilterSet, ModelChoiceFilter, BooleanFilter
+from django_filters import FilterSet, BooleanFilter, ChoiceFilter, \
+    CharFilter
 from django import forms
+from django.conf import settings
+from django.urls import reverse_lazy
+from django.db.models import Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Concat, Trim
 from django.utils.translation import gettext_lazy as _
 
-from .models import Task
-from task_manager.labels.models import Label
+from .models import ArchivedTask, ArchivedTaskLabel, Task, TaskListRow, \
+    TaskLabelRelation
+from .read_model import label_ids_key
+from .search import matches_more, search, search_archive
+from task_manager import reference
+from task_manager.reference import ReferenceMultipleChoiceFilter
+from task_manager.widgets import AutocompleteSelectMultiple
 
 
 class TaskFilter(FilterSet):
 
-    labels = ModelChoiceFilter(
-        queryset=Label.objects.all(),
-        label=_('Label')
+    # The task-label pairs of the model.
+    label_relation = TaskLabelRelation
+
+    # Every ordering ends with a unique column so that it can be used
+    # for keyset pagination. Status and executor sort by name, as in
+    # the read model: the names are annotated from their tables.
+    orderings = {
+        'name': ('name', 'id'),
+        'status': ('status_name', 'date_created', 'id'),
+        'executor': ('executor_name', 'date_created', 'id'),
+        'date': ('date_created', 'id'),
+        '-date': ('-date_created', '-id'),
+    }
+
+    # Annotations the orderings sort by.
+    sort_names = {
+        'status_name': F('status__name'),
+        # As User.get_full_name().
+        'executor_name': Trim(Concat(
+            'executor__first_name', Value(' '), 'executor__last_name',
+        )),
+    }
+
+    status = ReferenceMultipleChoiceFilter(
+        reference=reference.statuses,
+        label=_('Status'),
+        method='get_by_any',
+    )
+
+    executor = ReferenceMultipleChoiceFilter(
+        reference=reference.users,
+        label=_('Executor'),
+        method='get_by_any',
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy('users_autocomplete')
+        ),
+    )
+
+    q = CharFilter(
+        label=_('Search'),
+        method='get_search',
+    )
+
+    labels = ReferenceMultipleChoiceFilter(
+        reference=reference.labels,
+        label=_('Label'),
+        method='get_by_labels',
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy('labels_autocomplete')
+        ),
+    )
+
+    labels_match = ChoiceFilter(
+        label=_('Labels match'),
+        choices=(
+            ('any', _('Any of the labels')),
+            ('all', _('All of the labels')),
+        ),
+        empty_label=None,
+        method='get_unchanged',
     )
 
     own_tasks = BooleanFilter(
@@ -19,12 +86,171 @@ class TaskFilter(FilterSet):
         method='get_own_tasks',
     )
 
+    show_labels = BooleanFilter(
+        label=_('Show labels'),
+        widget=forms.CheckboxInput,
+        method='get_with_labels',
+    )
+
+    sort = ChoiceFilter(
+        label=_('Sort by'),
+        choices=(
+            ('name', _('Name')),
+            ('status', _('Status')),
+            ('executor', _('Executor')),
+            ('date', _('Creation date')),
+            ('-date', _('Newest first')),
+        ),
+        method='get_sorted',
+    )
+
+    def show_facet_counts(self, counts):
+        """
+        Add the number of matching tasks to each option
+        of the faceted fields, see tasks.facets.
+        """
+        for name, facet in counts.items():
+            field = self.form.fields[name]
+            field.label_from_instance = self._with_count(
+                field.label_from_instance, facet
+            )
+
+    @staticmethod
+    def _with_count(label_from_instance, counts):
+        def label(obj):
+            return f'{label_from_instance(obj)} ({counts.get(obj.pk, 0)})'
+        return label
+
+    def get_by_any(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(**{f'{name}__in': [obj.pk for obj in value]})
+
+    def get_by_labels(self, queryset, name, value):
+        if not value:
+            return queryset
+        label_ids = {label.pk for label in value}
+        if self.form.cleaned_data.get('labels_match') == 'all':
+            return self.get_with_all_labels(queryset, label_ids)
+        return self.get_with_any_label(queryset, label_ids)
+
+    def get_with_any_label(self, queryset, label_ids):
+        """
+        EXISTS instead of a join: one row per task, no DISTINCT needed.
+        """
+        return queryset.filter(Exists(
+            self.label_relation.objects.filter(
+                task=OuterRef('pk'), label__in=label_ids
+            )
+        ))
+
+    def get_with_all_labels(self, queryset, label_ids):
+        """
+        One join per label, each through the (label, task) index.
+        A task has a label once (task_label_unique): no DISTINCT needed.
+        """
+        for pk in label_ids:
+            queryset = queryset.filter(labels=pk)
+        return queryset
+
+    def get_unchanged(self, queryset, name, value):
+        return queryset
+
+    def get_search(self, queryset, name, value):
+        """
+        Best matches first, unless another sorting is chosen. Past
+        SEARCH_RANK_LIMIT matches, newest first: ranking them all
+        would sort every match for one page.
+        """
+        if matches_more(value, settings.SEARCH_RANK_LIMIT):
+            return search(queryset, value, ranked=False) \
+                .order_by(*self.orderings['-date'])
+        return search(queryset, value).order_by('-rank', 'id')
+
     def get_own_tasks(self, queryset, name, value):
         if value:
             user = self.request.user
-            return queryset.filter(author=user)
+            return queryset.filter(author_id=user.pk)
         return queryset
 
+    def get_with_labels(self, queryset, name, value):
+        if value:
+            return queryset.prefetch_related('labels')
+        return queryset
+
+    def get_sorted(self, queryset, name, value):
+        ordering = self.orderings[value]
+        names = {
+            field: self.sort_names[field] for field in ordering
+            if field in self.sort_names
+        }
+        return queryset.annotate(**names).order_by(*ordering)
+
     class Meta:
         model = Task
         fields = ['status', 'executor']
+
+
+class ArchivedTaskFilter(TaskFilter):
+    """
+    TaskFilter over the archive, see tasks.archive.
+    """
+    label_relation = ArchivedTaskLabel
+
+    def get_search(self, queryset, name, value):
+        return search_archive(queryset, value).order_by('-rank', 'id')
+
+    class Meta:
+        model = ArchivedTask
+        fields = ['status', 'executor']
+
+
+class TaskListRowFilter(TaskFilter):
+    """
+    TaskFilter over the TaskListRow read model:
+    the same form, answered from the single flat table.
+    Status and executor columns hold display names,
+    so sorting by name needs no join here.
+    """
+
+    orderings = {
+        **TaskFilter.orderings,
+        'status': ('status', 'date_created', 'id'),
+        'executor': ('executor', 'date_created', 'id'),
+    }
+    sort_names = {}
+
+    status = ReferenceMultipleChoiceFilter(
+        reference=reference.statuses,
+        field_name='status_id',
+        label=_('Status'),
+        method='get_by_any',
+    )
+
+    executor = ReferenceMultipleChoiceFilter(
+        reference=reference.users,
+        field_name='executor_id',
+        label=_('Executor'),
+        method='get_by_any',
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy('users_autocomplete')
+        ),
+    )
+
+    def get_with_any_label(self, queryset, label_ids):
+        condition = Q()
+        for pk in label_ids:
+            condition |= Q(label_ids__contains=label_ids_key([pk]))
+        return queryset.filter(condition)
+
+    def get_with_all_labels(self, queryset, label_ids):
+        for pk in label_ids:
+            queryset = queryset.filter(label_ids__contains=label_ids_key([pk]))
+        return queryset
+
+    def get_with_labels(self, queryset, name, value):
+        return queryset
+
+    class Meta:
+        model = TaskListRow
+        fields = ['status', 'executor']
@@ -1,9 +1,36 @@
 from django import forms
+from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
 
+from task_manager import reference
+from task_manager.reference import ReferenceChoiceField, \
+    ReferenceMultipleChoiceField
+from task_manager.widgets import AutocompleteSelect, \
+    AutocompleteSelectMultiple
+from .bulk import ACTIONS
+from .importer import FORMATS, guess_format
 from .models import Task
 
 
 class TaskForm(forms.ModelForm):
+    status = ReferenceChoiceField(
+        reference.statuses,
+        label=_('Status'),
+    )
+    executor = ReferenceChoiceField(
+        reference.users,
+        label=_('Executor'),
+        widget=AutocompleteSelect(url=reverse_lazy('users_autocomplete')),
+    )
+    labels = ReferenceMultipleChoiceField(
+        reference.labels,
+        required=False,
+        label=_('Labels'),
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy('labels_autocomplete')
+        ),
+    )
+
     class Meta:
         model = Task
         fields = (
@@ -13,3 +40,75 @@ class TaskForm(forms.ModelForm):
             'executor',
             'labels'
         )
+
+    def _get_validation_exclusions(self):
+        # Already checked against the reference cache: the model would
+        # query the existence of both again.
+        exclude = super()._get_validation_exclusions()
+        exclude.update({'status', 'executor'})
+        return exclude
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField(
+        label=_('File'),
+        help_text=_('CSV, JSON or NDJSON with the columns name, '
+                    'description, status, executor (username) and labels.'),
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if guess_format(file.name) not in FORMATS:
+            raise forms.ValidationError(
+                _('Only .csv, .json and .ndjson files can be imported.')
+            )
+        return file
+
+
+class TaskBulkForm(forms.Form):
+    """
+    An action on the tasks selected in the list.
+    """
+    tasks = forms.ModelMultipleChoiceField(
+        # Validated with one query, which also brings the authors.
+        queryset=Task.objects.only('id', 'author_id'),
+        widget=forms.MultipleHiddenInput,
+        error_messages={'required': _('Select at least one task.')},
+    )
+    action = forms.ChoiceField(
+        label=_('Action'),
+        choices=(
+            ('status', _('Change status')),
+            ('executor', _('Change executor')),
+            ('add_label', _('Add label')),
+            ('remove_label', _('Remove label')),
+            ('delete', _('Delete')),
+        ),
+    )
+    status = ReferenceChoiceField(
+        reference.statuses,
+        required=False,
+        label=_('Status'),
+    )
+    executor = ReferenceChoiceField(
+        reference.users,
+        required=False,
+        label=_('Executor'),
+        widget=AutocompleteSelect(url=reverse_lazy('users_autocomplete')),
+    )
+    label = ReferenceChoiceField(
+        reference.labels,
+        required=False,
+        label=_('Label'),
+        widget=AutocompleteSelect(url=reverse_lazy('labels_autocomplete')),
+    )
+    next = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action in ACTIONS:
+            field = ACTIONS[action][1]
+            if not cleaned_data.get(field):
+                self.add_error(field, _('Choose the new value.'))
+        return cleaned_data
@@ -0,0 +1,298 @@
+"""
+Bulk import of tasks from CSV, JSON or NDJSON.
+
+Every batch of rows resolves its statuses, executors and labels with
+one query each, then inserts the valid tasks and their labels with
+bulk_create inside a transaction. Invalid rows are reported and
+skipped, they do not stop the import. A batch that fails on a
+constraint is saved again row by row.
+
+Columns: name, description, status (name), executor (username) and
+labels (names, comma-separated in CSV, a list or a string in JSON).
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+
+from task_manager import versions
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+from . import read_model
+from .models import Task, TaskLabelRelation
+
+
+FORMATS = ('csv', 'json', 'ndjson')
+
+COLUMNS = ('name', 'description', 'status', 'executor', 'labels')
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.created = 0
+        self.task_ids = []
+        self.errors = []
+
+    def add_error(self, row, message):
+        self.errors.append((row, message))
+
+
+def guess_format(filename):
+    extension = filename.rsplit('.', 1)[-1].lower()
+    return 'ndjson' if extension == 'jsonl' else extension
+
+
+# Readers yield a ValueError in place of a row they cannot parse:
+# the row is reported and the rest of the file is still imported.
+
+def read_csv(text):
+    rows = csv.DictReader(text)
+    while True:
+        try:
+            yield next(rows)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            yield ValueError(_('Invalid CSV row: %s') % error)
+
+
+def read_json(text):
+    rows = json.load(text)
+    if not isinstance(rows, list):
+        raise ValueError(_('A JSON file must contain a list of tasks.'))
+    yield from rows
+
+
+def read_ndjson(text):
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield ValueError(_('Invalid JSON: %s') % error)
+
+
+READERS = {
+    'csv': read_csv,
+    'json': read_json,
+    'ndjson': read_ndjson,
+}
+
+
+def read_rows(file, file_format):
+    """
+    Yield the rows of a binary file as dicts.
+    """
+    if file_format not in READERS:
+        raise ValueError(_('Unknown file format: %s') % file_format)
+    return READERS[file_format](io.TextIOWrapper(file, encoding='utf-8-sig'))
+
+
+def split_labels(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(name).strip() for name in value if str(name).strip()]
+
+
+def clean(row):
+    """
+    Normalized values of a row, or a ValueError with the reason.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(_('A task must be an object.'))
+    values = {
+        'name': str(row.get('name') or '').strip(),
+        'description': str(row.get('description') or '').strip(),
+        'status': str(row.get('status') or '').strip(),
+        'executor': str(row.get('executor') or '').strip(),
+        'labels': split_labels(row.get('labels')),
+    }
+    for field in ('name', 'status', 'executor'):
+        if not values[field]:
+            raise ValueError(_('Missing %s.') % field)
+    for field in ('name', 'description'):
+        max_length = Task._meta.get_field(field).max_length
+        if len(values[field]) > max_length:
+            raise ValueError(
+                _('%(field)s is longer than %(max)d characters.')
+                % {'field': field, 'max': max_length}
+            )
+    return values
+
+
+def import_tasks(rows, author, batch_size=1000, references=None):
+    """
+    Create tasks authored by `author` from an iterable of dicts.
+    `references` resolves the related objects, References by default.
+    """
+    references = references or References
+    result = ImportResult()
+    seen = set()
+    numbered = enumerate(until_unreadable(rows), start=1)
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            return result
+        import_batch(batch, author, seen, result, references)
+
+
+def until_unreadable(rows):
+    """
+    The rows, and a ValueError in place of the rest of the file if it
+    cannot be read past some row. A file unreadable from the start is
+    rejected as a whole.
+    """
+    rows = iter(rows)
+    first = True
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except ValueError as error:
+            if first:
+                raise
+            yield error
+            return
+        first = False
+        yield row
+
+
+class References:
+    """
+    The statuses, executors, labels and existing task names
+    a batch refers to, fetched with one query each.
+
+    Rows name their status, executor and labels by the fields in
+    `keys`. Lookups are by string, so that ids work as keys too.
+    """
+    keys = {'status': 'name', 'executor': 'username', 'labels': 'name'}
+
+    def __init__(self, rows):
+        self.existing = set(Task.objects.filter(
+            name__in={values['name'] for values in rows}
+        ).values_list('name', flat=True))
+        self.statuses = self.fetch(
+            Status, 'status', {values['status'] for values in rows}
+        )
+        self.executors = self.fetch(
+            User, 'executor', {values['executor'] for values in rows}
+        )
+        self.labels = self.fetch(
+            Label, 'labels',
+            {name for values in rows for name in values['labels']},
+        )
+
+    def fetch(self, model, column, keys):
+        field = self.keys[column]
+        if field == 'pk':
+            keys = {key for key in keys if key.isdigit()}
+        pairs = model.objects \
+            .filter(**{f'{field}__in': keys}) \
+            .values_list(field, 'id')
+        return {str(key): pk for key, pk in pairs}
+
+    def check(self, values, seen):
+        """
+        The reason the row cannot be imported, if any.
+        """
+        name = values['name']
+        unknown_labels = [
+            label for label in values['labels'] if label not in self.labels
+        ]
+        if name in self.existing or name in seen:
+            return _('A task named "%s" already exists.') % name
+        if values['status'] not in self.statuses:
+            return _('Unknown status "%s".') % values['status']
+        if values['executor'] not in self.executors:
+            return _('Unknown executor "%s".') % values['executor']
+        if unknown_labels:
+            return _('Unknown label "%s".') % unknown_labels[0]
+        return None
+
+
+def clean_batch(batch, result):
+    cleaned = []
+    for number, row in batch:
+        if isinstance(row, ValueError):  # Unreadable, see read_csv.
+            result.add_error(number, str(row))
+            continue
+        try:
+            cleaned.append((number, clean(row)))
+        except (ValueError, TypeError) as error:
+            result.add_error(number, str(error))
+    return cleaned
+
+
+def import_batch(batch, author, seen, result, references=References):
+    cleaned = clean_batch(batch, result)
+    references = references([values for _number, values in cleaned])
+
+    tasks, task_labels, numbers = [], [], []
+    for number, values in cleaned:
+        error = references.check(values, seen)
+        if error:
+            result.add_error(number, error)
+            continue
+        seen.add(values['name'])
+        numbers.append(number)
+        tasks.append(Task(
+            name=values['name'],
+            description=values['description'],
+            status_id=references.statuses[values['status']],
+            executor_id=references.executors[values['executor']],
+            author=author,
+        ))
+        task_labels.append(
+            {references.labels[label] for label in values['labels']}
+        )
+
+    if tasks:
+        save_batch(tasks, task_labels, numbers, result)
+
+
+def save_batch(tasks, task_labels, numbers, result):
+    try:
+        insert(tasks, task_labels)
+    except IntegrityError:
+        # A row conflicts with a task saved since the batch was checked
+        # (the same name from another import): save the rows one by
+        # one, so that only the conflicting ones are reported.
+        save_rows(tasks, task_labels, numbers, result)
+        return
+    result.created += len(tasks)
+    result.task_ids.extend(task.pk for task in tasks)
+
+
+def save_rows(tasks, task_labels, numbers, result):
+    for task, label_ids, number in zip(tasks, task_labels, numbers):
+        task.pk = None  # Set by the rolled back bulk_create.
+        try:
+            insert([task], [label_ids])
+        except IntegrityError as error:
+            result.add_error(number, str(error))
+            continue
+        result.created += 1
+        result.task_ids.append(task.pk)
+
+
+def insert(tasks, task_labels):
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        TaskLabelRelation.objects.bulk_create(
+            TaskLabelRelation(task_id=task.pk, label_id=label_id)
+            for task, label_ids in zip(tasks, task_labels)
+            for label_id in label_ids
+        )
+        # bulk_create sends no post_save: update the read model
+        # and the version here.
+        read_model.refresh_rows(task.pk for task in tasks)
+        versions.changed(versions.TASKS)
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Move the tasks in a terminal status for more than --days days '
+        'to the archive, in small transactions. Safe to stop and rerun.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+            help='Days without change in a terminal status.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of tasks moved per transaction.',
+        )
+        parser.add_argument(
+            '--limit', type=int,
+            help='Number of tasks to move at most.',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        start = time.perf_counter()
+        count = archive.archive(
+            days=options['days'], batch_size=options['batch_size'],
+            limit=options['limit'], progress=self.progress,
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {count} tasks in {elapsed:.1f}s.'
+        ))
+
+    def progress(self, count):
+        if self.verbosity > 1:
+            self.stdout.write(f'{count} tasks')
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks import importer
+from task_manager.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from a CSV, JSON or NDJSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument(
+            '--author',
+            required=True,
+            help='Username of the author of the imported tasks.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=importer.FORMATS,
+            help='File format, guessed from the extension by default.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows validated and inserted per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options['author'])
+        except User.DoesNotExist:
+            raise CommandError(f'Unknown user "{options["author"]}".')
+
+        path = options['path']
+        file_format = options['format'] or importer.guess_format(path)
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as file:
+                result = importer.import_tasks(
+                    importer.read_rows(file, file_format),
+                    author,
+                    batch_size=options['batch_size'],
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        elapsed = time.perf_counter() - start
+
+        for row, message in result.errors:
+            self.stderr.write(f'Row {row}: {message}')
+        rows = result.created + len(result.errors)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} tasks, {len(result.errors)} errors '
+            f'in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s).'
+        ))
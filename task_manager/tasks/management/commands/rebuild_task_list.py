@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import read_model
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the task list read model from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of tasks read and written per batch.',
+        )
+
+    def handle(self, *args, **options):
+        count = read_model.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Task list rebuilt: {count} rows.')
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of tasks.'
+
+    def handle(self, *args, **options):
+        search.reindex()
+        self.stdout.write(self.style.SUCCESS('Task search index rebuilt.'))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from task_manager.tasks import seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate users, statuses, labels and tasks at production scale, '
+        'the same for the same seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks', type=int, default=100000,
+            help='Number of tasks to create.',
+        )
+        parser.add_argument(
+            '--users', type=int, default=1000,
+            help='Number of users (authors and executors).',
+        )
+        parser.add_argument(
+            '--statuses', type=int, default=8,
+            help='Number of statuses.',
+        )
+        parser.add_argument(
+            '--labels', type=int, default=50,
+            help='Number of labels.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=1,
+            help='Seed of the random generator.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Number of tasks written per batch.',
+        )
+        parser.add_argument(
+            '--password',
+            help='Password of the users; they cannot log in without one.',
+        )
+
+    def handle(self, *args, **options):
+        if options['tasks'] and not (options['users'] and options['statuses']):
+            raise CommandError('Tasks need at least one user and status.')
+        self.verbosity = options['verbosity']
+        try:
+            result = seed.seed(
+                options['tasks'], options['users'], options['statuses'],
+                options['labels'], seed=options['seed'],
+                batch_size=options['batch_size'],
+                password=options['password'], progress=self.progress,
+            )
+        except IntegrityError as error:
+            raise CommandError(error)
+        seconds = result.pop('seconds')
+        counts = ', '.join(
+            f'{count} {name}' for name, count in result.items()
+        )
+        rows = result['tasks'] + result['task labels']
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {counts} in {seconds:.1f}s '
+            f'({rows / seconds:.0f} rows/s).'
+        ))
+
+    def progress(self, tasks):
+        if self.verbosity > 1:
+            self.stdout.write(f'{tasks} tasks')
@@ -0,0 +1,45 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskListRow',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=150)),
+                ('status_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=150)),
+                ('author_id', models.BigIntegerField()),
+                ('author', models.CharField(max_length=301)),
+                ('executor_id', models.BigIntegerField()),
+                ('executor', models.CharField(max_length=301)),
+                ('label_ids', models.TextField(blank=True)),
+                ('labels', models.TextField(blank=True)),
+                ('date_created', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tasklistrow',
+            index=models.Index(fields=['date_created', 'id'], name='tasklistrow_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklistrow',
+            index=models.Index(fields=['name', 'id'], name='tasklistrow_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklistrow',
+            index=models.Index(fields=['status', 'date_created', 'id'], name='tasklistrow_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklistrow',
+            index=models.Index(fields=['executor', 'date_created', 'id'], name='tasklistrow_executor_date_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:22
+
+from django.db import migrations, models
+import task_manager.tasks.search
+
+
+# The SQL as shipped with this migration, not the live search module:
+# replaying it must build what it built then.
+
+POSTGRESQL_INSTALL = (
+    "CREATE INDEX {concurrently}IF NOT EXISTS tasks_task_document_idx "
+    "ON tasks_task USING GIN (("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+    "))",
+)
+
+POSTGRESQL_UNINSTALL = (
+    "DROP INDEX {concurrently}IF EXISTS tasks_task_document_idx",
+)
+
+SQLITE_INSTALL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5("
+    "name, description, content='tasks_task', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert "
+    "AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete "
+    "AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update "
+    "AFTER UPDATE OF name, description ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    # Matches in the name weigh ten times more than in the description.
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+)
+
+SQLITE_UNINSTALL = (
+    "DROP TRIGGER IF EXISTS tasks_task_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_update",
+    "DROP TABLE IF EXISTS tasks_task_fts",
+)
+
+
+def execute(schema_editor, statements):
+    concurrently = '' if schema_editor.connection.in_atomic_block \
+        else 'CONCURRENTLY '
+    for statement in statements:
+        schema_editor.execute(statement.format(concurrently=concurrently))
+
+
+def install_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRESQL_INSTALL)
+    elif vendor == 'sqlite':
+        execute(schema_editor, SQLITE_INSTALL)
+
+
+def uninstall_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        execute(schema_editor, POSTGRESQL_UNINSTALL)
+    elif vendor == 'sqlite':
+        execute(schema_editor, SQLITE_UNINSTALL)
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, outside of a
+    # transaction.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0004_tasklistrow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearchEntry',
+            fields=[
+                ('rowid', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('document', task_manager.tasks.search.SearchDocumentField(db_column='tasks_task_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'tasks_task_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
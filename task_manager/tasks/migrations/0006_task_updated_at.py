@@ -0,0 +1,52 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:59
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+# The triggers of 0005_task_search, as shipped with it.
+SQLITE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert "
+    "AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete "
+    "AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update "
+    "AFTER UPDATE OF name, description ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+
+
+def fill_updated_at(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(updated_at=F('date_created'))
+
+
+def install_search(apps, schema_editor):
+    # SQLite remakes tasks_task to add the column, dropping the triggers.
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modification date'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(install_search, migrations.RunPython.noop),
+    ]
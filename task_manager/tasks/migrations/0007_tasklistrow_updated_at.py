@@ -0,0 +1,30 @@
+# Generated by Django 4.1.5 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.utils.timezone
+
+
+def copy_updated_at(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskListRow = apps.get_model('tasks', 'TaskListRow')
+    TaskListRow.objects.update(updated_at=Subquery(
+        Task.objects.filter(pk=OuterRef('pk')).values('updated_at')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasklistrow',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+    ]
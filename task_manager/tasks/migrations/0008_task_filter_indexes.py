@@ -0,0 +1,52 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:15
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+from task_manager.operations import AddIndexConcurrently, \
+    AddUniqueConstraintConcurrently
+
+
+def remove_duplicate_labels(apps, schema_editor):
+    TaskLabelRelation = apps.get_model('tasks', 'TaskLabelRelation')
+    duplicates = TaskLabelRelation.objects \
+        .values('task', 'label') \
+        .annotate(first=Min('pk'), count=Count('pk')) \
+        .filter(count__gt=1)
+    for duplicate in duplicates:
+        TaskLabelRelation.objects \
+            .filter(task=duplicate['task'], label=duplicate['label']) \
+            .exclude(pk=duplicate['first']) \
+            .delete()
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently on PostgreSQL, outside of a
+    # transaction.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0007_tasklistrow_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_labels, migrations.RunPython.noop, atomic=True,
+        ),
+        AddUniqueConstraintConcurrently(
+            model_name='tasklabelrelation',
+            constraint=models.UniqueConstraint(fields=('task', 'label'), name='task_label_unique'),
+        ),
+        AddIndexConcurrently(
+            model_name='tasklabelrelation',
+            index=models.Index(fields=['label', 'task'], name='task_label_label_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['status', 'executor', 'date_created', 'id'], name='task_status_executor_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['author', 'date_created', 'id'], name='task_author_date_idx'),
+        ),
+    ]
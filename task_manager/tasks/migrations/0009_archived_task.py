@@ -0,0 +1,61 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('labels', '0002_lower_name_indexes'),
+        ('statuses', '0002_status_is_terminal'),
+        ('tasks', '0008_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=150, verbose_name='Name')),
+                ('description', models.TextField(blank=True, verbose_name='Description')),
+                ('date_created', models.DateTimeField(verbose_name='Creation date')),
+                ('updated_at', models.DateTimeField(verbose_name='Modification date')),
+                ('archived_at', models.DateTimeField(verbose_name='Archiving date')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Author')),
+                ('executor', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Executor')),
+            ],
+            options={
+                'verbose_name': 'Archived task',
+                'verbose_name_plural': 'Archived tasks',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskLabel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='labels.label')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tasks.archivedtask')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='labels',
+            field=models.ManyToManyField(blank=True, related_name='+', through='tasks.ArchivedTaskLabel', to='labels.label', verbose_name='Labels'),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='status',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='statuses.status', verbose_name='Status'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedtasklabel',
+            constraint=models.UniqueConstraint(fields=('task', 'label'), name='archived_task_label_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['date_created', 'id'], name='archivedtask_date_created_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:33
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+from task_manager.operations import AddIndexConcurrently
+
+
+# The triggers of 0005_task_search, as shipped with it.
+SQLITE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert "
+    "AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete "
+    "AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update "
+    "AFTER UPDATE OF name, description ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO tasks_task_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+
+
+def fill_status_changed_at(apps, schema_editor):
+    # The closest to the status change known for the existing tasks.
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(status_changed_at=F('updated_at'))
+
+
+def install_search(apps, schema_editor):
+    # SQLite remakes tasks_task to add the column, dropping the triggers.
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, outside of a
+    # transaction.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0009_archived_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Status change date'),
+        ),
+        migrations.RunPython(
+            fill_status_changed_at, migrations.RunPython.noop, atomic=True,
+        ),
+        migrations.RunPython(
+            install_search, migrations.RunPython.noop, atomic=True,
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['status', 'status_changed_at'], name='task_status_changed_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+from task_manager.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently on PostgreSQL, outside of a
+    # transaction.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0010_task_status_changed_at'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='tasklistrow',
+            index=models.Index(fields=['status_id', 'date_created', 'id'], name='tasklistrow_status_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='tasklistrow',
+            index=models.Index(fields=['executor_id', 'date_created', 'id'], name='tasklistrow_executor_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='tasklistrow',
+            index=models.Index(fields=['author_id', 'date_created', 'id'], name='tasklistrow_author_id_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.1.5 on 2026-10-18 19:52
+
+from django.db import migrations
+
+
+# The index on an expression replaces the generated column and its
+# index of the first 0005_task_search, and is built before they are
+# dropped. Concurrently: the migration is not atomic.
+POSTGRESQL_INSTALL = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_task_document_idx "
+    "ON tasks_task USING GIN (("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+    "))",
+    "DROP INDEX CONCURRENTLY IF EXISTS tasks_task_search_idx",
+    "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRESQL_INSTALL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, outside of a
+    # transaction.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0011_tasklistrow_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.users.models import User
 from task_manager.statuses.models import Status
 from task_manager.labels.models import Label
+from .search import SearchDocumentField
 
 
 class Task(models.Model):
@@ -22,6 +24,16 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name=_('Creation date')
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Modification date')
+    )
+    # When the task got its current status: archiving counts from it
+    # (see task_manager.tasks.archive).
+    status_changed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Status change date')
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.PROTECT,
@@ -55,8 +67,214 @@ class Task(models.Model):
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
+        # One index per TaskFilter ordering on the columns of Task
+        # (keyset pagination); status and executor sort by the names
+        # of their tables, these indexes serve their filters.
+        indexes = [
+            models.Index(
+                fields=['date_created', 'id'],
+                name='task_date_created_idx',
+            ),
+            models.Index(
+                fields=['name', 'id'],
+                name='task_name_idx',
+            ),
+            models.Index(
+                fields=['status', 'date_created', 'id'],
+                name='task_status_date_idx',
+            ),
+            models.Index(
+                fields=['executor', 'date_created', 'id'],
+                name='task_executor_date_idx',
+            ),
+            # Filters: status and executor, own tasks.
+            models.Index(
+                fields=['status', 'executor', 'date_created', 'id'],
+                name='task_status_executor_idx',
+            ),
+            models.Index(
+                fields=['author', 'date_created', 'id'],
+                name='task_author_date_idx',
+            ),
+            # Archiving: tasks in the terminal statuses.
+            models.Index(
+                fields=['status', 'status_changed_at'],
+                name='task_status_changed_idx',
+            ),
+        ]
 
 
 class TaskLabelRelation(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE)
     label = models.ForeignKey(Label, on_delete=models.PROTECT)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'label'],
+                name='task_label_unique',
+            ),
+        ]
+        # The label filter: tasks by label.
+        indexes = [
+            models.Index(
+                fields=['label', 'task'],
+                name='task_label_label_idx',
+            ),
+        ]
+
+
+class ArchivedTask(models.Model):
+    """
+    A finished task moved out of Task by task_manager.tasks.archive,
+    with the id it had. Only read by the archive list.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=150, verbose_name=_('Name'))
+    description = models.TextField(
+        blank=True,
+        verbose_name=_('Description')
+    )
+    date_created = models.DateTimeField(verbose_name=_('Creation date'))
+    updated_at = models.DateTimeField(verbose_name=_('Modification date'))
+    archived_at = models.DateTimeField(verbose_name=_('Archiving date'))
+    author = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('Author')
+    )
+    status = models.ForeignKey(
+        Status,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('Status')
+    )
+    executor = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('Executor')
+    )
+    labels = models.ManyToManyField(
+        Label,
+        through='ArchivedTaskLabel',
+        blank=True,
+        related_name='+',
+        verbose_name=_('Labels')
+    )
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = _('Archived task')
+        verbose_name_plural = _('Archived tasks')
+        indexes = [
+            models.Index(
+                fields=['date_created', 'id'],
+                name='archivedtask_date_created_idx',
+            ),
+        ]
+
+
+class ArchivedTaskLabel(models.Model):
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE)
+    label = models.ForeignKey(Label, on_delete=models.PROTECT)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'label'],
+                name='archived_task_label_unique',
+            ),
+        ]
+
+
+class TaskListRow(models.Model):
+    """
+    Flat, display-ready copy of a task for the task list.
+
+    Filled by task_manager.tasks.read_model on every change of the task,
+    its labels and the referenced status, users and labels, so that the
+    list can be read from this single table without joins.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=150)
+    status_id = models.BigIntegerField()
+    status = models.CharField(max_length=150)
+    author_id = models.BigIntegerField()
+    author = models.CharField(max_length=301)
+    executor_id = models.BigIntegerField()
+    executor = models.CharField(max_length=301)
+    label_ids = models.TextField(blank=True)
+    labels = models.TextField(blank=True)
+    date_created = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['date_created', 'id'],
+                name='tasklistrow_date_created_idx',
+            ),
+            models.Index(
+                fields=['name', 'id'],
+                name='tasklistrow_name_idx',
+            ),
+            models.Index(
+                fields=['status', 'date_created', 'id'],
+                name='tasklistrow_status_date_idx',
+            ),
+            models.Index(
+                fields=['executor', 'date_created', 'id'],
+                name='tasklistrow_executor_date_idx',
+            ),
+            # Filters by id (TaskListRowFilter) and the updates of
+            # read_model by status and user.
+            models.Index(
+                fields=['status_id', 'date_created', 'id'],
+                name='tasklistrow_status_id_idx',
+            ),
+            models.Index(
+                fields=['executor_id', 'date_created', 'id'],
+                name='tasklistrow_executor_id_idx',
+            ),
+            models.Index(
+                fields=['author_id', 'date_created', 'id'],
+                name='tasklistrow_author_id_idx',
+            ),
+        ]
+
+
+class TaskSearchEntry(models.Model):
+    """
+    A row of the SQLite FTS5 index of tasks, see tasks.search.
+
+    Not managed by migrations. It is joined to tasks (and task list rows)
+    by id, which lets the database rank matches in a single join.
+    """
+    rowid = models.BigIntegerField(primary_key=True)
+    document = SearchDocumentField(db_column='tasks_task_fts')
+    rank = models.FloatField()
+    task = models.ForeignObject(
+        Task,
+        on_delete=models.DO_NOTHING,
+        from_fields=['rowid'],
+        to_fields=['id'],
+        related_name='search_entry',
+    )
+    row = models.ForeignObject(
+        TaskListRow,
+        on_delete=models.DO_NOTHING,
+        from_fields=['rowid'],
+        to_fields=['id'],
+        related_name='search_entry',
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_task_fts'
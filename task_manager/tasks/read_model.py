@@ -0,0 +1,133 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task, TaskLabelRelation, TaskListRow
+
+
+def label_ids_key(ids):
+    """
+    Labels are stored as ",1,5," so that a single label can be matched
+    with a LIKE '%,5,%' on the row itself.
+    """
+    return ''.join(f',{pk}' for pk in sorted(ids)) + ',' if ids else ''
+
+
+def build_row(task):
+    labels = sorted(task.labels.all(), key=lambda label: label.name)
+    return TaskListRow(
+        id=task.pk,
+        name=task.name,
+        status_id=task.status_id,
+        status=task.status.name,
+        author_id=task.author_id,
+        author=task.author.get_full_name(),
+        executor_id=task.executor_id,
+        executor=task.executor.get_full_name(),
+        label_ids=label_ids_key(label.pk for label in labels),
+        labels=', '.join(label.name for label in labels),
+        date_created=task.date_created,
+        updated_at=task.updated_at,
+    )
+
+
+def source_tasks():
+    return Task.objects \
+        .select_related('status', 'author', 'executor') \
+        .prefetch_related('labels')
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred():
+    """
+    Collect the rows refreshed and the tasks touched inside the block
+    (one by one, by the signals of a bulk delete for instance) and
+    process them all at once when it ends.
+    """
+    if getattr(_deferred, 'task_ids', None) is not None:
+        yield
+        return
+    _deferred.task_ids = set()
+    _deferred.touched = set()
+    try:
+        yield
+        task_ids, touched = _deferred.task_ids, _deferred.touched
+    finally:
+        _deferred.task_ids = _deferred.touched = None
+    touch(touched)
+    refresh_rows(task_ids)
+
+
+def touch(task_ids):
+    """
+    Move updated_at of the tasks forward: a change of their labels
+    does not save the task itself.
+    """
+    task_ids = list(task_ids)
+    pending = getattr(_deferred, 'touched', None)
+    if pending is not None:
+        pending.update(task_ids)
+        return
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+def refresh_rows(task_ids):
+    """
+    Rewrite the rows of the given tasks. Rows of deleted tasks are dropped.
+    """
+    task_ids = list(task_ids)
+    pending = getattr(_deferred, 'task_ids', None)
+    if pending is not None:
+        pending.update(task_ids)
+        return
+    if not task_ids:
+        return
+    rows = [build_row(task) for task in source_tasks().filter(pk__in=task_ids)]
+    with transaction.atomic():
+        TaskListRow.objects.filter(pk__in=task_ids).delete()
+        TaskListRow.objects.bulk_create(rows)
+
+
+def refresh_label_rows(label_id):
+    # The tasks themselves do not change: their rows are keyed by the
+    # version of the labels too (see row_cache.key_suffix).
+    refresh_rows(
+        TaskLabelRelation.objects
+        .filter(label_id=label_id)
+        .values_list('task_id', flat=True)
+    )
+
+
+def rename_status(status):
+    TaskListRow.objects.filter(status_id=status.pk).update(
+        status=status.name,
+    )
+
+
+def rename_user(user):
+    name = user.get_full_name()
+    TaskListRow.objects.filter(author_id=user.pk).update(author=name)
+    TaskListRow.objects.filter(executor_id=user.pk).update(executor=name)
+
+
+def rebuild(batch_size=2000):
+    """
+    Recreate the whole read model from the task tables.
+    """
+    with transaction.atomic():
+        TaskListRow.objects.all().delete()
+        batch = []
+        tasks = source_tasks().order_by('pk').iterator(chunk_size=batch_size)
+        for task in tasks:
+            batch.append(build_row(task))
+            if len(batch) == batch_size:
+                TaskListRow.objects.bulk_create(batch)
+                batch = []
+        TaskListRow.objects.bulk_create(batch)
+    return TaskListRow.objects.count()
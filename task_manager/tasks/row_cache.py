@@ -0,0 +1,114 @@
+"""
+Rendered rows of the task table, cached one by one.
+
+A row is keyed by the task id, its updated_at, the versions of the
+statuses, users and labels, the language and the shown columns.
+updated_at moves forward on a change of the task or of its labels
+(see read_model.touch); renaming a status, user or label bumps its
+version instead of touching every task that shows it. Old rows are
+never read again and expire.
+
+Hits and misses go to the request metrics (task_manager.metrics), added
+up over all the workers at /metrics/.
+
+The page itself is read with the ordering columns and updated_at only;
+full tasks are loaded for the rows missing from the cache.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils import timezone, translation
+from django.utils.safestring import mark_safe
+
+from task_manager import metrics, versions
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE = 'tasks/task_row.html'
+
+
+def enabled():
+    return settings.TASK_ROW_CACHE_TIMEOUT > 0
+
+
+def versions_only(queryset, ordering):
+    """
+    The queryset reduced to what the page and its cursors need:
+    the ordering columns, updated_at, and annotations (search rank).
+    """
+    fields = {'pk', 'updated_at'}
+    for field in ordering:
+        name = field.lstrip('-')
+        if name not in queryset.query.annotations:
+            fields.add(name)
+    return queryset \
+        .select_related(None) \
+        .prefetch_related(None) \
+        .only(*fields)
+
+
+REFERENCES = (versions.STATUSES, versions.USERS, versions.LABELS)
+
+
+def key_suffix(show_labels):
+    """
+    The part of the keys shared by all the rows of a page.
+    """
+    stamps = versions.current()
+    return ':'.join(str(part) for part in (
+        *(stamps.get(name, (0,))[0] for name in REFERENCES),
+        translation.get_language(),
+        timezone.get_current_timezone_name(),
+        int(bool(show_labels)),
+    ))
+
+
+def row_key(task, suffix):
+    return f'task_row:{task.pk}:{task.updated_at.timestamp()}:{suffix}'
+
+
+def render_rows(tasks, fetch, show_labels=False, read_model=False):
+    """
+    HTML of the rows of `tasks`, in their order: cached rows in one
+    get_many, the others rendered from fetch(ids) and stored in one
+    set_many.
+    """
+    if not enabled():
+        return _render(tasks, show_labels, read_model)
+
+    suffix = key_suffix(show_labels)
+    keys = {task.pk: row_key(task, suffix) for task in tasks}
+    rows = cache.get_many(keys.values())
+    missing = [pk for pk, key in keys.items() if key not in rows]
+    hits = len(keys) - len(missing)
+    if settings.METRICS:
+        metrics.observe_row_cache(hits=hits, misses=len(missing))
+    logger.debug('Task rows: %d cached, %d rendered', hits, len(missing))
+
+    if missing:
+        fetched = fetch(missing)
+        rendered = _render(fetched, show_labels, read_model)
+        new_rows = {
+            row_key(task, suffix): row
+            for task, row in zip(fetched, rendered)
+        }
+        cache.set_many(new_rows, settings.TASK_ROW_CACHE_TIMEOUT)
+        rows.update(zip(
+            (keys[task.pk] for task in fetched), rendered
+        ))
+    return [mark_safe(rows[key]) for key in keys.values() if key in rows]
+
+
+def _render(tasks, show_labels, read_model):
+    template = get_template(TEMPLATE)
+    # Jinja2 templates render to plain strings.
+    return [
+        mark_safe(template.render({
+            'task': task,
+            'show_labels': show_labels,
+            'read_model': read_model,
+        }))
+        for task in tasks
+    ]
@@ -0,0 +1,244 @@
+"""
+Full-text search over task name and description.
+
+PostgreSQL: a GIN index on a weighted tsvector of the task.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+Other backends fall back to icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Func, Lookup, \
+    Q, TextField, Value
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = 'tasks_task_fts'
+SEARCH_INDEX = 'tasks_task_document_idx'
+
+# The weighted document of a task on PostgreSQL. The GIN index is on
+# this expression, which the queries repeat: adding a stored column
+# instead would rewrite the whole table.
+POSTGRESQL_DOCUMENT = (
+    "(setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B'))"
+)
+
+POSTGRESQL_INSTALL = (
+    f"CREATE INDEX {{concurrently}}IF NOT EXISTS {SEARCH_INDEX} "
+    f"ON tasks_task USING GIN ({POSTGRESQL_DOCUMENT})",
+)
+
+POSTGRESQL_UNINSTALL = (
+    f"DROP INDEX {{concurrently}}IF EXISTS {SEARCH_INDEX}",
+)
+
+SQLITE_INSTALL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, description, content='tasks_task', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert "
+    "AFTER INSERT ON tasks_task BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete "
+    "AFTER DELETE ON tasks_task BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+    "AFTER UPDATE OF name, description ON tasks_task BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+
+SQLITE_UNINSTALL = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+SQLITE_REBUILD = (
+    # Matches in the name weigh ten times more than in the description.
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+class SearchDocumentField(TextField):
+    """
+    The hidden column of an FTS5 table named after the table itself.
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+def _execute(schema_editor, statements):
+    # CONCURRENTLY cannot run in a transaction: migrations install the
+    # index outside of one, so that writes go on while it is built.
+    concurrently = '' if schema_editor.connection.in_atomic_block \
+        else 'CONCURRENTLY '
+    for statement in statements:
+        schema_editor.execute(statement.format(concurrently=concurrently))
+
+
+def install(schema_editor):
+    """
+    Create the search index. Safe to run again: SQLite drops the
+    triggers whenever a migration remakes the tasks_task table.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRESQL_INSTALL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_INSTALL)
+        _execute(schema_editor, SQLITE_REBUILD)
+
+
+def uninstall(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRESQL_UNINSTALL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_UNINSTALL)
+
+
+def reindex():
+    """
+    Rebuild the search index from tasks_task.
+    """
+    with connection.schema_editor() as schema_editor:
+        install(schema_editor)
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(f'REINDEX INDEX {SEARCH_INDEX}')
+
+
+def terms(query):
+    """
+    Split user input into words, dropping any search syntax.
+    """
+    return re.findall(r'\w+', query.lower())
+
+
+def search(queryset, query, ranked=True):
+    """
+    Keep the tasks matching every word of the query (as a prefix) and
+    annotate them with `rank`, higher is better. Unranked, every match
+    gets the same rank, and only the index is read.
+
+    Works for any model whose primary key is the task id
+    (Task and TaskListRow).
+    """
+    words = terms(query)
+    if not words:
+        return queryset
+    if not ranked:
+        return unranked(queryset, words)
+
+    table = queryset.model._meta.db_table
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        # ts_rank() is a real: as a double, the rank of the keyset
+        # cursor compares equal to itself.
+        rank = RawSQL(
+            f"SELECT ts_rank({POSTGRESQL_DOCUMENT}, "
+            "to_tsquery('simple', %s))::double precision "
+            f"FROM tasks_task AS found WHERE found.id = {table}.id",
+            (ts_query(words),),
+            output_field=FloatField(),
+        )
+    elif vendor == 'sqlite':
+        # A join with the FTS table: a correlated rank subquery
+        # would run the full-text query once per matching row.
+        return queryset \
+            .filter(search_entry__document__match=fts_query(words)) \
+            .annotate(rank=-F('search_entry__rank'))
+    else:
+        rank = Value(0.0, output_field=FloatField())
+
+    return queryset.filter(id__in=matching_ids(words)).annotate(rank=rank)
+
+
+def unranked(queryset, words):
+    """
+    The matches of search(), every one with the same rank.
+    """
+    lookup = 'id__in'
+    if connection.vendor == 'sqlite':
+        # +id: no lookup of every match by id, SQLite walks the index
+        # of the ordering instead and stops at the page. PostgreSQL
+        # chooses between the two itself.
+        queryset = queryset.alias(unindexed_id=Func(
+            F('id'), template='+%(expressions)s',
+            output_field=queryset.model._meta.pk,
+        ))
+        lookup = 'unindexed_id__in'
+    return queryset \
+        .filter(**{lookup: matching_ids(words)}) \
+        .annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def matching_ids(words):
+    """
+    The ids of the tasks matching every word, from the index alone.
+    """
+    from .models import Task, TaskSearchEntry
+
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        return Task.objects.filter(RawSQL(
+            f"{POSTGRESQL_DOCUMENT} @@ to_tsquery('simple', %s)",
+            (ts_query(words),),
+            output_field=BooleanField(),
+        )).values('id')
+    if vendor == 'sqlite':
+        return TaskSearchEntry.objects \
+            .filter(document__match=fts_query(words)) \
+            .values('rowid')
+    return Task.objects.filter(contains_all(words)).values('id')
+
+
+def fts_query(words):
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def ts_query(words):
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def matches_more(query, limit):
+    """
+    Whether more than `limit` tasks match the query.
+    """
+    words = terms(query)
+    return bool(words) and matching_ids(words)[limit:limit + 1].exists()
+
+
+def search_archive(queryset, query):
+    """
+    search() for the archive, which has no full-text index: a scan of
+    the archived names and descriptions, every match ranked the same.
+    """
+    words = terms(query)
+    if not words:
+        return queryset
+    return queryset.filter(contains_all(words)) \
+        .annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def contains_all(words):
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(description__icontains=word)
+    return condition
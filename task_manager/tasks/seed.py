@@ -0,0 +1,367 @@
+"""
+Generated data at production scale: users, statuses, labels and tasks,
+the same for the same seed.
+
+The skew is that of a real tracker: executors and labels follow a Zipf
+law (a few get most of the tasks), most tasks have no label or one and
+a few have many, and descriptions go from empty to thousands of words
+(log-normal lengths).
+
+Tasks are written in batches, with COPY on PostgreSQL and executemany()
+elsewhere. When most of the tasks are new, the indexes and the search
+index are dropped while they are written and built once at the end.
+The read model is rebuilt when it is on.
+"""
+import csv
+import io
+import math
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from task_manager import versions
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+from . import read_model, search
+from .models import Task, TaskLabelRelation
+
+STATUSES = [
+    'new', 'in progress', 'in review', 'testing', 'done', 'blocked',
+    'on hold', 'cancelled',
+]
+TERMINAL_STATUSES = {'done', 'cancelled'}
+
+LABELS = [
+    'bug', 'feature', 'improvement', 'documentation', 'question',
+    'security', 'performance', 'ui', 'backend', 'frontend', 'database',
+    'urgent', 'tech debt', 'design', 'support', 'infrastructure',
+]
+
+FIRST_NAMES = [
+    'Anna', 'Boris', 'Daria', 'Elena', 'Fedor', 'Irina', 'Ivan', 'Maria',
+    'Nikita', 'Olga', 'Pavel', 'Sergey', 'Sofia', 'Timur', 'Vera', 'Yuri',
+]
+
+LAST_NAMES = [
+    'Ivanov', 'Smirnov', 'Kuznetsov', 'Popov', 'Sokolov', 'Lebedev',
+    'Kozlov', 'Novikov', 'Morozov', 'Petrov', 'Volkov', 'Solovyov',
+]
+
+# Labels per task: 0 to 8, 1 / (n + 1)^2 (mostly none or one).
+LABEL_COUNTS = range(9)
+LABEL_COUNT_WEIGHTS = [1 / (n + 1) ** 2 for n in LABEL_COUNTS]
+
+# Words in a description: log-normal, median 20. Some are empty.
+DESCRIPTION_MEDIAN = 20
+DESCRIPTION_SIGMA = 1.2
+DESCRIPTION_MAX_WORDS = 1500
+EMPTY_DESCRIPTIONS = 0.15
+
+
+def zipf_weights(count, exponent=1.0):
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def make_words(rnd, count):
+    syllables = [c + v for c in 'bdfgklmnprstvz' for v in 'aeiou']
+    return [
+        ''.join(rnd.choices(syllables, k=rnd.randint(1, 4)))
+        for _ in range(count)
+    ]
+
+
+class Seeder:
+    """
+    One run: call users(), statuses(), labels(), then tasks().
+    """
+
+    def __init__(self, seed=1, batch_size=10000, vocabulary=5000,
+                 password=None):
+        self.rnd = random.Random(seed)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.words = make_words(self.rnd, vocabulary)
+        # A stream of words, Zipf distributed, descriptions are cut from.
+        self.text = self.rnd.choices(
+            self.words, cum_weights=zipf_weights(vocabulary), k=1 << 20,
+        )
+        self.password = make_password(password)
+
+    # Users, statuses and labels already there (from an earlier run) are
+    # kept and used.
+
+    def users(self, count):
+        rnd = self.rnd
+        prefix = f'seed{self.seed}_'
+        User.objects.bulk_create(
+            (User(
+                username=f'{prefix}{i}',
+                first_name=rnd.choice(FIRST_NAMES),
+                last_name=rnd.choice(LAST_NAMES),
+                password=self.password,
+            ) for i in range(count)),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        return list(
+            User.objects.filter(username__startswith=prefix).order_by('pk')
+        )[:count]
+
+    def statuses(self, count):
+        return self.references(Status, STATUSES, count, lambda name: Status(
+            name=name, is_terminal=name in TERMINAL_STATUSES,
+        ))
+
+    def labels(self, count):
+        return self.references(Label, LABELS, count, Label)
+
+    def references(self, model, names, count, make):
+        names = [
+            names[i] if i < len(names)
+            else f'{names[i % len(names)]} {i // len(names)}'
+            for i in range(count)
+        ]
+        model.objects.bulk_create(
+            (make(name=name) for name in names), ignore_conflicts=True,
+        )
+        return list(model.objects.filter(name__in=names).order_by('pk'))
+
+    def description(self):
+        rnd = self.rnd
+        if rnd.random() < EMPTY_DESCRIPTIONS:
+            return ''
+        words = min(DESCRIPTION_MAX_WORDS, max(1, int(rnd.lognormvariate(
+            math.log(DESCRIPTION_MEDIAN), DESCRIPTION_SIGMA,
+        ))))
+        start = rnd.randrange(len(self.text) - words)
+        return ' '.join(self.text[start:start + words])
+
+    def tasks(self, count, users, statuses, labels, progress=None):
+        """
+        Create `count` tasks in batches, and return the number of
+        label relations created.
+        """
+        user_ids = [user.pk for user in users]
+        # Executors: Zipf over the users, in a random order.
+        executors = user_ids[:]
+        self.rnd.shuffle(executors)
+        skew = {
+            'executors': (executors, zipf_weights(len(executors))),
+            'labels': ([label.pk for label in labels],
+                       zipf_weights(len(labels))),
+        }
+        first_id = (Task.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        postgresql = connection.vendor == 'postgresql'
+        write = copy_batch if postgresql else insert_batch
+        relations = 0
+
+        bulk = ExitStack()
+        # Rebuilding the indexes pays when most of the rows are new.
+        if count > Task.objects.count():
+            bulk.enter_context(suspended_search_index())
+            bulk.enter_context(suspended_indexes(Task, TaskLabelRelation))
+        with bulk:
+            for start in range(0, count, self.batch_size):
+                size = min(self.batch_size, count - start)
+                rows, task_labels = self.batch(
+                    first_id + start, size, user_ids,
+                    [status.pk for status in statuses], skew,
+                )
+                with transaction.atomic():
+                    write(rows, task_labels)
+                relations += len(task_labels)
+                if progress:
+                    progress(start + size)
+        reset_sequences()
+        return relations
+
+    def batch(self, first_id, size, user_ids, status_ids, skew):
+        """
+        The rows of `size` tasks from id `first_id` on: tuples of
+        (id, name, description, author, executor, status), and their
+        (task id, label id) pairs.
+        """
+        rnd = self.rnd
+        executors, executor_weights = skew['executors']
+        label_ids, label_weights = skew['labels']
+        authors = rnd.choices(user_ids, k=size)
+        chosen = rnd.choices(executors, cum_weights=executor_weights, k=size)
+        statuses = rnd.choices(status_ids, k=size)
+        words = rnd.choices(self.words, k=2 * size)
+        label_counts = rnd.choices(
+            LABEL_COUNTS, LABEL_COUNT_WEIGHTS, k=size,
+        ) if label_ids else [0] * size
+        chosen_labels = iter(rnd.choices(
+            label_ids, cum_weights=label_weights, k=sum(label_counts),
+        ) if label_ids else ())
+
+        rows, task_labels = [], []
+        for i in range(size):
+            task_id = first_id + i
+            rows.append((
+                task_id,
+                f'{words[2 * i]} {words[2 * i + 1]} #{self.seed}-{task_id}',
+                self.description(),
+                authors[i], chosen[i], statuses[i],
+            ))
+            if label_counts[i]:
+                task_labels.extend(
+                    (task_id, label_id) for label_id in dict.fromkeys(
+                        islice(chosen_labels, label_counts[i]),
+                    )
+                )
+        return rows, task_labels
+
+
+TASK_COLUMNS = (
+    'id', 'name', 'description', 'author_id', 'executor_id', 'status_id',
+    'date_created', 'updated_at', 'status_changed_at',
+)
+TASK_LABEL_COLUMNS = ('task_id', 'label_id')
+
+
+def insert_batch(rows, task_labels):
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    insert(Task, TASK_COLUMNS, [row + (now, now, now) for row in rows])
+    insert(TaskLabelRelation, TASK_LABEL_COLUMNS, task_labels)
+
+
+def copy_batch(rows, task_labels):
+    now = timezone.now().isoformat()
+    copy(Task, TASK_COLUMNS, (row + (now, now, now) for row in rows))
+    copy(TaskLabelRelation, TASK_LABEL_COLUMNS, task_labels)
+
+
+def insert(model, columns, rows):
+    """
+    INSERT the rows with one executemany(): bulk_create() would prepare
+    every value of every row, and SQLite limits its statements to a
+    few hundred rows.
+    """
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(map(quote, columns)),
+        ', '.join(['%s'] * len(columns)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def copy(model, columns, rows):
+    """
+    COPY the rows into the table of the model (PostgreSQL).
+    Strings are quoted: an unquoted empty value is a NULL to COPY.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f'COPY {model._meta.db_table} ({", ".join(columns)}) '
+            'FROM STDIN WITH CSV',
+            buffer,
+        )
+
+
+# The non-unique indexes of a table, as (name, CREATE INDEX statement).
+INDEX_DEFINITIONS = {
+    'sqlite': (
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name = %s AND sql NOT LIKE 'CREATE UNIQUE%%'"
+    ),
+    'postgresql': (
+        'SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s '
+        "AND indexdef NOT LIKE 'CREATE UNIQUE%%'"
+    ),
+}
+
+
+@contextmanager
+def suspended_indexes(*models):
+    """
+    Drop the non-unique indexes of the tables during the block and
+    create them again after: building an index from all the rows at
+    once is faster than keeping it sorted as they come.
+    """
+    query = INDEX_DEFINITIONS.get(connection.vendor)
+    definitions = []
+    with connection.cursor() as cursor:
+        for model in models if query else ():
+            cursor.execute(query, [model._meta.db_table])
+            definitions += cursor.fetchall()
+        for name, _ in definitions:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, definition in definitions:
+                cursor.execute(definition)
+
+
+@contextmanager
+def suspended_search_index():
+    """
+    Drop the search index during the block and rebuild it after:
+    once for all the rows is faster than row by row.
+    """
+    with connection.schema_editor() as schema_editor:
+        search.uninstall(schema_editor)
+    try:
+        yield
+    finally:
+        search.reindex()
+
+
+def reset_sequences():
+    """
+    Move the id sequences past the ids set by hand (PostgreSQL).
+    """
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [Task, TaskLabelRelation],
+    )
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def seed(tasks, users, statuses, labels, seed=1, batch_size=10000,
+         password=None, progress=None):
+    """
+    Generate the data, and return the counts of what was created.
+    """
+    start = time.perf_counter()
+    if connection.vendor == 'sqlite':
+        # A 512 MB page cache (for this connection): the unique index of
+        # task names is written in random order.
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size = -524288')
+    seeder = Seeder(seed, batch_size, password=password)
+    with transaction.atomic():
+        created_users = seeder.users(users)
+        created_statuses = seeder.statuses(statuses)
+        created_labels = seeder.labels(labels)
+    relations = seeder.tasks(
+        tasks, created_users, created_statuses, created_labels, progress,
+    )
+    if settings.TASK_LIST_READ_MODEL:
+        read_model.rebuild()
+    versions.bump(*versions.ALL)
+    return {
+        'users': len(created_users),
+        'statuses': len(created_statuses),
+        'labels': len(created_labels),
+        'tasks': tasks,
+        'task labels': relations,
+        'seconds': time.perf_counter() - start,
+    }
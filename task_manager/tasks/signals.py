@@ -0,0 +1,109 @@
+from django.db.models.signals import post_save, post_delete, pre_save, \
+    m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+from . import read_model
+from .models import Task, TaskLabelRelation
+
+
+@receiver(pre_save, sender=Task)
+def task_status_changed(sender, instance, raw=False, **kwargs):
+    # New tasks get status_changed_at from its default.
+    if raw or instance._state.adding:
+        return
+    stored = Task.objects \
+        .filter(pk=instance.pk) \
+        .values_list('status_id', flat=True) \
+        .first()
+    if stored != instance.status_id:
+        instance.status_changed_at = timezone.now()
+
+
+# Keep the TaskListRow read model in sync with its sources.
+# Fixture loading (raw=True) is skipped: run `rebuild_task_list` after it.
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        read_model.refresh_rows([instance.pk])
+
+
+@receiver(post_save, sender=TaskLabelRelation)
+@receiver(post_delete, sender=TaskLabelRelation)
+def task_label_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        read_model.touch([instance.task_id])
+        read_model.refresh_rows([instance.task_id])
+
+
+@receiver(m2m_changed, sender=TaskLabelRelation)
+def task_labels_added(sender, instance, action, reverse, pk_set, **kwargs):
+    # Removal goes through post_delete of TaskLabelRelation,
+    # but add() uses bulk_create and sends no post_save.
+    if action != 'post_add':
+        return
+    task_ids = pk_set if reverse else [instance.pk]
+    read_model.touch(task_ids)
+    read_model.refresh_rows(task_ids)
+
+
+# The fields of the statuses, users and labels the rows show.
+SHOWN_FIELDS = {
+    Status: ('name',),
+    User: ('first_name', 'last_name'),
+    Label: ('name',),
+}
+
+
+def only_last_login(update_fields):
+    # Logging in saves last_login only, which no task shows.
+    return update_fields is not None and set(update_fields) == {'last_login'}
+
+
+@receiver(pre_save, sender=Status)
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Label)
+def remember_shown(sender, instance, raw=False, update_fields=None,
+                   **kwargs):
+    if raw or instance._state.adding or only_last_login(update_fields):
+        return
+    instance._shown = sender.objects \
+        .filter(pk=instance.pk) \
+        .values_list(*SHOWN_FIELDS[sender]) \
+        .first()
+
+
+def shown_changed(sender, instance, raw, created):
+    """
+    Whether a saved status, user or label shows differently in the rows.
+    """
+    if raw or created:
+        return False
+    shown = tuple(getattr(instance, field) for field in SHOWN_FIELDS[sender])
+    return getattr(instance, '_shown', None) != shown
+
+
+@receiver(post_save, sender=Status)
+def status_changed(sender, instance, raw=False, created=False, **kwargs):
+    if shown_changed(sender, instance, raw, created):
+        read_model.rename_status(instance)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, raw=False, created=False,
+                 update_fields=None, **kwargs):
+    if only_last_login(update_fields):
+        return
+    if shown_changed(sender, instance, raw, created):
+        read_model.rename_user(instance)
+
+
+@receiver(post_save, sender=Label)
+def label_changed(sender, instance, raw=False, created=False, **kwargs):
+    if shown_changed(sender, instance, raw, created):
+        read_model.refresh_label_rows(instance.pk)
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from task_manager.tasks.forms import TaskForm
 from .testcase import TaskTestCase
 
@@ -14,3 +17,57 @@ class TaskFormTest(TaskTestCase):
         form = TaskForm(data=task_data)
 
         self.assertFalse(form.is_valid())
+
+    def test_form_renders_selected_choices_only(self) -> None:
+        form = TaskForm(instance=self.task3)
+        executor = str(form['executor'])
+        labels = str(form['labels'])
+
+        self.assertIn(f'<option value="{self.user1.pk}" selected>', executor)
+        self.assertNotIn(f'<option value="{self.user2.pk}"', executor)
+        self.assertIn('data-autocomplete-url="/users/autocomplete/"', executor)
+        self.assertEqual(labels.count('<option'), self.task3.labels.count())
+        self.assertIn('data-autocomplete-url="/labels/autocomplete/"', labels)
+
+    def test_form_accepts_choices_not_rendered(self) -> None:
+        task_data = self.test_task['create']['valid'].copy()
+        task_data['executor'] = self.user2.pk
+        form = TaskForm(data=task_data)
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['executor'], self.user2)
+
+    def test_form_rejects_unknown_choices(self) -> None:
+        task_data = self.test_task['create']['valid'].copy()
+        task_data['executor'] = 999
+        task_data['labels'] = [999]
+        form = TaskForm(data=task_data)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('executor', form.errors)
+        self.assertIn('labels', form.errors)
+
+    def test_form_renders_invalid_choices(self) -> None:
+        task_data = self.test_task['create']['valid'].copy()
+        task_data['executor'] = 'abc'
+        form = TaskForm(data=task_data)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('data-autocomplete-url', form.as_p())
+
+    def test_form_choices_from_reference_cache(self) -> None:
+        task_data = self.test_task['create']['valid'].copy()
+        task_data['labels'] = [self.label2.pk]
+
+        with CaptureQueriesContext(connection) as context:
+            form = TaskForm(data=task_data)
+            self.assertTrue(form.is_valid())
+            str(form['status'])
+
+        # The version stamps and the unique name check only.
+        tables = ('task_manager_version', 'tasks_task')
+        self.assertTrue(all(
+            any(table in query['sql'] for table in tables)
+            for query in context.captured_queries
+        ))
+        self.assertEqual(form.cleaned_data['labels'], [self.label2])
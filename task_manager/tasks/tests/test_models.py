@@ -1,6 +1,17 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TransactionTestCase
+from django.urls import reverse_lazy
 from django.utils import timezone
 
-from task_manager.tasks.models import Task
+from task_manager.helpers import test_english
+from task_manager.statuses.models import Status
+from task_manager.tasks import archive
+from task_manager.tasks.models import ArchivedTask, Task, TaskLabelRelation, \
+    TaskListRow
+from task_manager.users.models import User
 from .testcase import TaskTestCase
 
 
@@ -26,3 +37,180 @@ class TaskModelTest(TaskTestCase):
         self.assertEqual(task.status, self.status1)
         self.assertEqual(task.executor, self.user2)
         self.assertEqual(task.labels.get(pk=2), self.label2)
+
+    def test_task_label_unique(self) -> None:
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TaskLabelRelation.objects.create(task=self.task3, label=self.label2)
+
+
+class TaskListRowTest(TaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        call_command('rebuild_task_list', stdout=StringIO())
+
+    def test_rebuild(self) -> None:
+        row = TaskListRow.objects.get(pk=self.task3.pk)
+
+        self.assertEqual(TaskListRow.objects.count(), self.count)
+        self.assertEqual(row.name, self.task3.name)
+        self.assertEqual(row.status, self.task3.status.name)
+        self.assertEqual(row.author, str(self.task3.author))
+        self.assertEqual(row.executor, str(self.task3.executor))
+        self.assertEqual(row.labels, 'Personal, Work')
+        self.assertEqual(row.label_ids, ',1,2,')
+
+    def test_task_changes(self) -> None:
+        task = Task.objects.create(
+            name='Write', author=self.user1,
+            executor=self.user2, status=self.status1,
+        )
+        task.labels.set(self.labels)
+
+        row = TaskListRow.objects.get(pk=task.pk)
+        self.assertEqual(row.executor, str(self.user2))
+        self.assertEqual(row.labels, self.label2.name)
+
+        task.labels.clear()
+        task.name = 'Rewrite'
+        task.save()
+
+        row = TaskListRow.objects.get(pk=task.pk)
+        self.assertEqual(row.name, 'Rewrite')
+        self.assertEqual(row.labels, '')
+
+        task.delete()
+        self.assertFalse(TaskListRow.objects.filter(pk=task.pk).exists())
+
+    def test_reference_changes(self) -> None:
+        self.status1.name = 'Renamed'
+        self.status1.save()
+        self.user1.first_name = 'Ringo'
+        self.user1.save()
+        self.label2.name = 'Job'
+        self.label2.save()
+
+        row = TaskListRow.objects.get(pk=self.task3.pk)
+        self.assertEqual(row.executor, str(self.user1))
+        self.assertEqual(row.labels, 'Job, Personal')
+        self.assertEqual(
+            TaskListRow.objects.get(pk=self.task1.pk).status,
+            'Renamed'
+        )
+
+    def test_reference_changes_keep_tasks(self) -> None:
+        updated = dict(Task.objects.values_list('pk', 'updated_at'))
+
+        self.status1.name = 'Renamed'
+        self.status1.save()
+        self.user1.first_name = 'Ringo'
+        self.user1.save()
+        self.label2.name = 'Job'
+        self.label2.save()
+
+        self.assertEqual(
+            dict(Task.objects.values_list('pk', 'updated_at')), updated,
+        )
+
+    def test_unchanged_names_skip_rows(self) -> None:
+        TaskListRow.objects.update(status='', author='', labels='')
+
+        self.status1.save()
+        self.user1.email = 'ringo@example.com'
+        self.user1.save()
+        self.label2.save()
+
+        self.assertFalse(TaskListRow.objects.exclude(
+            status='', author='', labels='',
+        ).exists())
+
+
+class ArchiveTest(TaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        Task.objects.update(status_changed_at=self.task1.date_created)
+        # Tasks 1 and 2.
+        Status.objects.filter(pk=1).update(is_terminal=True)
+        self.task1.refresh_from_db()
+        self.task2.refresh_from_db()
+
+    def test_archive(self) -> None:
+        self.assertEqual(archive.archive(), 2)
+
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)), [3])
+        self.assertFalse(TaskListRow.objects.filter(pk__in=[1, 2]).exists())
+        archived = ArchivedTask.objects.get(pk=2)
+        self.assertEqual(archived.name, 'Sleep')
+        self.assertEqual(archived.status_id, 1)
+        self.assertEqual(archived.updated_at, self.task2.updated_at)
+        self.assertEqual(list(archived.labels.values_list('pk', flat=True)),
+                         [1])
+
+    def test_archive_changed_status_stays(self) -> None:
+        self.task1.status = Status.objects.get(pk=2)
+        self.task1.save()
+        self.task1.status = self.status1
+        self.task1.save()
+
+        self.assertEqual(archive.archive(), 1)
+        self.assertTrue(Task.objects.filter(pk=1).exists())
+        self.assertEqual(archive.archive(days=0), 1)
+
+    def test_archive_other_changes(self) -> None:
+        self.task1.name = 'Eat more'
+        self.task1.save()
+        executor = User.objects.get(pk=3)
+        executor.first_name = 'Ringo'
+        executor.save()
+        self.status1.refresh_from_db()
+        self.status1.name = 'Done'
+        self.status1.save()
+
+        self.assertEqual(archive.archive(), 2)
+
+    def test_archive_command_resumes(self) -> None:
+        out = StringIO()
+        call_command('archive_tasks', batch_size=1, limit=1, stdout=out)
+
+        self.assertIn('Archived 1 tasks', out.getvalue())
+        self.assertEqual(ArchivedTask.objects.count(), 1)
+        self.assertEqual(archive.archive(batch_size=1), 1)
+        self.assertEqual(archive.archive(), 0)
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+
+
+@test_english
+class SeedTest(TransactionTestCase):
+    """
+    Seeding drops and rebuilds indexes, outside of a transaction.
+    """
+    def seed(self, **options) -> str:
+        out = StringIO()
+        call_command(
+            'seed', tasks=40, users=5, statuses=3, labels=4, batch_size=15,
+            stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_seed(self) -> None:
+        output = self.seed(seed=7)
+
+        self.assertIn('Created 5 users, 3 statuses, 4 labels, 40 tasks', output)
+        self.assertEqual(Task.objects.count(), 40)
+        task = Task.objects.latest('pk')
+        self.assertTrue(task.name.endswith(f'#7-{task.pk}'))
+        self.assertTrue(task.author.username.startswith('seed7_'))
+        self.client.force_login(task.author)
+        response = self.client.get(
+            reverse_lazy('tasks'), {'q': task.name.split()[0]}
+        )
+        self.assertIn(task, response.context['tasks'])
+
+    def test_same_seed_same_data(self) -> None:
+        self.seed(seed=3)
+        self.seed(seed=3)
+
+        tasks = list(Task.objects.order_by('pk').values_list(
+            'description', 'author', 'executor', 'status',
+        ))
+        self.assertEqual(tasks[:40], tasks[40:])
+        self.assertEqual(User.objects.count(), 5)
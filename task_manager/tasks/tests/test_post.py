@@ -1,8 +1,18 @@
+import csv
+import json
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ObjectDoesNotExist
 
-from task_manager.tasks.models import Task
+from task_manager.helpers import QueryBudget
+from task_manager.tasks import importer
+from task_manager.tasks.models import Task, TaskLabelRelation, TaskListRow
 from .testcase import TaskTestCase
 
 
@@ -170,3 +180,289 @@ class TestDeleteTask(TaskTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('tasks'))
         self.assertEqual(Task.objects.count(), self.count)
+
+
+class TestImportTasks(TaskTestCase):
+    csv_content = (
+        'name,description,status,executor,labels\n'
+        'Cook,Dinner,Started,Macca,"Personal, Work"\n'
+        'Sleep,Again,Started,Macca,\n'
+        'Walk,,Unknown,Macca,\n'
+        'Run,,Started,Nobody,\n'
+        'Swim,,Paused,Hazza,Nothing\n'
+        ',,Paused,Hazza,\n'
+        'Read,Books,Paused,Hazza,\n'
+        'Read,Twice,Paused,Hazza,\n'
+    )
+
+    def upload(self, name, content):
+        return self.client.post(
+            reverse_lazy('tasks_import'),
+            {'file': SimpleUploadedFile(name, content.encode())},
+        )
+
+    def test_import_csv(self) -> None:
+        response = self.upload('tasks.csv', self.csv_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.count(), self.count + 2)
+
+        cook = Task.objects.get(name='Cook')
+        self.assertEqual(cook.author, self.user1)
+        self.assertEqual(cook.executor, self.user2)
+        self.assertEqual(cook.status, self.status1)
+        self.assertEqual(
+            sorted(label.name for label in cook.labels.all()),
+            ['Personal', 'Work']
+        )
+        self.assertEqual(Task.objects.get(name='Read').description, 'Books')
+
+    def test_import_reports_row_errors(self) -> None:
+        response = self.upload('tasks.csv', self.csv_content)
+
+        errors = dict(response.context['result'].errors)
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6, 8])
+        self.assertIn('Sleep', errors[2])
+        self.assertIn('Unknown', errors[3])
+        self.assertIn('Nobody', errors[4])
+        self.assertIn('Nothing', errors[5])
+        self.assertIn('name', errors[6])
+        self.assertIn('Read', errors[8])
+        self.assertContains(response, 'Unknown executor')
+
+    def test_import_json(self) -> None:
+        content = json.dumps([{
+            'name': 'Cook',
+            'status': 'Started',
+            'executor': 'Macca',
+            'labels': ['Study'],
+        }])
+        response = self.upload('tasks.json', content)
+
+        self.assertRedirects(response, reverse_lazy('tasks'))
+        cook = Task.objects.get(name='Cook')
+        self.assertEqual(cook.labels.get().name, 'Study')
+
+    def test_import_ndjson(self) -> None:
+        content = '\n'.join(json.dumps({
+            'name': f'Task {i}', 'status': 'Paused', 'executor': 'Lennie',
+        }) for i in range(5))
+        response = self.upload('tasks.ndjson', content)
+
+        self.assertRedirects(response, reverse_lazy('tasks'))
+        self.assertEqual(Task.objects.count(), self.count + 5)
+
+    def test_import_ndjson_invalid_lines(self) -> None:
+        lines = [json.dumps({
+            'name': f'Task {i}', 'status': 'Paused', 'executor': 'Lennie',
+        }) for i in range(4)]
+        lines[1] = '{"name": "Broken",'
+        response = self.upload('tasks.ndjson', '\n'.join(lines))
+
+        self.assertEqual(Task.objects.count(), self.count + 3)
+        errors = dict(response.context['result'].errors)
+        self.assertEqual(list(errors), [2])
+        self.assertIn('Invalid JSON', errors[2])
+
+    def test_import_csv_invalid_rows(self) -> None:
+        content = (
+            'name,description,status,executor\n'
+            f'Cook,{"x" * (csv.field_size_limit() + 1)},Paused,Hazza\n'
+            'Read,Books,Paused,Hazza\n'
+        )
+        response = self.upload('tasks.csv', content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Task.objects.filter(name='Read').exists())
+        errors = dict(response.context['result'].errors)
+        self.assertEqual(list(errors), [1])
+        self.assertIn('Invalid CSV row', errors[1])
+
+    def test_import_unreadable_rest(self) -> None:
+        # Past the first chunk the file is decoded by.
+        content = ''.join(json.dumps({
+            'name': f'Task {i}', 'status': 'Paused', 'executor': 'Lennie',
+        }) + '\n' for i in range(500))
+        rows = importer.read_rows(
+            BytesIO(content.encode() + b'\xff\xfe\n'), 'ndjson',
+        )
+        result = importer.import_tasks(rows, self.user1, batch_size=100)
+
+        self.assertGreater(result.created, 0)
+        self.assertEqual(Task.objects.count(), self.count + result.created)
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn('decode', result.errors[0][1])
+
+    def test_import_conflict_in_batch(self) -> None:
+        # A task named like a row is saved after the batch was checked.
+        class Late(importer.References):
+            def __init__(self, rows):
+                super().__init__(rows)
+                self.existing = set()
+
+        rows = [{
+            'name': name, 'status': 'Paused', 'executor': 'Lennie',
+            'labels': ['Work'],
+        } for name in ('Cook', self.task1.name, 'Read')]
+
+        result = importer.import_tasks(rows, self.user1, references=Late)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([number for number, _ in result.errors], [2])
+        self.assertEqual(
+            sorted(Task.objects.filter(pk__in=result.task_ids)
+                   .values_list('name', flat=True)),
+            ['Cook', 'Read'],
+        )
+        self.assertEqual(
+            TaskListRow.objects.get(name='Cook').labels, 'Work',
+        )
+
+    def test_import_updates_read_model(self) -> None:
+        self.upload('tasks.csv', self.csv_content)
+
+        row = TaskListRow.objects.get(name='Cook')
+        self.assertEqual(row.labels, 'Personal, Work')
+        self.assertEqual(row.executor, self.user2.get_full_name())
+
+    def test_import_invalid_file(self) -> None:
+        response = self.upload('tasks.json', '{"name": "Cook"}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('file', response.context['form'].errors)
+        self.assertEqual(Task.objects.count(), self.count)
+
+    def test_import_unknown_extension(self) -> None:
+        response = self.upload('tasks.xml', '<tasks/>')
+
+        self.assertIn('file', response.context['form'].errors)
+
+    def test_import_command(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write(self.csv_content)
+            file.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                'import_tasks', file.name, author='Hazza', batch_size=3,
+                stdout=out, stderr=err,
+            )
+
+        self.assertIn('Imported 2 tasks, 6 errors', out.getvalue())
+        self.assertIn('Row 4: Unknown executor "Nobody".', err.getvalue())
+        self.assertEqual(Task.objects.get(name='Cook').author.username, 'Hazza')
+
+    def test_import_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.upload('tasks.csv', self.csv_content)
+
+        self.assertRedirects(response, reverse_lazy('login'))
+        self.assertEqual(Task.objects.count(), self.count)
+
+
+class TestBulkTasks(TaskTestCase):
+    def bulk(self, data):
+        data.setdefault('next', '/tasks/?sort=name')
+        return self.client.post(reverse_lazy('tasks_bulk'), data)
+
+    def test_bulk_status(self) -> None:
+        response = self.bulk({'tasks': [1, 3], 'action': 'status', 'status': 3})
+
+        self.assertRedirects(response, '/tasks/?sort=name')
+        self.assertEqual(
+            list(Task.objects.filter(status=3).values_list('pk', flat=True)),
+            [1, 3]
+        )
+        self.assertEqual(Task.objects.get(pk=2).status_id, 1)
+
+    def test_bulk_executor(self) -> None:
+        self.bulk({'tasks': [1, 2], 'action': 'executor', 'executor': 2})
+
+        self.assertEqual(
+            set(Task.objects.filter(executor=2).values_list('pk', flat=True)),
+            {1, 2}
+        )
+
+    def test_bulk_labels(self) -> None:
+        self.bulk({'tasks': [1, 2, 3], 'action': 'add_label', 'label': 1})
+
+        self.assertEqual(
+            TaskLabelRelation.objects.filter(label=1).count(), 3
+        )
+
+        self.bulk({'tasks': [2, 3], 'action': 'remove_label', 'label': 1})
+
+        self.assertEqual(
+            list(TaskLabelRelation.objects.filter(label=1)
+                 .values_list('task', flat=True)),
+            [1]
+        )
+        self.assertEqual(self.task3.labels.get(), self.label2)
+
+    def test_bulk_delete_own_tasks(self) -> None:
+        response = self.bulk({'tasks': [1, 2], 'action': 'delete'})
+
+        self.assertRedirects(response, '/tasks/?sort=name')
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)), [3])
+
+    def test_bulk_delete_other_tasks(self) -> None:
+        response = self.bulk({'tasks': [1, 3], 'action': 'delete'})
+
+        self.assertEqual(Task.objects.count(), self.count)
+        messages = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertIn(_('The task can be deleted only by its author'),
+                      messages)
+
+    def test_bulk_updates_read_model(self) -> None:
+        call_command('rebuild_task_list', stdout=StringIO())
+
+        self.bulk({'tasks': [1, 2], 'action': 'executor', 'executor': 2})
+        self.bulk({'tasks': [1], 'action': 'add_label', 'label': 2})
+        self.bulk({'tasks': [2], 'action': 'delete'})
+
+        row = TaskListRow.objects.get(pk=1)
+        self.assertEqual(row.executor, self.user2.get_full_name())
+        self.assertEqual(row.labels, self.label2.name)
+        self.assertFalse(TaskListRow.objects.filter(pk=2).exists())
+
+    def test_bulk_missing_value(self) -> None:
+        self.bulk({'tasks': [1], 'action': 'status'})
+        response = self.bulk({'action': 'delete'})
+
+        self.assertEqual(Task.objects.get(pk=1).status_id, 1)
+        self.assertEqual(Task.objects.count(), self.count)
+        messages = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertIn('Choose the new value.', messages)
+        self.assertIn('Select at least one task.', messages)
+
+    def test_bulk_unsafe_next(self) -> None:
+        response = self.bulk({
+            'tasks': [1], 'action': 'status', 'status': 2,
+            'next': 'https://example.com/',
+        })
+
+        self.assertRedirects(response, reverse_lazy('tasks'))
+
+    def test_bulk_constant_queries(self) -> None:
+        tasks = Task.objects.bulk_create(
+            Task(name=f'Bulk {i}', author=self.user1, executor=self.user1,
+                 status=self.status1)
+            for i in range(50)
+        )
+        task_ids = [task.pk for task in tasks]
+
+        for data in (
+            {'action': 'status', 'status': 2},
+            {'action': 'add_label', 'label': 1},
+            {'action': 'remove_label', 'label': 1},
+            {'action': 'delete'},
+        ):
+            with QueryBudget(16):
+                self.bulk({'tasks': task_ids, **data})
+
+        self.assertEqual(Task.objects.count(), self.count)
+
+    def test_bulk_get_not_allowed(self) -> None:
+        response = self.client.get(reverse_lazy('tasks_bulk'))
+
+        self.assertEqual(response.status_code, 405)
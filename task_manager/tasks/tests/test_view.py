@@ -1,5 +1,31 @@
+import asyncio
+import csv
+import json
+import re
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
+from django.utils import timezone
 
+from task_manager import metrics, query_inspector, timing, versions
+from task_manager.models import Version
+from task_manager.query_inspector import NPlusOneError
+from task_manager.helpers import QueryBudget, call_async_view, \
+    django_templates, jinja2_templates, requires_jinja2
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import archive
+from task_manager.tasks.filters import TaskListRowFilter
+from task_manager.tasks.models import Task, TaskLabelRelation, TaskListRow
+from task_manager.users.models import User
+from task_manager.tasks.views import AsyncTasksListView, \
+    AsyncTaskDetailView, AsyncTaskDeleteView
 from .testcase import TaskTestCase
 
 
@@ -32,6 +58,13 @@ class TestListTasks(TaskTestCase):
             self.assertContains(response, f'/tasks/{pk}/update/')
             self.assertContains(response, f'/tasks/{pk}/delete/')
 
+    @override_settings(SERVER_TIMING_PUBLIC=True)
+    def test_tasks_timing(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'))
+
+        for name in ('filter', 'rows', 'facets', 'render'):
+            self.assertIn(f'{name};dur=', response['Server-Timing'])
+
     def test_tasks_not_logged_in_view(self) -> None:
         self.client.logout()
 
@@ -48,7 +81,7 @@ class TestFilterTasks(TaskTestCase):
             {'status': self.status1.pk}
         )
 
-        self.assertEqual(response.context['tasks'].count(), 2)
+        self.assertEqual(len(response.context['tasks']), 2)
         self.assertContains(response, self.task1.name)
         self.assertContains(response, self.task2.name)
         self.assertNotContains(response, self.task3.name)
@@ -59,7 +92,7 @@ class TestFilterTasks(TaskTestCase):
             {'executor': self.user1.pk}
         )
 
-        self.assertEqual(response.context['tasks'].count(), 2)
+        self.assertEqual(len(response.context['tasks']), 2)
         self.assertNotContains(response, self.task1.name)
         self.assertContains(response, self.task2.name)
         self.assertContains(response, self.task3.name)
@@ -70,23 +103,429 @@ class TestFilterTasks(TaskTestCase):
             {'labels': self.label2.pk}
         )
 
-        self.assertEqual(response.context['tasks'].count(), 1)
+        self.assertEqual(len(response.context['tasks']), 1)
         self.assertNotContains(response, self.task1.name)
         self.assertNotContains(response, self.task2.name)
         self.assertContains(response, self.task3.name)
 
+    def test_filter_tasks_by_several_values(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'executor': [self.user1.pk, 3], 'status': [1, 2]}
+        )
+
+        self.assertEqual(len(response.context['tasks']), self.count)
+
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'executor': [self.user2.pk, 3], 'status': 1}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task1.pk]
+        )
+
+    def test_filter_tasks_by_any_label(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': [1, 2], 'labels_match': 'any'}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task2.pk, self.task3.pk]
+        )
+
+    def test_filter_tasks_by_all_labels(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': [1, 2], 'labels_match': 'all'}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task3.pk]
+        )
+
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': [1, 2, 3], 'labels_match': 'all'}
+        )
+
+        self.assertEqual(len(response.context['tasks']), 0)
+
     def test_filter_tasks_by_own_tasks(self) -> None:
         response = self.client.get(
             reverse_lazy('tasks'),
             {'own_tasks': 'on'}
         )
 
-        self.assertEqual(response.context['tasks'].count(), 2)
+        self.assertEqual(len(response.context['tasks']), 2)
         self.assertContains(response, self.task1.name)
         self.assertContains(response, self.task2.name)
         self.assertNotContains(response, self.task3.name)
 
 
+class TestSearchTasks(TaskTestCase):
+    def search(self, query, **params) -> list:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'q': query, **params}
+        )
+        return [task.name for task in response.context['tasks']]
+
+    def test_search_name_and_description(self) -> None:
+        self.assertEqual(self.search('sle'), [self.task2.name])
+        self.assertEqual(self.search('AGAIN'), [self.task3.name])
+        self.assertEqual(self.search('make now'), [self.task1.name])
+        self.assertEqual(self.search('make never'), [])
+
+    def test_search_ignores_syntax(self) -> None:
+        self.assertEqual(self.search('"eat*" (-'), [self.task1.name])
+
+    def test_search_ranking(self) -> None:
+        Task.objects.create(
+            name='Dinner', description='Eat well',
+            author=self.user1, executor=self.user1, status=self.status1,
+        )
+
+        self.assertEqual(self.search('eat'), ['Eat', 'Dinner'])
+        self.assertEqual(self.search('eat', sort='name'), ['Dinner', 'Eat'])
+
+    def test_search_many_matches_newest_first(self) -> None:
+        Task.objects.create(
+            name='Dinner', description='Eat well',
+            author=self.user1, executor=self.user1, status=self.status1,
+        )
+
+        with override_settings(SEARCH_RANK_LIMIT=1):
+            self.assertEqual(self.search('eat'), ['Dinner', 'Eat'])
+            self.assertEqual(self.search('dinner'), ['Dinner'])
+
+    def test_search_after_update(self) -> None:
+        self.task1.name = 'Breakfast'
+        self.task1.save()
+
+        self.assertEqual(self.search('breakfast'), ['Breakfast'])
+        self.assertEqual(self.search('eat'), [])
+
+    def test_search_pages(self) -> None:
+        Task.objects.bulk_create(
+            Task(
+                name=f'Report {i}', description='report ' * (i % 7),
+                author=self.user1, executor=self.user1, status=self.status1,
+            )
+            for i in range(120)
+        )
+        names = []
+        response = self.client.get(reverse_lazy('tasks'), {'q': 'report'})
+        while True:
+            names.extend(task.name for task in response.context['tasks'])
+            if 'next_page_url' not in response.context:
+                break
+            response = self.client.get(
+                reverse_lazy('tasks') + response.context['next_page_url']
+            )
+
+        self.assertEqual(len(names), 120)
+        self.assertEqual(len(set(names)), 120)
+
+
+class TestPaginateTasks(TaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        Task.objects.bulk_create(
+            Task(
+                name=f'Task {i:03}',
+                author=self.user1,
+                executor=self.user2,
+                status=self.status1,
+            )
+            for i in range(120)
+        )
+        self.count = Task.objects.count()
+
+    def walk(self, params) -> list:
+        names = []
+        response = self.client.get(reverse_lazy('tasks'), params)
+        while True:
+            names.extend(task.name for task in response.context['tasks'])
+            next_url = response.context.get('next_page_url')
+            if not next_url:
+                return names
+            response = self.client.get(reverse_lazy('tasks') + next_url)
+
+    def test_first_page(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'))
+
+        self.assertEqual(len(response.context['tasks']), 50)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertIn('next_page_url', response.context)
+        self.assertNotIn('previous_page_url', response.context)
+
+    def test_walk_all_pages(self) -> None:
+        names = self.walk({})
+
+        self.assertEqual(len(names), self.count)
+        self.assertEqual(
+            names,
+            list(Task.objects.order_by('date_created', 'id')
+                 .values_list('name', flat=True))
+        )
+
+    def test_walk_sorted(self) -> None:
+        names = self.walk({'sort': 'name'})
+
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), self.count)
+
+        names = self.walk({'sort': '-date'})
+
+        self.assertEqual(
+            names,
+            list(Task.objects.order_by('-date_created', '-id')
+                 .values_list('name', flat=True))
+        )
+
+    def test_walk_sorted_by_names(self) -> None:
+        for task in Task.objects.all():
+            task.status_id = task.pk % 3 + 1
+            task.executor_id = task.pk // 3 % 3 + 1
+            task.save()
+
+        for sort in ('status', 'executor'):
+            rows = TaskListRow.objects \
+                .order_by(*TaskListRowFilter.orderings[sort]) \
+                .values_list('name', sort)
+            expected, sort_names = zip(*rows)
+            self.assertEqual(list(sort_names), sorted(sort_names))
+            self.assertEqual(self.walk({'sort': sort}), list(expected))
+            with override_settings(TASK_LIST_READ_MODEL=True):
+                self.assertEqual(self.walk({'sort': sort}), list(expected))
+
+    def test_cursor_keeps_filters(self) -> None:
+        params = {'executor': self.user2.pk, 'sort': 'name'}
+        response = self.client.get(reverse_lazy('tasks'), params)
+        next_url = response.context['next_page_url']
+
+        self.assertIn(f'executor={self.user2.pk}', next_url)
+        self.assertIn('sort=name', next_url)
+        self.assertEqual(
+            len(self.walk(params)),
+            Task.objects.filter(executor=self.user2).count()
+        )
+
+    def test_previous_page(self) -> None:
+        first = self.client.get(reverse_lazy('tasks'))
+        second = self.client.get(
+            reverse_lazy('tasks') + first.context['next_page_url']
+        )
+        back = self.client.get(
+            reverse_lazy('tasks') + second.context['previous_page_url']
+        )
+
+        self.assertEqual(
+            list(back.context['tasks']),
+            list(first.context['tasks'])
+        )
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'cursor': 'not-a-cursor'}
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(TASK_LIST_READ_MODEL=True)
+class TestReadModelTasks(TaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        call_command('rebuild_task_list', stdout=StringIO())
+
+    def test_tasks_content(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'))
+
+        self.assertEqual(len(response.context['tasks']), self.count)
+        self.assertContains(response, self.task3.name)
+        self.assertContains(response, self.task3.executor)
+        self.assertContains(response, self.task3.status)
+
+    def test_filter_tasks(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': self.label2.pk, 'executor': self.user1.pk}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task3.pk]
+        )
+
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'own_tasks': 'on', 'status': self.status1.pk}
+        )
+
+        self.assertEqual(len(response.context['tasks']), 2)
+
+    def test_filter_tasks_by_labels(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': [1, 2], 'labels_match': 'all'}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task3.pk]
+        )
+
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': [2, 3], 'status': [1, 2]}
+        )
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task3.pk]
+        )
+
+    def test_search_tasks(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'), {'q': 'zzz'})
+
+        self.assertEqual(
+            [task.pk for task in response.context['tasks']],
+            [self.task2.pk]
+        )
+
+    def test_single_table_queries(self) -> None:
+        # Warm up the facet counts cache.
+        self.client.get(reverse_lazy('tasks'), {'show_labels': 'on'})
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse_lazy('tasks'), {'show_labels': 'on'})
+
+        tables = [
+            query['sql'] for query in context.captured_queries
+            if 'tasks_' in query['sql']
+        ]
+        self.assertEqual(len(tables), 1)
+        self.assertNotIn('JOIN', tables[0])
+
+
+class TestExportTasks(TaskTestCase):
+    def export(self, file_format, data=None):
+        response = self.client.get(
+            reverse_lazy('tasks_export', kwargs={'file_format': file_format}),
+            data
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_csv(self) -> None:
+        rows = list(csv.reader(StringIO(self.export('csv'))))
+
+        self.assertEqual(rows[0], [
+            'id', 'name', 'status', 'author', 'executor', 'labels',
+            'date_created',
+        ])
+        self.assertEqual([row[0] for row in rows[1:]], ['1', '2', '3'])
+        self.assertEqual(rows[1][:5], [
+            '1', 'Eat', self.status1.name,
+            self.user1.get_full_name(), self.task1.executor.get_full_name(),
+        ])
+        self.assertEqual(rows[1][5], '')
+        self.assertEqual(
+            sorted(rows[3][5].split(', ')),
+            sorted(label.name for label in self.task3.labels.all())
+        )
+        self.assertEqual(rows[1][6], self.task1.date_created.isoformat())
+
+    def test_export_ndjson(self) -> None:
+        rows = [
+            json.loads(line)
+            for line in self.export('ndjson').splitlines()
+        ]
+
+        self.assertEqual([row['id'] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[1]['labels'], self.task2.labels.get().name)
+        self.assertEqual(rows[1]['executor'], self.user1.get_full_name())
+
+    def test_export_honors_filter(self) -> None:
+        content = self.export('ndjson', {
+            'labels': self.label2.pk, 'sort': 'name'
+        })
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.task3.pk])
+
+    def test_export_invalid_filter(self) -> None:
+        rows = self.export('csv', {'status': 'abc'}).splitlines()
+
+        self.assertEqual(len(rows), 1)
+
+    @override_settings(TASK_LIST_READ_MODEL=True)
+    def test_export_read_model(self) -> None:
+        call_command('rebuild_task_list', stdout=StringIO())
+
+        rows = list(csv.reader(StringIO(self.export('csv'))))
+
+        self.assertEqual([row[0] for row in rows[1:]], ['1', '2', '3'])
+        self.assertEqual(rows[2][5], self.task2.labels.get().name)
+
+    def test_export_unknown_format(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks_export', kwargs={'file_format': 'xml'})
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.client.get(
+            reverse_lazy('tasks_export', kwargs={'file_format': 'csv'})
+        )
+
+        self.assertRedirects(response, reverse_lazy('login'))
+
+
+class TestArchivedTasks(TaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        Task.objects.update(status_changed_at=self.task1.date_created)
+        Status.objects.filter(pk=1).update(is_terminal=True)
+        archive.archive()
+
+    def archived(self, **params) -> list:
+        response = self.client.get(reverse_lazy('tasks_archive'), params)
+        self.assertEqual(response.status_code, 200)
+        return [task.name for task in response.context['tasks']]
+
+    def test_archived_tasks(self) -> None:
+        self.assertEqual(self.archived(), ['Sleep', 'Eat'])
+
+        response = self.client.get(reverse_lazy('tasks'))
+        self.assertNotContains(response, 'Sleep')
+        self.assertContains(response, reverse_lazy('tasks_archive'))
+
+    def test_archived_tasks_filter(self) -> None:
+        self.assertEqual(self.archived(labels=1), ['Sleep'])
+        self.assertEqual(self.archived(q='now'), ['Eat'])
+        self.assertEqual(self.archived(executor=3), ['Eat'])
+
+    def test_archived_tasks_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.client.get(reverse_lazy('tasks_archive'))
+
+        self.assertRedirects(response, reverse_lazy('login'))
+
+
 class TestDetailedTask(TaskTestCase):
     def test_detailed_task_view(self) -> None:
         response = self.client.get(
@@ -191,3 +630,447 @@ class TestDeleteTaskView(TaskTestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('tasks'))
+
+
+class TestFacetTasks(TaskTestCase):
+    def test_facet_counts(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'))
+
+        facets = response.context['facets']
+        self.assertEqual(facets, {'status': {1: 2, 2: 1}})
+
+    def test_facet_counts_follow_filter(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'labels': self.label2.pk}
+        )
+
+        self.assertEqual(response.context['facets']['status'], {2: 1})
+
+    def test_facet_counts_other_values(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'status': self.status1.pk, 'labels': self.label2.pk},
+        )
+
+        # Counted without the status filter itself.
+        self.assertEqual(response.context['facets']['status'], {2: 1})
+        self.assertContains(response, f'{self.status1.name} (0)')
+        status2 = Status.objects.get(pk=2)
+        self.assertContains(response, f'{status2.name} (1)')
+
+    def test_facet_counts_in_options(self) -> None:
+        response = self.client.get(
+            reverse_lazy('tasks'),
+            {'status': self.status1.pk, 'executor': self.user1.pk}
+        )
+
+        self.assertContains(response, f'{self.status1.name} (1)')
+        # The executor and label pickers render the selected options
+        # only: they have no counts.
+        self.assertContains(response, f'>{self.user1.get_full_name()}<')
+
+    def test_facet_counts_with_search(self) -> None:
+        response = self.client.get(reverse_lazy('tasks'), {'q': 'eat'})
+
+        self.assertEqual(response.context['facets']['status'], {1: 1})
+
+    def test_facet_counts_cached_per_selection(self) -> None:
+        self.client.get(
+            reverse_lazy('tasks'),
+            {'status': [1, 2], 'sort': 'name'}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse_lazy('tasks'),
+                {'status': [2, 1], 'sort': 'date'}
+            )
+
+        self.assertEqual(response.context['facets']['status'], {1: 2, 2: 1})
+        self.assertFalse(any(
+            'GROUP BY' in query['sql']
+            for query in context.captured_queries
+        ))
+
+
+class TestConditionalGetTasks(TaskTestCase):
+    def get(self, url, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(url, **headers)
+
+    def test_list_not_modified(self) -> None:
+        url = reverse_lazy('tasks')
+        response = self.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+        # Session, user and the versions: nothing of the view itself.
+        with QueryBudget(3):
+            response = self.get(url, response['ETag'])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.content)
+
+    def test_detail_not_modified(self) -> None:
+        url = reverse_lazy('task_show', kwargs={'pk': 3})
+        etag = self.get(url)['ETag']
+
+        self.assertEqual(self.get(url, etag).status_code, 304)
+
+    def test_not_modified_since(self) -> None:
+        Version.objects.update(
+            updated_at=timezone.now() - timedelta(seconds=5),
+        )
+        url = reverse_lazy('tasks')
+        last_modified = self.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_in_the_same_second(self) -> None:
+        url = reverse_lazy('tasks')
+        versions.bump(versions.TASKS)
+
+        # A change later in this second could not be told apart.
+        self.assertNotIn('Last-Modified', self.get(url))
+
+    def test_etag_depends_on_query(self) -> None:
+        etag = self.get(reverse_lazy('tasks'))['ETag']
+
+        response = self.client.get(
+            reverse_lazy('tasks'), {'sort': 'name'}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_modified_by_changes(self) -> None:
+        url = reverse_lazy('tasks')
+        changes = (
+            lambda: self.task1.save(),
+            lambda: self.task1.labels.add(self.label2),
+            lambda: self.status1.save(),
+            lambda: self.label2.save(),
+            lambda: self.user2.save(),
+            lambda: Task.objects.filter(pk=2).delete(),
+        )
+        for change in changes:
+            etag = self.get(url)['ETag']
+            change()
+            self.assertEqual(self.get(url, etag).status_code, 200)
+
+    def test_modified_by_bulk_action(self) -> None:
+        url = reverse_lazy('tasks')
+        etag = self.get(url)['ETag']
+        updated_at = self.task1.updated_at
+
+        self.client.post(reverse_lazy('tasks_bulk'), {
+            'tasks': [1], 'action': 'add_label', 'label': self.label2.pk,
+        })
+        self.get(url)  # Show the message of the action.
+
+        self.assertEqual(self.get(url, etag).status_code, 200)
+        self.task1.refresh_from_db()
+        self.assertGreater(self.task1.updated_at, updated_at)
+
+    def test_pending_messages_rendered(self) -> None:
+        url = reverse_lazy('tasks')
+        etag = self.get(url)['ETag']
+        self.client.post(reverse_lazy('tasks_bulk'), {'action': 'delete'})
+
+        response = self.get(url, etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'alert-danger')
+
+
+def row_cache_metric(name):
+    return metrics.collect(metrics.TOTALS).get(
+        metrics.key(f'task_row_cache_{name}_total'), 0,
+    )
+
+
+class TestRowCacheTasks(TaskTestCase):
+    def test_warm_page(self) -> None:
+        url = reverse_lazy('tasks')
+        self.client.get(url, {'show_labels': 'on'})
+        hits = row_cache_metric('hits')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'show_labels': 'on'})
+
+        self.assertEqual(row_cache_metric('hits') - hits, self.count)
+        tasks = [
+            query['sql'] for query in context.captured_queries
+            if 'tasks_' in query['sql']
+        ]
+        self.assertEqual(len(tasks), 1)
+        self.assertNotIn('JOIN', tasks[0])
+        self.assertContains(response, self.task3.name)
+        self.assertContains(response, self.label2.name)
+
+    def assertRowChanged(self, change, name) -> None:
+        url = reverse_lazy('tasks')
+        self.client.get(url, {'show_labels': 'on'})
+        change(name)
+
+        response = self.client.get(url, {'show_labels': 'on'})
+
+        self.assertContains(response, name)
+
+    def test_row_follows_task(self) -> None:
+        def change(name):
+            self.task3.name = name
+            self.task3.save()
+        self.assertRowChanged(change, 'New task')
+
+    def test_row_follows_status(self) -> None:
+        def change(name):
+            self.status1.name = name
+            self.status1.save()
+        self.assertRowChanged(change, 'New status')
+
+    def test_row_follows_label(self) -> None:
+        def change(name):
+            self.label2.name = name
+            self.label2.save()
+        self.assertRowChanged(change, 'New label')
+
+    def test_row_follows_user(self) -> None:
+        def change(name):
+            self.user1.first_name = name
+            self.user1.save()
+        self.assertRowChanged(change, 'Newname')
+
+    def test_rows_follow_labels(self) -> None:
+        url = reverse_lazy('tasks')
+        self.client.get(url, {'show_labels': 'on'})
+        self.task2.labels.add(self.label2)
+
+        response = self.client.get(url, {'show_labels': 'on'})
+
+        row = [row for row in response.context['task_rows']
+               if self.task2.name in row]
+        self.assertIn(self.label2.name, row[0])
+
+    @override_settings(TASK_ROW_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self) -> None:
+        misses = row_cache_metric('misses')
+
+        response = self.client.get(reverse_lazy('tasks'))
+
+        self.assertEqual(len(response.context['task_rows']), self.count)
+        self.assertEqual(row_cache_metric('misses'), misses)
+
+
+@override_settings(TASK_FACETS_TIMEOUT=0)
+class TestTasksQueryCount(TaskTestCase):
+    def add_tasks(self, count) -> None:
+        users = User.objects.bulk_create(
+            User(username=f'user{i}', first_name='First', last_name=f'{i}')
+            for i in range(count)
+        )
+        labels = Label.objects.bulk_create(
+            Label(name=f'label{i}') for i in range(count)
+        )
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=f'Bulk {i}',
+                author=users[i],
+                executor=users[-i],
+                status=self.status1,
+            )
+            for i in range(count)
+        )
+        TaskLabelRelation.objects.bulk_create(
+            TaskLabelRelation(task=task, label=label)
+            for task in tasks for label in labels[:3]
+        )
+
+    def assertConstantQueries(self, budget, url, data=None) -> None:
+        with QueryBudget(budget) as small:
+            self.client.get(url, data)
+
+        self.add_tasks(30)
+
+        with QueryBudget(budget) as large:
+            self.client.get(url, data)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_tasks_list_queries(self) -> None:
+        self.assertConstantQueries(8, reverse_lazy('tasks'))
+
+    def test_tasks_list_labels_queries(self) -> None:
+        self.assertConstantQueries(
+            9,
+            reverse_lazy('tasks'),
+            {'show_labels': 'on'}
+        )
+
+    def test_detailed_task_queries(self) -> None:
+        self.assertConstantQueries(
+            5,
+            reverse_lazy('task_show', kwargs={'pk': 3})
+        )
+
+    def test_update_task_queries(self) -> None:
+        self.assertConstantQueries(
+            7,
+            reverse_lazy('task_update', kwargs={'pk': 3})
+        )
+
+    def test_delete_task_queries(self) -> None:
+        self.assertConstantQueries(
+            3,
+            reverse_lazy('task_delete', kwargs={'pk': 1})
+        )
+
+
+@requires_jinja2
+@override_settings(TASK_ROW_CACHE_TIMEOUT=0)
+class TestJinja2Tasks(TaskTestCase):
+    maxDiff = None
+
+    def render(self, templates, data) -> str:
+        with override_settings(TEMPLATES=templates):
+            response = self.client.get(reverse_lazy('tasks'), data)
+        self.assertEqual(response.status_code, 200)
+        return re.sub(
+            r'(name="csrfmiddlewaretoken" value=")\w+',
+            r'\1',
+            response.content.decode(),
+        )
+
+    def test_same_html(self) -> None:
+        for data in ({}, {'show_labels': 'on', 'status': self.status1.pk}):
+            with self.subTest(data=data):
+                self.assertHTMLEqual(
+                    self.render(jinja2_templates(), data),
+                    self.render(django_templates(), data),
+                )
+
+
+class TestNPlusOne(TaskTestCase):
+    class LazyTasksListView(AsyncTasksListView):
+        def get_queryset(self):
+            return Task.objects.order_by(*self.ordering)
+
+    def list_queries(self):
+        request = AsyncRequestFactory().get('/')
+        request.user = self.user1
+        queries, token = query_inspector.start()
+        try:
+            call_async_view(self.LazyTasksListView, request)
+        finally:
+            query_inspector.stop(token)
+        return queries
+
+    @override_settings(TASK_ROW_CACHE_TIMEOUT=0)
+    def test_related_in_template_loop(self) -> None:
+        reports = query_inspector.find_n_plus_one(self.list_queries(), 3)
+
+        # The 1 + 3N of the rows without select_related().
+        self.assertEqual(len(reports), 3)
+        for report, field in zip(reports, ('status', 'author', 'executor')):
+            self.assertRegex(
+                report, rf'^3 queries from tasks/task_row.html:\d+ '
+                        rf'\(reading Task\.{field}\): SELECT ',
+            )
+
+    @requires_jinja2
+    @override_settings(TASK_ROW_CACHE_TIMEOUT=0)
+    def test_related_in_jinja2_loop(self) -> None:
+        with self.settings(TEMPLATES=jinja2_templates()):
+            reports = query_inspector.find_n_plus_one(
+                self.list_queries(), 3,
+            )
+
+        self.assertRegex(
+            reports[0], r'^3 queries from tasks/task_row.html:\d+ '
+                        r'\(reading Task\.status\)',
+        )
+
+    @override_settings(TASK_ROW_CACHE_TIMEOUT=0, N_PLUS_ONE_RAISE=True)
+    def test_raise(self) -> None:
+        queries = self.list_queries()
+        request = AsyncRequestFactory().get('/tasks/')
+
+        with self.assertRaisesRegex(NPlusOneError, 'GET /tasks/'):
+            query_inspector.check(request, queries)
+
+    def test_cached_rows(self) -> None:
+        self.list_queries()  # Fills the row cache.
+
+        self.assertEqual(
+            query_inspector.find_n_plus_one(self.list_queries(), 3), [],
+        )
+
+
+class TestAsyncTasks(TaskTestCase):
+    def call(self, view_class, method='get', user=None, **kwargs):
+        request = getattr(AsyncRequestFactory(), method)(
+            '/', content_type='application/x-www-form-urlencoded',
+        )
+        request.user = user or self.user1
+        return call_async_view(view_class, request, **kwargs)
+
+    def test_views_are_async(self) -> None:
+        for view_class in (AsyncTasksListView, AsyncTaskDetailView,
+                           AsyncTaskDeleteView):
+            with self.subTest(view=view_class.__name__):
+                self.assertTrue(
+                    asyncio.iscoroutinefunction(view_class.as_view())
+                )
+
+    def test_list(self) -> None:
+        response = self.call(AsyncTasksListView)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_rendered)
+        for task in self.tasks:
+            self.assertContains(response, task.name)
+
+    def test_list_timing(self) -> None:
+        server_timing, token = timing.start()
+        try:
+            self.call(AsyncTasksListView)
+        finally:
+            timing.stop(token)
+
+        for name in ('db', 'filter', 'rows', 'render'):
+            self.assertIn(name, server_timing.spans)
+        self.assertGreater(server_timing.queries, 0)
+
+    def test_list_not_logged_in(self) -> None:
+        response = self.call(AsyncTasksListView, user=AnonymousUser())
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse_lazy('login'))
+
+    def test_detail(self) -> None:
+        response = self.call(AsyncTaskDetailView, pk=self.task3.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.task3.description)
+        self.assertIn('ETag', response.headers)
+
+    def test_delete_by_author(self) -> None:
+        response = self.call(AsyncTaskDeleteView, 'post', pk=self.task1.pk)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Task.objects.filter(pk=self.task1.pk).exists())
+
+    def test_delete_not_author(self) -> None:
+        response = self.call(AsyncTaskDeleteView, 'post', pk=self.task3.pk)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse_lazy('tasks'))
+        self.assertTrue(Task.objects.filter(pk=self.task3.pk).exists())
+
+    def test_method_not_allowed(self) -> None:
+        response = self.call(AsyncTaskDetailView, 'post', pk=self.task3.pk)
+
+        self.assertEqual(response.status_code, 405)
@@ -1,6 +1,9 @@
+from django.core.cache import cache
 from django.test import TestCase, Client
 
-from task_manager.helpers import load_data, test_english, remove_rollbar
+from task_manager import reference
+from task_manager.helpers import bump_versions_at_once, \
+    detect_n_plus_one, load_data, test_english, remove_rollbar
 from task_manager.tasks.models import Task
 from task_manager.users.models import User
 from task_manager.statuses.models import Status
@@ -9,11 +12,14 @@ from task_manager.labels.models import Label
 
 @test_english
 @remove_rollbar
+@bump_versions_at_once
+@detect_n_plus_one
 class TaskTestCase(TestCase):
     fixtures = ['user.json', 'status.json', 'task.json', 'label.json']
     test_task = load_data('test_task.json')
 
     def setUp(self) -> None:
+        cache.clear()
         self.client = Client()
 
         self.task1 = Task.objects.get(pk=1)
@@ -31,3 +37,7 @@ class TaskTestCase(TestCase):
         self.labels = Label.objects.filter(pk=2)
 
         self.client.force_login(self.user1)
+
+        # As a running worker has them: queries counted by the tests
+        # do not depend on the tests run before.
+        reference.preload()
@@ -1,13 +1,29 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import TasksListView, TaskDetailView, \
-    TaskCreateView, TaskUpdateView, TaskDeleteView
+    TaskCreateView, TaskUpdateView, TaskDeleteView, TasksExportView, \
+    TaskImportView, TasksBulkView, AsyncTasksListView, AsyncTaskDetailView, \
+    AsyncTaskDeleteView, ArchivedTasksListView
+
+
+if settings.ASYNC_VIEWS:
+    ListView, DetailView, DeleteView = \
+        AsyncTasksListView, AsyncTaskDetailView, AsyncTaskDeleteView
+else:
+    ListView, DetailView, DeleteView = \
+        TasksListView, TaskDetailView, TaskDeleteView
 
 
 urlpatterns = [
-    path('', TasksListView.as_view(), name='tasks'),
-    path('<int:pk>/', TaskDetailView.as_view(), name='task_show'),
+    path('', ListView.as_view(), name='tasks'),
+    path('export/<str:file_format>/', TasksExportView.as_view(),
+         name='tasks_export'),
+    path('archive/', ArchivedTasksListView.as_view(), name='tasks_archive'),
+    path('<int:pk>/', DetailView.as_view(), name='task_show'),
     path('create/', TaskCreateView.as_view(), name='task_create'),
+    path('import/', TaskImportView.as_view(), name='tasks_import'),
+    path('bulk/', TasksBulkView.as_view(), name='tasks_bulk'),
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='task_update'),
-    path('<int:pk>/delete/', TaskDeleteView.as_view(), name='task_delete'),
+    path('<int:pk>/delete/', DeleteView.as_view(), name='task_delete'),
 ]
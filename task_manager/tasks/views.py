@@ -1,37 +1,238 @@
+from django.conf import settings
+from django.contrib import messages
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, UpdateView, DeleteView, DetailView
+from django.views.generic import CreateView, UpdateView, DeleteView, \
+    DetailView, FormView, View
 from django.utils.translation import gettext_lazy as _
 from django.contrib.messages.views import SuccessMessageMixin
-from django_filters.views import FilterView
+from django_filters.views import FilterMixin, FilterView
 
-from task_manager.mixins import AuthRequiredMixin, AuthorDeletionMixin
+from task_manager import timing
+from task_manager.mixins import AsyncViewMixin, AuthRequiredMixin, \
+    AuthorDeletionMixin, ConditionalGetMixin, KeysetPaginationMixin
 from task_manager.users.models import User
-from .models import Task
-from .forms import TaskForm
-from .filters import TaskFilter
+from .models import ArchivedTask, Task, TaskListRow
+from .forms import TaskForm, TaskImportForm, TaskBulkForm
+from .filters import ArchivedTaskFilter, TaskFilter, TaskListRowFilter
+from .facets import get_facet_counts
+from . import bulk, export, importer, row_cache
 
 
-class TasksListView(AuthRequiredMixin, FilterView):
+class TaskSourceMixin:
     """
-    Show all tasks.
+    Where the task list reads from: Task, or TaskListRow
+    with TASK_LIST_READ_MODEL on.
+    """
+    model = Task
+    filterset_class = TaskFilter
+    ordering = TaskFilter.orderings['date']
+
+    def uses_read_model(self):
+        return settings.TASK_LIST_READ_MODEL
+
+    def get_queryset(self):
+        if self.uses_read_model():
+            return TaskListRow.objects.order_by(*self.ordering)
+        return Task.objects \
+            .select_related('status', 'author', 'executor') \
+            .order_by(*self.ordering)
+
+    def get_filterset_class(self):
+        if self.uses_read_model():
+            return TaskListRowFilter
+        return super().get_filterset_class()
+
+
+class TasksListView(AuthRequiredMixin, ConditionalGetMixin,
+                    KeysetPaginationMixin, TaskSourceMixin, FilterView):
+    """
+    Show all tasks, one page at a time.
 
     Authorisation required.
+    Answers 304 when nothing changed since the client's copy.
+    Rows come from the row cache, see tasks.row_cache.
     """
     template_name = 'tasks/tasks.html'
-    model = Task
-    filterset_class = TaskFilter
     context_object_name = 'tasks'
+    paginate_by = 50
     extra_context = {
         'title': _('Tasks'),
         'button_text': _('Show'),
     }
 
+    def get_filterset(self, filterset_class):
+        with timing.span('filter'):
+            filterset = super().get_filterset(filterset_class)
+            if not filterset.is_bound or filterset.is_valid():
+                filterset.qs  # Built once, and kept by the filterset.
+        return filterset
+
+    def paginate_queryset(self, queryset, page_size):
+        if row_cache.enabled():
+            queryset = row_cache.versions_only(
+                queryset, queryset.query.order_by or self.ordering
+            )
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_rows(self, task_ids):
+        """
+        Full tasks for the rows missing from the cache.
+        """
+        queryset = self.get_queryset().filter(pk__in=task_ids)
+        if self.show_labels and not self.uses_read_model():
+            queryset = queryset.prefetch_related('labels')
+        return list(queryset)
 
-class TaskDetailView(AuthRequiredMixin, DetailView):
+    def get_context_data(self, **kwargs):
+        form = self.filterset.form
+        self.show_labels = form.is_valid() and \
+            form.cleaned_data.get('show_labels')
+        context = super().get_context_data(**kwargs)
+        context['read_model'] = self.uses_read_model()
+        context['show_labels'] = self.show_labels
+        with timing.span('rows'):
+            context['task_rows'] = row_cache.render_rows(
+                context['tasks'],
+                self.get_rows,
+                show_labels=self.show_labels,
+                read_model=context['read_model'],
+            )
+        if not form.is_bound or form.is_valid():
+            with timing.span('facets'):
+                context['facets'] = get_facet_counts(self.filterset)
+            self.filterset.show_facet_counts(context['facets'])
+        context['bulk_form'] = TaskBulkForm(
+            initial={'next': self.request.get_full_path()}
+        )
+        return context
+
+
+class ArchivedTasksListView(AuthRequiredMixin, KeysetPaginationMixin,
+                            FilterView):
+    """
+    Show the archived tasks, with the filters of the task list.
+    Read from the archive tables only, see tasks.archive.
+
+    Authorisation required.
+    """
+    template_name = 'tasks/archive.html'
+    model = ArchivedTask
+    filterset_class = ArchivedTaskFilter
+    ordering = TaskFilter.orderings['-date']
+    context_object_name = 'tasks'
+    paginate_by = 50
+    extra_context = {
+        'title': _('Archived tasks'),
+        'button_text': _('Show'),
+    }
+
+    def get_queryset(self):
+        return ArchivedTask.objects \
+            .select_related('status', 'author', 'executor') \
+            .order_by(*self.ordering)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = self.filterset.form
+        context['show_labels'] = form.is_valid() and \
+            form.cleaned_data.get('show_labels')
+        return context
+
+
+class TasksBulkView(AuthRequiredMixin, FormView):
+    """
+    Apply an action to the tasks selected in the list.
+
+    Authorisation required.
+    Only the author can delete his tasks: the whole selection
+    is refused if any of them has another author.
+    """
+    form_class = TaskBulkForm
+    http_method_names = ['post']
+    success_url = reverse_lazy('tasks')
+    author_message = _('The task can be deleted only by its author')
+
+    def get_success_url(self):
+        """
+        Back to the list as it was: same filters, same page.
+        """
+        next_url = self.request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(
+            next_url, allowed_hosts={self.request.get_host()}
+        ):
+            return next_url
+        return super().get_success_url()
+
+    def form_valid(self, form):
+        tasks = form.cleaned_data['tasks']
+        task_ids = [task.pk for task in tasks]
+        action = form.cleaned_data['action']
+
+        if action == 'delete':
+            user = self.request.user
+            if any(task.author_id != user.pk for task in tasks):
+                messages.error(self.request, self.author_message)
+            else:
+                count = bulk.delete(task_ids)
+                messages.success(
+                    self.request,
+                    _('Tasks deleted: %(count)d') % {'count': count}
+                )
+        else:
+            apply, field = bulk.ACTIONS[action]
+            count = apply(task_ids, form.cleaned_data[field])
+            messages.success(
+                self.request,
+                _('Tasks changed: %(count)d') % {'count': count}
+            )
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_success_url())
+
+
+class TasksExportView(AuthRequiredMixin, TaskSourceMixin, FilterMixin, View):
+    """
+    Stream the tasks selected by the filter as CSV or NDJSON.
+
+    Authorisation required.
+    """
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        file_format = kwargs['file_format']
+        if file_format not in export.FORMATS:
+            raise Http404
+
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid() or \
+                not self.get_strict():
+            queryset = filterset.qs
+        else:
+            queryset = filterset.queryset.none()
+
+        rows = export.project(queryset).iterator(chunk_size=self.chunk_size)
+        content_type, stream = export.FORMATS[file_format]
+        response = StreamingHttpResponse(
+            stream(rows), content_type=content_type
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename="tasks.{file_format}"'
+        return response
+
+
+class TaskDetailView(AuthRequiredMixin, ConditionalGetMixin, DetailView):
     """
     Show one task details.
 
     Authorisation required.
+    Answers 304 when nothing changed since the client's copy.
     """
     template_name = 'tasks/task_show.html'
     model = Task
@@ -40,6 +241,11 @@ class TaskDetailView(AuthRequiredMixin, DetailView):
         'title': _('Task preview')
     }
 
+    def get_queryset(self):
+        return super().get_queryset() \
+            .select_related('status', 'author', 'executor') \
+            .prefetch_related('labels')
+
 
 class TaskCreateView(AuthRequiredMixin, SuccessMessageMixin, CreateView):
     """
@@ -66,6 +272,45 @@ class TaskCreateView(AuthRequiredMixin, SuccessMessageMixin, CreateView):
         return super().form_valid(form)
 
 
+class TaskImportView(AuthRequiredMixin, FormView):
+    """
+    Create tasks in bulk from an uploaded file.
+
+    Authorisation required.
+    The current user becomes the author of the imported tasks.
+    Invalid rows are skipped and listed.
+    """
+    template_name = 'tasks/import.html'
+    form_class = TaskImportForm
+    success_url = reverse_lazy('tasks')
+    extra_context = {
+        'title': _('Import tasks'),
+        'button_text': _('Import'),
+    }
+
+    def form_valid(self, form):
+        file = form.cleaned_data['file']
+        author = User.objects.get(pk=self.request.user.pk)
+        try:
+            result = importer.import_tasks(
+                importer.read_rows(file, importer.guess_format(file.name)),
+                author,
+            )
+        except ValueError as error:
+            form.add_error('file', str(error))
+            return self.form_invalid(form)
+
+        messages.success(
+            self.request,
+            _('Tasks imported: %(count)d') % {'count': result.created}
+        )
+        if result.errors:
+            return self.render_to_response(
+                self.get_context_data(form=form, result=result)
+            )
+        return redirect(self.get_success_url())
+
+
 class TaskUpdateView(AuthRequiredMixin, SuccessMessageMixin, UpdateView):
     """
     Edit existing task.
@@ -101,3 +346,17 @@ class TaskDeleteView(AuthRequiredMixin, AuthorDeletionMixin,
         'title': _('Delete task'),
         'button_text': _('Yes, delete'),
     }
+
+
+# Served by the ASGI server (ASYNC_VIEWS), see AsyncViewMixin.
+
+class AsyncTasksListView(AsyncViewMixin, TasksListView):
+    pass
+
+
+class AsyncTaskDetailView(AsyncViewMixin, TaskDetailView):
+    pass
+
+
+class AsyncTaskDeleteView(AsyncViewMixin, TaskDeleteView):
+    pass
@@ -1,13 +1,22 @@
-from django.test import TestCase, Client
+import re
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
-from task_manager.helpers import test_english, remove_rollbar
+from task_manager import metrics, query_inspector, versions
+from task_manager.helpers import bump_versions_at_once, test_english, \
+    remove_rollbar
 from task_manager.users.models import User
 
 
 @test_english
 @remove_rollbar
+@bump_versions_at_once
 class HomeTestCase(TestCase):
     def setUp(self) -> None:
         self.client = Client()
@@ -82,3 +91,207 @@ class TestLogoutUser(HomeTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertRedirects(response, reverse_lazy('home'))
         self.assertFalse(response.context['user'].is_authenticated)
+
+
+class TestServerTiming(HomeTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user.is_staff = True
+        self.user.save()
+
+    def test_header(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse_lazy('home'))
+
+        names = re.findall(r'(\w+);dur=[\d.]+', response['Server-Timing'])
+        self.assertEqual(names[-1], 'total')
+        for name in ('view', 'render', 'middleware'):
+            self.assertIn(name, names)
+
+    def test_query_count(self) -> None:
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse_lazy('users'))
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn(
+            f'desc="{len(queries)} queries"', response['Server-Timing'],
+        )
+
+    def test_no_header_for_others(self) -> None:
+        self.client.force_login(User.objects.create_user(username='other'))
+        self.assertNotIn('Server-Timing', self.client.get('/'))
+
+        self.client.logout()
+        self.assertNotIn('Server-Timing', self.client.get('/'))
+
+        with override_settings(SERVER_TIMING_PUBLIC=True):
+            self.assertIn('Server-Timing', self.client.get('/'))
+
+    def test_log_line(self) -> None:
+        with self.assertLogs('task_manager.middleware', 'INFO') as logs:
+            response = self.client.get(reverse_lazy('home'))
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertRegex(logs.output[0], r'GET / 200 .*total=[\d.]+')
+        self.assertIn('total', logs.records[0].server_timing)
+
+
+class TestMetrics(HomeTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user.is_staff = True
+        self.user.save()
+
+    def sample(self, line):
+        response = self.client.get(reverse_lazy('metrics'))
+        values = dict(
+            sample.rsplit(' ', 1) for sample in response.content.decode()
+            .splitlines() if not sample.startswith('#')
+        )
+        return float(values.get(line, 0))
+
+    def test_requests(self) -> None:
+        self.client.force_login(self.user)
+        name = 'taskmanager_http_requests_total' \
+            '{method="GET",status="200",view="users"}'
+        queries = 'taskmanager_db_queries_total{view="users"}'
+        count = 'taskmanager_http_request_duration_seconds_count' \
+            '{view="users"}'
+        inf = 'taskmanager_http_request_duration_seconds_bucket' \
+            '{view="users",le="+Inf"}'
+        before = [self.sample(line) for line in (name, queries, count, inf)]
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse_lazy('users'))
+        query_count = len(captured)
+        after = [self.sample(line) for line in (name, queries, count, inf)]
+
+        self.assertEqual(
+            [b - a for a, b in zip(before, after)], [1, query_count, 1, 1],
+        )
+
+    def test_format(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse_lazy('metrics'))
+
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        self.assertContains(
+            response, '# TYPE taskmanager_http_request_duration_seconds '
+                      'histogram',
+        )
+        self.assertContains(
+            response, '# TYPE taskmanager_task_row_cache_hits_total counter',
+        )
+        # The request being served.
+        self.assertContains(
+            response, 'taskmanager_http_requests_in_progress 1.0',
+        )
+
+    def test_staff_only(self) -> None:
+        response = self.client.get(reverse_lazy('metrics'))
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_staff = False
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse_lazy('metrics'))
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self) -> None:
+        response = self.client.get(reverse_lazy('metrics'))
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get(
+            reverse_lazy('metrics'), HTTP_AUTHORIZATION='Bearer wrong',
+        )
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get(
+            reverse_lazy('metrics'), HTTP_AUTHORIZATION='Bearer secret',
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class TestMetricsFiles(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_processes_add_up(self) -> None:
+        for pid, amount in ((1, 2), (2, 3)):
+            store = metrics.FileStore(self.directory / f'totals_{pid}.db')
+            store.inc('requests', amount)
+            store.inc(f'only {pid}')
+
+        with override_settings(METRICS_DIR=str(self.directory)):
+            totals = metrics.collect(metrics.TOTALS)
+
+        self.assertEqual(
+            totals, {'requests': 5, 'only 1': 1, 'only 2': 1},
+        )
+
+    def test_reopen_and_grow(self) -> None:
+        path = self.directory / 'totals_1.db'
+        metrics.FileStore(path).inc('kept', 7)
+
+        store = metrics.FileStore(path)
+        keys = [f'key {i:05}' for i in range(5000)]
+        for key in keys:
+            store.inc(key)
+        store.inc('kept')
+
+        values = dict(metrics.read_file(path))
+        self.assertGreater(path.stat().st_size, store.initial_size)
+        self.assertEqual(values['kept'], 8)
+        self.assertEqual(len(values), len(keys) + 1)
+
+    def test_mark_process_dead(self) -> None:
+        for pid in (1, 2, 3):
+            for kind in (metrics.TOTALS, metrics.LIVE):
+                store = metrics.FileStore(self.directory / f'{kind}_{pid}.db')
+                store.inc('x', pid)
+
+        metrics.mark_process_dead(1, self.directory)
+        metrics.mark_process_dead(2, self.directory)
+
+        self.assertEqual(
+            sorted(path.name for path in self.directory.glob('*.db')),
+            ['live_3.db', 'totals_3.db', 'totals_exited.db'],
+        )
+        self.assertEqual(
+            dict(metrics.read_file(self.directory / 'totals_exited.db')),
+            {'x': 3},
+        )
+        with override_settings(METRICS_DIR=str(self.directory)):
+            self.assertEqual(metrics.collect(metrics.TOTALS), {'x': 6})
+
+
+class TestQueryShape(TestCase):
+    def test_fingerprint(self) -> None:
+        self.assertEqual(
+            query_inspector.fingerprint(
+                "SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s)\n"
+                " LIMIT 21"
+            ),
+            'SELECT * FROM t WHERE a = ? AND b IN ? LIMIT ?',
+        )
+        self.assertEqual(
+            query_inspector.fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+            query_inspector.fingerprint(
+                'SELECT * FROM t WHERE id IN (%s, %s, %s)'
+            ),
+        )
+
+
+class TestVersions(TestCase):
+    def test_bumped_on_commit(self) -> None:
+        before = versions.get(versions.TASKS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            versions.changed(versions.TASKS)
+            self.assertEqual(versions.get(versions.TASKS), before)
+
+        self.assertNotEqual(versions.get(versions.TASKS), before)
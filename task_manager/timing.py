@@ -0,0 +1,122 @@
+"""
+Where the time of a request goes: database, rendering, middleware and
+the spans views add themselves.
+
+ServerTimingMiddleware (task_manager.middleware) starts a Timing for
+every request and makes it current. It is then available as
+request.server_timing, and the queries of every connection are counted
+in it, whatever thread runs them (the context is copied to the threads
+of async views). Views time their own steps with span():
+
+    with timing.span('filter'):
+        ...
+
+The result is sent as a Server-Timing header and logged.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = ContextVar('server_timing', default=None)
+
+
+class Timing:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None
+        # name -> milliseconds, in the order first seen.
+        self.spans = {}
+        self.queries = 0
+
+    def add(self, name, duration):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def finish(self):
+        self.total = (time.perf_counter() - self.started) * 1000
+        if 'view' in self.spans:
+            self.spans['middleware'] = self.total - self.spans['view']
+
+    def as_dict(self):
+        """
+        Milliseconds by name, rounded, and the query count.
+        """
+        return {
+            **{name: round(duration, 2)
+               for name, duration in self.spans.items()},
+            'total': round(self.total, 2),
+            'queries': self.queries,
+        }
+
+    def header(self):
+        metrics = []
+        for name, duration in self.spans.items():
+            metric = f'{name};dur={duration:.2f}'
+            if name == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        metrics.append(f'total;dur={self.total:.2f}')
+        return ', '.join(metrics)
+
+
+def start():
+    """
+    A new current Timing, and the token to pass to stop().
+    """
+    timing = Timing()
+    return timing, _current.set(timing)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """
+    Time the block as `name` in the current Timing, if any.
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+    else:
+        with timing.span(name):
+            yield
+
+
+def record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    timing.queries += 1
+    with timing.span('db'):
+        return execute(sql, params, many, context)
+
+
+def add_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """
+    Count the queries of every connection, opened now or later.
+    """
+    connection_created.connect(add_wrapper)
+    for connection in connections.all():
+        add_wrapper(connection)
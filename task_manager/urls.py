@@ -1,7 +1,8 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
-from .views import IndexView, UserLoginView, UserLogoutView
+from .views import IndexView, MetricsView, UserLoginView, UserLogoutView
 
 
 urlpatterns = [
@@ -14,5 +15,12 @@ urlpatterns = [
     path('tasks/', include('task_manager.tasks.urls')),
     path('labels/', include('task_manager.labels.urls')),
 
+    path('api/v1/', include('task_manager.api.urls')),
+
     path('admin/', admin.site.urls),
 ]
+
+if settings.METRICS:
+    urlpatterns.append(
+        path('metrics/', MetricsView.as_view(), name='metrics'),
+    )
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 
@@ -8,3 +9,11 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.get_full_name()
+
+    class Meta(AbstractUser.Meta):
+        # Prefix search for the autocomplete widgets.
+        indexes = [
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('first_name'), name='user_first_name_lower_idx'),
+            models.Index(Lower('last_name'), name='user_last_name_lower_idx'),
+        ]
@@ -1,5 +1,9 @@
+from django.test import override_settings
 from django.urls import reverse_lazy
 
+from task_manager.helpers import django_templates, jinja2_templates, \
+    requires_jinja2
+
 from .testcase import UserTestCase
 
 
@@ -29,6 +33,16 @@ class TestListUsers(UserTestCase):
             self.assertContains(response, f'/users/{pk}/update/')
             self.assertContains(response, f'/users/{pk}/delete/')
 
+    @requires_jinja2
+    def test_users_jinja2(self) -> None:
+        self.client.force_login(self.user1)
+        pages = []
+        for templates in (django_templates(), jinja2_templates()):
+            with override_settings(TEMPLATES=templates):
+                pages.append(self.client.get(reverse_lazy('users')))
+
+        self.assertHTMLEqual(*(page.content.decode() for page in pages))
+
 
 class TestCreateUserView(UserTestCase):
     def test_sign_up_view(self) -> None:
@@ -96,3 +110,48 @@ class TestDeleteUserView(UserTestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('users'))
+
+
+class TestAutocompleteUsers(UserTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.force_login(self.user1)
+
+    def search(self, query):
+        response = self.client.get(
+            reverse_lazy('users_autocomplete'), {'q': query}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()['results']]
+
+    def test_autocomplete_by_name_prefix(self) -> None:
+        self.assertEqual(self.search('paul'), [self.user2.pk])
+        self.assertEqual(self.search('HARR'), [self.user3.pk])
+        self.assertEqual(self.search('lenn'), [self.user1.pk])
+
+    def test_autocomplete_every_word(self) -> None:
+        self.assertEqual(self.search('john len'), [self.user1.pk])
+        self.assertEqual(self.search('john mcc'), [])
+
+    def test_autocomplete_prefix_only(self) -> None:
+        self.assertEqual(self.search('ennon'), [])
+
+    def test_autocomplete_empty_query(self) -> None:
+        self.assertEqual(len(self.search('')), self.count)
+
+    def test_autocomplete_text(self) -> None:
+        response = self.client.get(
+            reverse_lazy('users_autocomplete'), {'q': 'macca'}
+        )
+
+        self.assertEqual(response.json(), {
+            'results': [{'id': 2, 'text': self.user2.get_full_name()}]
+        })
+
+    def test_autocomplete_not_logged_in(self) -> None:
+        self.client.logout()
+
+        response = self.client.get(reverse_lazy('users_autocomplete'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, reverse_lazy('login'))
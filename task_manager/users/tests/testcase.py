@@ -1,11 +1,14 @@
 from django.test import TestCase, Client
 
-from task_manager.helpers import load_data, test_english, remove_rollbar
+from task_manager.helpers import bump_versions_at_once, \
+    detect_n_plus_one, load_data, test_english, remove_rollbar
 from task_manager.users.models import User
 
 
 @test_english
 @remove_rollbar
+@bump_versions_at_once
+@detect_n_plus_one
 class UserTestCase(TestCase):
     fixtures = ['user.json', 'status.json', 'task.json', 'label.json']
     test_user = load_data('test_user.json')
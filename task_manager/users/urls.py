@@ -1,11 +1,14 @@
 from django.urls import path
 
-from .views import UsersListView, UserCreateView, UserUpdateView, UserDeleteView
+from .views import UsersListView, UserCreateView, UserUpdateView, \
+    UserDeleteView, UsersAutocompleteView
 
 
 urlpatterns = [
     path('', UsersListView.as_view(), name='users'),
     path('create/', UserCreateView.as_view(), name='sign_up'),
+    path('autocomplete/', UsersAutocompleteView.as_view(),
+         name='users_autocomplete'),
     path('<int:pk>/update/', UserUpdateView.as_view(), name='user_update'),
     path('<int:pk>/delete/', UserDeleteView.as_view(), name='user_delete'),
 ]
@@ -5,6 +5,7 @@ from django.contrib.messages.views import SuccessMessageMixin
 
 from task_manager.mixins import AuthRequiredMixin,\
     UserPermissionMixin, DeleteProtectionMixin
+from task_manager.views import AutocompleteView
 from .models import User
 from .forms import UserForm
 
@@ -78,3 +79,14 @@ class UserDeleteView(AuthRequiredMixin, UserPermissionMixin,
         'title': _('Delete user'),
         'button_text': _('Yes, delete'),
     }
+
+
+class UsersAutocompleteView(AutocompleteView):
+    """
+    Find users by the beginning of their username, first or last name.
+
+    Authorization required.
+    """
+    model = User
+    search_fields = ('username', 'first_name', 'last_name')
+    ordering = ('first_name', 'last_name', 'id')
@@ -0,0 +1,116 @@
+"""
+Version stamps of the data shown on the pages.
+
+Every change to tasks, statuses, labels or users bumps the Version row
+of its group, from the signals in task_manager.signals and from the
+set-based updates that send none. The bump waits for the commit: the
+row stays locked for one short statement, not for the whole
+transaction of every writer. Views compare these stamps with the
+ones a client already has (see ConditionalGetMixin) instead of reading
+the tables again.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Version
+
+TASKS = 'tasks'
+STATUSES = 'statuses'
+LABELS = 'labels'
+USERS = 'users'
+
+ALL = (TASKS, STATUSES, LABELS, USERS)
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred():
+    """
+    Collect the changes made inside the block (one by one, by the
+    signals of a bulk delete for instance) and bump each version once
+    when it ends.
+    """
+    if getattr(_deferred, 'names', None) is not None:
+        yield
+        return
+    _deferred.names = set()
+    try:
+        yield
+        names = _deferred.names
+    finally:
+        _deferred.names = None
+    if names:
+        bump_on_commit(names)
+
+
+def changed(*names):
+    pending = getattr(_deferred, 'names', None)
+    if pending is not None:
+        pending.update(names)
+    else:
+        bump_on_commit(names)
+
+
+def bump_on_commit(names):
+    transaction.on_commit(lambda: bump(*names))
+
+
+def bump(*names):
+    names = set(names)
+    _current.stamps = None
+    updated = Version.objects.filter(name__in=names).update(
+        value=F('value') + 1, updated_at=timezone.now(),
+    )
+    if updated < len(names):
+        existing = set(Version.objects.filter(
+            name__in=names,
+        ).values_list('name', flat=True))
+        Version.objects.bulk_create(
+            [Version(name=name, value=1) for name in names - existing],
+            ignore_conflicts=True,
+        )
+
+
+_current = threading.local()
+
+
+def current():
+    """
+    All the versions, read once per request (see task_manager.signals):
+    changes made by other workers are seen from the next request on.
+    Outside of requests they are read on every call.
+    """
+    stamps = getattr(_current, 'stamps', None)
+    if stamps is None:
+        stamps = get(*ALL)
+        if getattr(_current, 'in_request', False):
+            _current.stamps = stamps
+    return stamps
+
+
+def start_request():
+    _current.in_request = True
+    _current.stamps = None
+
+
+def finish_request():
+    _current.in_request = False
+    _current.stamps = None
+
+
+def get(*names):
+    """
+    {name: (value, updated_at)} of the given versions, in one query.
+    """
+    return {
+        name: (value, updated_at)
+        for name, value, updated_at in Version.objects
+        .filter(name__in=names)
+        .values_list('name', 'value', 'updated_at')
+    }
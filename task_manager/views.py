@@ -1,11 +1,19 @@
-from django.views.generic import TemplateView
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.views.generic import TemplateView, View
 from django.urls import reverse_lazy
+from django.utils.crypto import constant_time_compare
 from django.utils.translation import gettext_lazy as _
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib import messages
 
+from task_manager import metrics
+from task_manager.mixins import AuthRequiredMixin
+
 
 class IndexView(TemplateView):
     template_name = 'index.html'
@@ -30,3 +38,65 @@ class UserLogoutView(LogoutView):
     def dispatch(self, request, *args, **kwargs):
         messages.info(request, _('You are logged out'))
         return super().dispatch(request, *args, **kwargs)
+
+
+class AutocompleteView(AuthRequiredMixin, View):
+    """
+    JSON list of objects for the autocomplete widgets.
+
+    Authorization required.
+    Every word of `q` must be a prefix of one of the `search_fields`,
+    case-insensitively. The prefix is searched as a range over
+    LOWER(field), so it is answered by an index on that expression.
+    """
+    model = None
+    search_fields = ()
+    ordering = None
+    limit = 20
+    query_kwarg = 'q'
+
+    def get_queryset(self):
+        queryset = self.model.objects.alias(**{
+            f'{field}_lower': Lower(field) for field in self.search_fields
+        })
+        words = self.request.GET.get(self.query_kwarg, '').lower().split()
+        for word in words:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{
+                    f'{field}_lower__gte': word,
+                    f'{field}_lower__lt': word + chr(0x10ffff),
+                })
+            queryset = queryset.filter(condition)
+        return queryset.order_by(*self.ordering)
+
+    def get(self, request, *args, **kwargs):
+        objects = self.get_queryset()[:self.limit]
+        return JsonResponse({
+            'results': [{'id': obj.pk, 'text': str(obj)} for obj in objects],
+        })
+
+
+class MetricsView(View):
+    """
+    Request metrics of all the workers, for Prometheus.
+
+    Only for `Authorization: Bearer <METRICS_TOKEN>` or a staff user:
+    they tell the traffic, the errors and the database time of every view.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_allowed(request):
+            return HttpResponseForbidden()
+        return HttpResponse(
+            metrics.export(), content_type=metrics.CONTENT_TYPE,
+        )
+
+    @staticmethod
+    def is_allowed(request):
+        token = settings.METRICS_TOKEN
+        if token and constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}',
+        ):
+            return True
+        return request.user.is_staff
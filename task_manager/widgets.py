@@ -0,0 +1,68 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+
+class AutocompleteMixin:
+    """
+    Model choice widget that renders only the selected options.
+
+    The other options are fetched by the browser from `url`
+    (an AutocompleteView) as the user types, so the page does not grow
+    with the number of rows. The form field still validates the
+    submitted values against its queryset.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = str(self.url)
+        return attrs
+
+    def get_selected_choices(self, value):
+        """
+        The (value, label) choices of the selected objects only:
+        from the reference cache when the field has one, otherwise
+        a single query by primary key instead of the whole queryset.
+        """
+        field = self.choices.field
+        choices = []
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            choices.append(('', field.empty_label))
+
+        selected = [pk for pk in value if pk not in (None, '')]
+        if selected:
+            choices.extend(
+                self.choices.choice(obj)
+                for obj in self.get_selected_objects(field, selected)
+            )
+        return choices
+
+    def get_selected_objects(self, field, pks):
+        if hasattr(field, 'get_objects'):
+            return field.get_objects(pks)
+        try:
+            return list(self.choices.queryset.filter(pk__in=pks))
+        except (ValueError, TypeError, ValidationError):
+            return []
+
+    def optgroups(self, name, value, attrs=None):
+        groups = []
+        choices = self.get_selected_choices(value)
+        for index, (option_value, option_label) in enumerate(choices):
+            selected = str(option_value) in value
+            groups.append((None, [self.create_option(
+                name, option_value, option_label, selected, index,
+                attrs=attrs,
+            )], index))
+        return groups
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass